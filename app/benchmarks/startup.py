@@ -0,0 +1,281 @@
+import os
+import sys
+import json
+import shutil
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from typer import Typer, Option
+
+from app.utils import TextDisplay, TableDisplay
+
+# Repository root, where pycurl.spec lives
+ROOT_PATH = Path(__file__).resolve().parents[2]
+
+# Default PyInstaller output of pycurl.spec
+DEFAULT_BINARY_PATH = ROOT_PATH / "dist" / ("pycurl.exe" if os.name == "nt" else "pycurl")
+
+# Median slowdown (in percent) that counts as a regression
+DEFAULT_THRESHOLD = 10.0
+
+# Commands measured, as arguments after the executable; {url} is the stub server
+SCENARIOS = {
+    "version": ["version"],
+    "help": ["--help"],
+    "docs": ["docs"],
+    "token-list": ["token", "list"],
+    "get": ["get", "{url}"],
+}
+
+# Local stub answering every GET with a small JSON body
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+# Stub server that stays quiet when pycurl drops its keep-alive connection
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+# Start the stub server on a free port
+def startStubServer() -> ThreadingHTTPServer:
+    """Serve _StubHandler on 127.0.0.1 from a daemon thread."""
+    server = _StubServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, name="pycurl-stub", daemon=True).start()
+    return server
+
+# Parse `-X importtime` output into per-module timings
+def parseImportTime(stderr: str, top: int = 15) -> dict:
+    """Return the total import time and the `top` slowest modules by cumulative time (microseconds)."""
+    modules = []
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue    # the header line
+        module = {"module": name.strip(), "self_us": int(self_us), "cumulative_us": int(cumulative_us)}
+        modules.append(module)
+        # Top level imports are not indented; their cumulative times add up to the total
+        if name.startswith(" ") and not name.startswith("  "):
+            total += module["cumulative_us"]
+
+    modules.sort(key=lambda module: module["cumulative_us"], reverse=True)
+    return {"total_us": total, "modules": len(modules), "top": modules[:top]}
+
+# Wall time statistics in milliseconds
+def summarize(samples: list[float]) -> dict:
+    """min/median/mean/max/stdev of wall times given in seconds."""
+    milliseconds = [sample * 1000 for sample in samples]
+    return {
+        "runs": len(milliseconds),
+        "min": round(min(milliseconds), 3),
+        "median": round(statistics.median(milliseconds), 3),
+        "mean": round(statistics.fmean(milliseconds), 3),
+        "max": round(max(milliseconds), 3),
+        "stdev": round(statistics.stdev(milliseconds), 3) if len(milliseconds) > 1 else 0.0
+    }
+
+# Run one command and return its wall time
+def _timeRun(command: list[str], env: dict) -> float:
+    started = time.perf_counter()
+    completed = subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} exited with {completed.returncode}: {completed.stderr.decode(errors='replace')[-500:]}")
+    return elapsed
+
+# Measure every scenario for one way of launching pycurl
+def benchmarkTarget(
+    launcher: list[str],
+    scenarios: list[str],
+    url: str,
+    env: dict,
+    runs: int = 10,
+    warmup: int = 1,
+    importtime: bool = True,
+    top: int = 15
+) -> dict:
+    """Time `runs` cold starts per scenario (after `warmup` runs) and optionally one `-X importtime` run."""
+    results = {}
+    for scenario in scenarios:
+        command = launcher + [arg.format(url=url) for arg in SCENARIOS[scenario]]
+        for _ in range(warmup):
+            _timeRun(command, env)
+        result = {"command": command, "wall_ms": summarize([_timeRun(command, env) for _ in range(runs)])}
+
+        if importtime:
+            completed = subprocess.run(
+                command, env={**env, "PYTHONPROFILEIMPORTTIME": "1"}, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+            )
+            result["importtime"] = parseImportTime(completed.stderr.decode(errors="replace"), top)
+
+        results[scenario] = result
+    return results
+
+# Compare a run against a stored baseline
+def compareResults(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """Median wall time change per target and scenario present in both runs."""
+    rows = []
+    for target, scenarios in current["results"].items():
+        for scenario, result in scenarios.items():
+            previous = baseline.get("results", {}).get(target, {}).get(scenario)
+            if not previous:
+                continue
+            before, after = previous["wall_ms"]["median"], result["wall_ms"]["median"]
+            change = (after - before) / before * 100 if before else 0.0
+            rows.append({
+                "target": target,
+                "scenario": scenario,
+                "baseline_ms": before,
+                "current_ms": after,
+                "change_pct": round(change, 2),
+                "regression": change > threshold
+            })
+    return rows
+
+# Build the binary from pycurl.spec
+def buildBinary() -> Path:
+    """Run PyInstaller on pycurl.spec and return the path of the executable."""
+    if shutil.which("pyinstaller") is None:
+        raise RuntimeError("PyInstaller is not installed (pip install pyinstaller)")
+    subprocess.run(["pyinstaller", "--noconfirm", str(ROOT_PATH / "pycurl.spec")], cwd=ROOT_PATH, check=True)
+    return DEFAULT_BINARY_PATH
+
+# Environment with an isolated, initialised HOME so scenarios do not touch the user's config
+def _isolatedEnv(home: str, launcher: list[str]) -> dict:
+    env = {**os.environ, "HOME": home, "USERPROFILE": home, "PYTHONDONTWRITEBYTECODE": "1"}
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    subprocess.run(launcher + ["init"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return env
+
+# Typer app for pycurl-bench-startup
+app = Typer(
+    name="pycurl-bench-startup",
+    help="Measure pycurl cold start time and import costs",
+    add_completion=False
+)
+
+# pycurl-bench-startup
+@app.command(
+    epilog="""
+    EXAMPLES\n
+    pycurl-bench-startup -o baseline.json\n
+    pycurl-bench-startup --baseline baseline.json --threshold 15\n
+    pycurl-bench-startup --binary dist/pycurl -s version -s get
+    """
+)
+def startup(
+    runs: int = Option(10, "-n", "--runs", min=1, help="Measured runs per scenario"),
+    warmup: int = Option(1, "--warmup", min=0, help="Unmeasured runs before each scenario (warms the OS file cache)"),
+    scenarios: list[str] = Option(None, "-s", "--scenario", help=f"Scenario to run, repeatable: {', '.join(SCENARIOS)} (default all)"),
+    source: bool = Option(True, "--source/--no-source", help="Measure the source install (python -m app.main)"),
+    binary: str = Option(None, "--binary", help="Also measure a PyInstaller build at this path"),
+    build: bool = Option(False, "--build", help="Build the binary from pycurl.spec with PyInstaller first"),
+    importtime: bool = Option(True, "--importtime/--no-importtime", help="Record a -X importtime breakdown per scenario"),
+    top: int = Option(15, "--top", min=1, help="Slowest imports kept per scenario"),
+    output: str = Option(None, "-o", "--output", help="Write the results to this JSON file"),
+    baseline: str = Option(None, "-b", "--baseline", help="Compare against a JSON file from an earlier run"),
+    threshold: float = Option(DEFAULT_THRESHOLD, "-t", "--threshold", min=0, help="Median slowdown in percent that fails the comparison")
+):
+    """
+    Benchmark pycurl startup: wall time and import time of common commands.
+    """
+    selected = scenarios or list(SCENARIOS)
+    unknown = [scenario for scenario in selected if scenario not in SCENARIOS]
+    if unknown:
+        raise SystemExit(TextDisplay.error_text(f"Unknown scenario: {', '.join(unknown)}. Use {', '.join(SCENARIOS)}."))
+
+    launchers = {}
+    if source:
+        launchers["source"] = [sys.executable, "-m", "app.main"]
+    if build:
+        binary = str(buildBinary())
+    if binary:
+        if not Path(binary).exists():
+            raise SystemExit(TextDisplay.error_text(f"Binary not found at {binary}. Build it with --build or pyinstaller pycurl.spec."))
+        launchers["binary"] = [str(Path(binary).resolve())]
+    if not launchers:
+        raise SystemExit(TextDisplay.error_text("Nothing to measure: use --source or --binary."))
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "results": {}
+    }
+
+    server = startStubServer()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="pycurl-bench-") as home:
+            for target, launcher in launchers.items():
+                TextDisplay.info_text(f"Measuring {target} ({runs} runs per scenario)...")
+                env = _isolatedEnv(home, launcher)
+                # The frozen binary ignores -X options, so import times only come from the source run
+                report["results"][target] = benchmarkTarget(
+                    launcher, selected, url, env,
+                    runs=runs, warmup=warmup, importtime=importtime and target == "source", top=top
+                )
+    except (RuntimeError, OSError, subprocess.CalledProcessError) as e:
+        raise SystemExit(TextDisplay.error_text(f"Benchmark failed: {e}"))
+    finally:
+        server.shutdown()
+
+    table = TableDisplay(title="Startup (ms)", columns=["Target", "Scenario", "Median", "Min", "Max", "Stdev", "Imports (ms)"], style="white")
+    for target, results in report["results"].items():
+        for scenario, result in results.items():
+            wall = result["wall_ms"]
+            imports = f"{result['importtime']['total_us'] / 1000:.1f}" if "importtime" in result else "-"
+            table.add_row([target, scenario, f"{wall['median']:.1f}", f"{wall['min']:.1f}", f"{wall['max']:.1f}", f"{wall['stdev']:.1f}", imports])
+    table.show()
+
+    if output:
+        Path(output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        TextDisplay.success_text(f"Results saved to {output}")
+
+    if baseline:
+        try:
+            previous = json.loads(Path(baseline).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise SystemExit(TextDisplay.error_text(f"Cannot read baseline {baseline}: {e}"))
+
+        rows = compareResults(report, previous, threshold)
+        comparison = TableDisplay(title=f"Against {baseline} (threshold {threshold}%)", columns=["Target", "Scenario", "Baseline", "Current", "Change"], style="white")
+        for row in rows:
+            comparison.add_row(
+                [row["target"], row["scenario"], f"{row['baseline_ms']:.1f}", f"{row['current_ms']:.1f}", f"{row['change_pct']:+.1f}%"],
+                style="red" if row["regression"] else "green"
+            )
+        comparison.show()
+
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            TextDisplay.error_text(f"{len(regressions)} scenario(s) regressed by more than {threshold}%.")
+            raise SystemExit(1)
+        TextDisplay.success_text("No startup regressions.")
+
+if __name__ == "__main__":
+    app()
@@ -1,34 +1,51 @@
-# Initialise Config Setup
-from .init import init
-
-# Config Management
-from .config.config import config
-
-# Requests
-from .get import get
-from .post import post
-from .put import put
-from .patch import patch
-from .delete import delete
-
-# Authentication Request
-from .auth.auth import auth
-
-# Token Management
-from .token.token import token
-
-# Documentation
-from .docs.docs import docs
-
-__all__ = [
-    "init", 
-    "config", 
-    "get", 
-    "post", 
-    "put", 
-    "patch", 
-    "delete", 
-    "auth", 
-    "token", 
-    "docs"
-]
\ No newline at end of file
+import importlib
+
+# Command objects and the modules that define them. Importing this package
+# stays cheap; a command module is imported on first access (PEP 562).
+_COMMANDS = {
+    # Initialise Config Setup
+    "init": ".init",
+
+    # Config Management
+    "config": ".config.config",
+
+    # Requests
+    "get": ".get",
+    "post": ".post",
+    "put": ".put",
+    "patch": ".patch",
+    "delete": ".delete",
+    "batch": ".batch",
+    "bench": ".bench",
+
+    # Authentication Request
+    "auth": ".auth.auth",
+
+    # Token Management
+    "token": ".token.token",
+
+    # HTTP Cache Management
+    "cache": ".cache.cache",
+
+    # Documentation
+    "docs": ".docs.docs",
+
+    # General
+    "version": ".version",
+    "about": ".about"
+}
+
+__all__ = list(_COMMANDS)
+
+# Import the command module on first access
+def __getattr__(name: str):
+    module_name = _COMMANDS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    command = getattr(importlib.import_module(module_name, __name__), name)
+    # The command replaces the submodule binding of the same name (get, post, ...)
+    globals()[name] = command
+    return command
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
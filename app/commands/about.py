@@ -0,0 +1,11 @@
+from app.utils import PanelDisplay
+
+# pycurl about
+def about():
+    """Show information about PyCurl"""
+    PanelDisplay.print_panel(
+      "About PyCurl", 
+      "PyCurl is a lightweight curl-like CLI tool written in Python using requests.", 
+      border_style="cyan", 
+      subtitle="Version 1.1.1"
+    )
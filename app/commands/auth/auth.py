@@ -40,7 +40,9 @@ def login(
     token_field: str = Option("token", "-t", "--token-field", help="Field name in the response JSON that contains the token"),
     store_token_to_file: str | None = Option(None, "-S", "--store-token", help="Store the token to a specified file"),
     cookie_token: str | None = Option(None, "--cookie-token", help="Key of the cookie to extract the token from"),
-    save_alias: str | None = Option(None, "-a", "--save-alias", help="Save the token to the default config with this alias")
+    save_alias: str | None = Option(None, "-a", "--save-alias", help="Save the token to the default config with this alias"),
+    connect_timeout: float = Option(None, "--connect-timeout", min=0, help="Seconds allowed for the DNS lookup, TCP connect and TLS handshake (0 disables the config default)"),
+    max_time: float = Option(None, "-m", "--max-time", min=0, help="Wall-clock limit in seconds for the whole request (0 disables the config default)")
 ):
     """
     Perform a login request to obtain and store an authentication token.
@@ -55,7 +57,9 @@ def login(
             token_field=token_field,
             store_token_to_file=store_token_to_file,
             cookie_token=cookie_token,
-            save_alias=save_alias
+            save_alias=save_alias,
+            max_time=max_time,
+            connect_timeout=connect_timeout
         )
 
     except Exception as e:
@@ -79,7 +83,9 @@ def register(
     token_field: str = Option("token", "-t", "--token-field", help="Field name in the response JSON that contains the token"),
     store_token_to_file: str | None = Option(None, "-S", "--store-token", help="Store the token to a specified file"),
     cookie_token: str | None = Option(None, "--cookie-token", help="Key of the cookie to extract the token from"),
-    save_alias: str | None = Option(None, "-a", "--save-alias", help="Save the token to the default config with this alias")
+    save_alias: str | None = Option(None, "-a", "--save-alias", help="Save the token to the default config with this alias"),
+    connect_timeout: float = Option(None, "--connect-timeout", min=0, help="Seconds allowed for the DNS lookup, TCP connect and TLS handshake (0 disables the config default)"),
+    max_time: float = Option(None, "-m", "--max-time", min=0, help="Wall-clock limit in seconds for the whole request (0 disables the config default)")
 ):
     """
     Perform a registration request to obtain and store an authentication token.
@@ -94,7 +100,9 @@ def register(
             token_field=token_field,
             store_token_to_file=store_token_to_file,
             cookie_token=cookie_token,
-            save_alias=save_alias
+            save_alias=save_alias,
+            max_time=max_time,
+            connect_timeout=connect_timeout
         )
 
     except Exception as e:
@@ -0,0 +1,84 @@
+import sys
+from typer import Argument, Option
+
+from app.utils import TextDisplay, jsonDumps, configureSession, POOL_MAXSIZE, readBatchLines, runBatch, runBatchAsync, resolveTimeouts
+
+# pycurl batch
+def batch(
+    file: str = Argument(..., help="JSONL file with one request per line (use '-' to read from stdin)"),
+    concurrency: int = Option(8, "-c", "--concurrency", min=1, help="Maximum number of requests in flight"),
+    engine: str = Option("thread", "-e", "--engine", help="Execution engine: 'thread' (requests worker pool) or 'async' (asyncio, for thousands of requests in flight)"),
+    per_host: int | None = Option(None, "--per-host", min=1, help="Maximum connections per host for the async engine (defaults to --concurrency)"),
+    order: str = Option("input", "--order", help="Order of the results: 'input' or 'completion'"),
+    output: str | None = Option(None, "-o", "--output", help="File path to write the NDJSON results (defaults to stdout)"),
+    include_headers: bool = Option(False, "-i", "--include-headers", help="Include response headers in each result"),
+    no_body: bool = Option(False, "--no-body", help="Leave the response body out of each result"),
+    connect_timeout: float = Option(None, "--connect-timeout", min=0, help="Seconds each request may spend connecting (0 disables the config default)"),
+    max_time: float = Option(None, "-m", "--max-time", min=0, help="Wall-clock limit in seconds for each request, body included (0 disables the config default)")
+):
+    """
+    Run every request of a JSONL file over a bounded worker pool and stream the results as NDJSON.
+    """
+    if order not in ("input", "completion"):
+        raise SystemExit(TextDisplay.error_text("Unsupported order. Use 'input' or 'completion'."))
+
+    if engine not in ("thread", "async"):
+        raise SystemExit(TextDisplay.error_text("Unsupported engine. Use 'thread' or 'async'."))
+
+    # Per request limits; each request starts its own clock
+    max_time, connect_timeout = resolveTimeouts(max_time, connect_timeout)
+
+    source = None
+    sink = None
+    total = failed = 0
+
+    try:
+        source = sys.stdin if file == "-" else open(file, "r", encoding="utf-8")
+        sink = open(output, "w", encoding="utf-8") if output else sys.stdout
+
+        if engine == "async":
+            results = runBatchAsync(
+                readBatchLines(source),
+                concurrency=concurrency,
+                limit_per_host=per_host,
+                ordered=(order == "input"),
+                include_body=not no_body,
+                include_headers=include_headers,
+                max_time=max_time,
+                connect_timeout=connect_timeout
+            )
+        else:
+            # One pooled connection per worker and host
+            configureSession(pool_maxsize=max(POOL_MAXSIZE, concurrency))
+
+            results = runBatch(
+                readBatchLines(source),
+                concurrency=concurrency,
+                ordered=(order == "input"),
+                include_body=not no_body,
+                include_headers=include_headers,
+                max_time=max_time,
+                connect_timeout=connect_timeout
+            )
+        for result in results:
+            sink.write(jsonDumps(result) + "\n")
+            sink.flush()
+            total += 1
+            if not result["ok"]:
+                failed += 1
+
+    except OSError as e:
+        raise SystemExit(TextDisplay.error_text(f"Error running batch: {e}"))
+
+    finally:
+        if source is not None and source is not sys.stdin:
+            source.close()
+        if sink is not None and sink is not sys.stdout:
+            sink.close()
+
+    # Keep stdout pure NDJSON; the summary only goes with --output
+    if output:
+        TextDisplay.success_text(f"Batch finished: {total - failed}/{total} requests succeeded. Results saved to {output}")
+
+    if failed:
+        raise SystemExit(1)
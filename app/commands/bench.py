@@ -0,0 +1,118 @@
+import json
+import requests
+from typer import Argument, Option
+
+from app.utils import (
+    TextDisplay,
+    TableDisplay,
+    jsonDumps,
+    POOL_MAXSIZE,
+    getSession,
+    configureSession,
+    buildRequest,
+    bufferBody,
+    prepareAsyncRequest,
+    runBench,
+    resolveTimeouts
+)
+
+# pycurl bench
+def bench(
+    url: str = Argument(..., help="The URL to benchmark"),
+    method: str = Option("GET", "-X", "--method", help="HTTP method to use"),
+    total: int | None = Option(None, "-n", "--requests", min=1, help="Number of requests to send (default 100 when --duration is not given)"),
+    duration: float | None = Option(None, "-t", "--duration", min=0.1, help="Run for this many seconds instead of a fixed number of requests"),
+    concurrency: int = Option(10, "-c", "--concurrency", min=1, help="Number of concurrent workers"),
+    engine: str = Option("thread", "-e", "--engine", help="Execution engine: 'thread' or 'async'"),
+    report_format: str = Option("table", "-f", "--format", help="Report format: 'table' or 'json'"),
+    json_data: str = Option(None, "-j", "--json", help="JSON data to include in the request body (use '@filename' to read from file)"),
+    data: str = Option(None, "-d", "--data", help="Data to include in the request body (use '@filename' to read from file)"),
+    headers_list: list[str] = Option(None, "-H", "--header", help="Additional headers to include in the request"),
+    user_saved_requests: str | None = Option(None, "-U", "--use-token", help="Provide alias to use saved token from token file (type [cyan]default[/cyan] to use the default token)"),
+    token_placement: str = Option("header", "-tp", "--token-placement", help="Where to attach the token: 'header' or 'cookie'"),
+    token_cookie_name: str = Option("access_token", "-cn", "--cookie-name", help="Name of the cookie if token placement is 'cookie'"),
+    connect_timeout: float = Option(None, "--connect-timeout", min=0, help="Seconds each request may spend connecting (0 disables the config default)"),
+    max_time: float = Option(None, "-m", "--max-time", min=0, help="Wall-clock limit in seconds for each request (0 disables the config default)")
+):
+    """
+    Load test a URL and report throughput, status codes and latency percentiles.
+    """
+    try:
+        if report_format not in ("table", "json"):
+            raise ValueError("Unsupported format. Use 'table' or 'json'.")
+
+        if engine not in ("thread", "async"):
+            raise ValueError("Unsupported engine. Use 'thread' or 'async'.")
+
+        if total and duration:
+            raise ValueError("Use either --requests or --duration, not both")
+
+        if total is None and duration is None:
+            total = 100
+
+        request = buildRequest(
+            method,
+            url,
+            headers_list=headers_list,
+            use_token=user_saved_requests,
+            token_placement=token_placement,
+            token_cookie_name=token_cookie_name,
+            json_data=json_data,
+            data=data
+        )
+
+        if engine == "async":
+            prepared = prepareAsyncRequest(request)
+        else:
+            configureSession(pool_maxsize=max(POOL_MAXSIZE, concurrency))
+            prepared = bufferBody(getSession().prepare_request(request))
+
+        if report_format == "table":
+            target = f"{total} requests" if total else f"{duration}s"
+            TextDisplay.info_text(f"Benchmarking {prepared.method} {url} ({target}, concurrency {concurrency}, {engine} engine)...")
+
+        max_time, connect_timeout = resolveTimeouts(max_time, connect_timeout)
+        result = runBench(
+            prepared,
+            total=total,
+            duration=duration,
+            concurrency=concurrency,
+            engine=engine,
+            max_time=max_time,
+            connect_timeout=connect_timeout
+        )
+        report = result.report()
+
+        # Machine readable report
+        if report_format == "json":
+            print(jsonDumps(report, indent=2))
+            return
+
+        summary = TableDisplay(title="Summary", columns=["Metric", "Value"], style="white")
+        summary.add_row(["Requests", str(report["requests"])])
+        summary.add_row(["Duration", f"{report['duration_s']} s"])
+        summary.add_row(["Throughput", f"{report['throughput_rps']} req/s"])
+        summary.add_row(["Received", f"{report['bytes_received']} bytes"])
+        summary.add_row(["Succeeded", str(report["success"])])
+        summary.add_row(["Failed", f"{report['failed']} ({report['error_rate']:.2%})"])
+        summary.show()
+
+        latency = TableDisplay(title="Latency (ms)", columns=list(report["latency_ms"].keys()), style="cyan")
+        latency.add_row([f"{value:.3f}" for value in report["latency_ms"].values()])
+        latency.show()
+
+        outcomes = TableDisplay(title="Responses", columns=["Outcome", "Count"], style="white")
+        for status, count in report["status_codes"].items():
+            outcomes.add_row([status, str(count)], style="green" if int(status) < 400 else "red")
+        for error, count in report["errors"].items():
+            outcomes.add_row([error, str(count)], style="red")
+        outcomes.show()
+
+    except requests.exceptions.RequestException as e:
+        raise SystemExit(TextDisplay.error_text(f"Error during benchmark: {e}"))
+
+    except json.JSONDecodeError as jde:
+        raise SystemExit(TextDisplay.error_text(f"Invalid JSON data: {jde}"))
+
+    except ValueError as ve:
+        raise SystemExit(TextDisplay.error_text(str(ve)))
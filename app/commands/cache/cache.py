@@ -0,0 +1,44 @@
+from typer import Typer
+
+from .commands import stats, clear
+
+# Typer object for subcommand
+cache = Typer(
+    name="cache",
+    help="Manage the on-disk HTTP cache used by get --cache"
+)
+
+# pycurl cache
+@cache.callback(
+     epilog="""
+    EXAMPLES
+    pycurl cache stats\n
+    pycurl cache clear
+    """
+)
+def cache_callback():
+    """
+    Manage the on-disk HTTP cache used by get --cache
+    """
+    pass
+
+# pycurl cache stats ...
+cache.command(
+    name="stats",
+    short_help="Show cache size and freshness",
+    epilog="""
+    EXAMPLES
+    pycurl cache stats\n
+    pycurl cache stats --format json\n
+    """
+)(stats)
+
+# pycurl cache clear ...
+cache.command(
+    name="clear",
+    short_help="Delete all cached responses",
+    epilog="""
+    EXAMPLES
+    pycurl cache clear\n
+    """
+)(clear)
@@ -0,0 +1,4 @@
+from .stats import stats
+from .clear import clear
+
+__all__ = ["stats", "clear"]
@@ -0,0 +1,14 @@
+from typer import Exit
+
+from app.utils import HttpCache, TextDisplay
+
+# pycurl cache clear
+def clear():
+    """Delete every entry from the on-disk HTTP cache."""
+    try:
+        removed = HttpCache().clear()
+        TextDisplay.success_text(f"Removed {removed} cached responses.")
+
+    except OSError as e:
+        TextDisplay.error_text(f"Error clearing cache: {e}")
+        raise Exit(1)
@@ -0,0 +1,23 @@
+from typer import Option
+
+from app.utils import HttpCache, TextDisplay, TableDisplay
+
+# pycurl cache stats
+def stats(
+    format: str = Option("human", "-f", "--format", help="Format to show the statistics (json or human)")
+):
+    """Show the size and freshness of the on-disk HTTP cache."""
+    cache_stats = HttpCache().stats()
+
+    if format == "json":
+        TextDisplay.print_json(cache_stats)
+        return
+
+    table = TableDisplay(title="HTTP Cache", columns=["Metric", "Value"], style="white")
+    table.add_row(["Path", cache_stats["path"]])
+    table.add_row(["Entries", str(cache_stats["entries"])])
+    table.add_row(["Fresh", str(cache_stats["fresh"])])
+    table.add_row(["Stale", str(cache_stats["stale"])])
+    table.add_row(["Size", f"{cache_stats['size_bytes']} bytes"])
+    table.add_row(["Limit", f"{cache_stats['max_bytes']} bytes"])
+    table.show()
@@ -4,7 +4,6 @@ from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
 import shutil
-import json
 
 from app.utils import (
     CONFIG_PATH, 
@@ -16,6 +15,9 @@ from app.utils import (
     TextDisplay,
     PanelDisplay,
     PromptTaker,
+    fileLock,
+    atomicWrite,
+    jsonDumpBytes,
     ConfigError, 
     ConfigNotFound, 
     InvalidConfig
@@ -100,9 +102,8 @@ def backup_config_file(config_file_path: Path) -> Path:
 # Logic for writing configuration to disk
 def write_config(config_path: Path, config: dict):
     """Writes the configuration dictionary to a file."""
-    config_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(config_path, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=4)
+    with fileLock(config_path):
+        atomicWrite(config_path, jsonDumpBytes(config, indent=4), mode=0o644)
 
 # Interactive configuration wizard
 def get_config_from_user(existing_config: dict = None) -> dict:
@@ -137,6 +138,15 @@ def get_config_from_user(existing_config: dict = None) -> dict:
         default_token=token_alias
     )
 
+    # Keep the settings the wizard does not ask about
+    if existing_config:
+        existing_auth = existing_config.get("auth") or {}
+        for key in ("token_store", "token_db"):
+            if existing_auth.get(key) is not None:
+                config["auth"][key] = existing_auth[key]
+        if isinstance(existing_config.get("http"), dict):
+            config["http"] = existing_config["http"]
+
     is_valid, errors = configValidator(config)
     if not is_valid:
         for e in errors:
@@ -3,7 +3,7 @@ from typer import Argument
 from app.utils import (
     CONFIG_PATH, 
     TextDisplay, 
-    loadAndValidateConfig,
+    getConfigContext,
     InvalidConfig
 )
 
@@ -14,7 +14,7 @@ def get(
     """Fetches key you request to see as [bold]Referenced from auth[/bold] using using [cyan].[/cyan]"""
 
     try:
-        config_data = loadAndValidateConfig(config_path=CONFIG_PATH)
+        config_data = getConfigContext(CONFIG_PATH).data
         
         parts = key.split(".")
         value = config_data
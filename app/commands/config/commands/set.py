@@ -1,12 +1,15 @@
 from typer import  Argument
 from pathlib import Path
-import json
 
 from app.utils import (
     CONFIG_PATH, 
     TextDisplay, 
     loadConfig, 
     configValidator,
+    updateFile,
+    atomicWrite,
+    jsonDumps,
+    FileLockTimeout,
     ConfigError,
 )
 
@@ -21,48 +24,58 @@ def set_conf(
         if not key:
             raise ValueError("Properly Enter Key or go to --help")
         
-        config_data = loadConfig(CONFIG_PATH)
         parts = key.split(".")
 
-        # if key.endswith("token_file"):
-        if parts == ["auth", "token_file"]:
-            try: 
-                value = Path(value).expanduser().resolve()
-                if not value.exists():
-                    value.parent.mkdir(parents=True, exist_ok=True)
+        # Read, change and write the config under its lock so parallel updates are not lost
+        def update(_) -> str:
+            nonlocal value
+            config_data = loadConfig(CONFIG_PATH)
 
-                    TextDisplay.error_text(f"token file not found at {value}")
-                    TextDisplay.style_text("Creating token file...", style="gray50")
+            # if key.endswith("token_file"):
+            if parts == ["auth", "token_file"]:
+                try: 
+                    value = Path(value).expanduser().resolve()
+                    if not value.exists():
+                        value.parent.mkdir(parents=True, exist_ok=True)
+
+                        TextDisplay.error_text(f"token file not found at {value}")
+                        TextDisplay.style_text("Creating token file...", style="gray50")
                     
-                    DEFAULT_TOKEN_TEMPLATE = """# alias:token\n# example\n# localhost:eyJhbGciOi...\n"""
-                    value.write_text(
-                        DEFAULT_TOKEN_TEMPLATE,
-                        encoding="utf-8"
-                    )
-                    TextDisplay.style_text("token file created", style="gray50")
-                value = str(value)
-
-            except Exception as e:
-                raise e
-
-        # Traverse and set value
-        target = config_data
-        for p in parts[:-1]:
-            target = target.setdefault(p, {})
-
-        target[parts[-1]] = value
-
-        # Validate before saving
-        valid, errors = configValidator(config_data)
-        if not valid:
-            for e in errors:
-                TextDisplay.error_text(str(e))
-            raise SystemExit(1)
-
-        # Save to file
-        CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            json.dump(config_data, f, indent=4)
+                        DEFAULT_TOKEN_TEMPLATE = """# alias:token\n# example\n# localhost:eyJhbGciOi...\n"""
+                        atomicWrite(value, DEFAULT_TOKEN_TEMPLATE)
+                        TextDisplay.style_text("token file created", style="gray50")
+                    value = str(value)
+
+                except Exception as e:
+                    raise e
+
+            # Timeouts are stored as numbers; an empty value or 'null' removes the default
+            if parts[0] == "http":
+                if value.strip().lower() in ("", "null", "none"):
+                    value = None
+                else:
+                    try:
+                        value = float(value)
+                    except ValueError:
+                        raise ValueError(f"'{key}' must be a number of seconds")
+
+            # Traverse and set value
+            target = config_data
+            for p in parts[:-1]:
+                target = target.setdefault(p, {})
+
+            target[parts[-1]] = value
+
+            # Validate before saving
+            valid, errors = configValidator(config_data)
+            if not valid:
+                for e in errors:
+                    TextDisplay.error_text(str(e))
+                raise SystemExit(1)
+
+            return jsonDumps(config_data, indent=4)
+
+        updateFile(CONFIG_PATH, update)
 
         TextDisplay.success_text("Configuration updated successfully.")
 
@@ -71,4 +84,7 @@ def set_conf(
     
     except ValueError as ve:
         TextDisplay.error_text(f"Error: {ve}")
+
+    except FileLockTimeout as te:
+        TextDisplay.error_text(str(te))
  
\ No newline at end of file
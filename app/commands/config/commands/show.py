@@ -3,8 +3,7 @@ from typer import Option
 from app.utils import (
     CONFIG_PATH, 
     TextDisplay, 
-    loadAndValidateConfig,
-    extractConfigAttributes,
+    getConfigContext,
     ConfigError,
     InvalidConfig
 )
@@ -16,17 +15,23 @@ def show(
     """Shows the current Configuration present in the file. If it is valid"""
     
     try:
-        config_data = loadAndValidateConfig(config_path=CONFIG_PATH)
-
-        token_file, token_type, default_token = extractConfigAttributes(config_data=config_data)
+        context = getConfigContext(CONFIG_PATH)
+        config_data = context.data
+        http = config_data.get("http") or {}
 
         if format == "human":
 
+            token_db = f"\t [cyan]Token Database[/cyan] : {context.token_db}\n" if context.token_store == "sqlite" else ""
+
             Config = (
                 "[yellow]PyCurl Config File[/yellow]\n"
-                f"\t [cyan]Token File[/cyan] : {token_file}\n"
-                f"\t [cyan]Token Type[/cyan] : {token_type}\n"
-                f"\t [cyan]Default Token[/cyan] : {default_token}\n"
+                f"\t [cyan]Token File[/cyan] : {context.token_file}\n"
+                f"\t [cyan]Token Type[/cyan] : {context.token_type}\n"
+                f"\t [cyan]Default Token[/cyan] : {context.default_token}\n"
+                f"\t [cyan]Token Store[/cyan] : {context.token_store}\n"
+                f"{token_db}"
+                f"\t [cyan]Timeout[/cyan] : {http.get('timeout')}\n"
+                f"\t [cyan]Connect Timeout[/cyan] : {http.get('connect_timeout')}\n"
             )
 
             TextDisplay.style_text(Config, style="white")
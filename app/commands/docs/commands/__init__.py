@@ -4,6 +4,8 @@ from .post import post_docs
 from .put import put_docs
 from .patch import patch_docs
 from .delete import delete_docs
+from .batch import batch_docs
+from .bench import bench_docs
 
 # System Commands
 from .init import init_docs
@@ -12,6 +14,7 @@ from .init import init_docs
 from .auth import auth_docs
 from .config import config_docs
 from .token import token_docs
+from .cache import cache_docs
 from .workflow import workflow_docs
 
 __all__ = [
@@ -20,9 +23,12 @@ __all__ = [
     "put_docs",
     "patch_docs",
     "delete_docs",
+    "batch_docs",
+    "bench_docs",
     "init_docs",
     "auth_docs",
     "config_docs",
     "token_docs",
+    "cache_docs",
     "workflow_docs"
 ]
@@ -0,0 +1,8 @@
+from pathlib import Path
+from app.utils import print_markdown
+
+# pycurl docs batch
+def batch_docs():
+    """Show documentation for BATCH command."""
+    file_path = Path(__file__).parent / "batch.md"
+    print_markdown(file_path)
@@ -0,0 +1,8 @@
+from pathlib import Path
+from app.utils import print_markdown
+
+# pycurl docs bench
+def bench_docs():
+    """Show documentation for BENCH command."""
+    file_path = Path(__file__).parent / "bench.md"
+    print_markdown(file_path)
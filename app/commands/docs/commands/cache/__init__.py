@@ -0,0 +1,46 @@
+from typer import Typer, Context
+from pathlib import Path
+from app.utils import print_markdown
+
+# Typer object for cache documentation
+cache_docs = Typer(
+    name="cache",
+    help="Documentation for cache commands"
+)
+
+
+# callback for pycurl docs cache
+@cache_docs.callback(
+    invoke_without_command=True
+)
+def cache_docs_callback(ctx: Context):
+    """HTTP cache management documentation."""
+    if ctx.invoked_subcommand is None:
+        # Show all cache related docs if no subcommand i.e. all commands inside cache
+        docs_to_show = ["stats.md", "clear.md"]
+        for doc in docs_to_show:
+            file_path = Path(__file__).parent / doc
+            print_markdown(file_path)
+
+
+# commands
+
+# pycurl docs cache stats
+@cache_docs.command(
+    name="stats",
+    help="Show cache stats documentation."
+)
+def stats_docs():
+    """Show cache stats documentation."""
+    file_path = Path(__file__).parent / "stats.md"
+    print_markdown(file_path)
+
+# pycurl docs cache clear
+@cache_docs.command(
+    name="clear",
+    help="Show cache clear documentation."
+)
+def clear_docs():
+    """Show cache clear documentation."""
+    file_path = Path(__file__).parent / "clear.md"
+    print_markdown(file_path)
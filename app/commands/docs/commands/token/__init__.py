@@ -17,7 +17,7 @@ def token_docs_callback(ctx: Context):
     """Token management documentation."""
     if ctx.invoked_subcommand is None:
         # Show all token related docs if no subcommand i.e. all commands inside token
-        docs_to_show = ["list.md", "set.md", "remove.md"]
+        docs_to_show = ["list.md", "set.md", "remove.md", "import.md", "export.md"]
         for doc in docs_to_show:
             file_path = Path(__file__).parent / doc
             print_markdown(file_path)
@@ -55,3 +55,22 @@ def remove_docs():
     file_path = Path(__file__).parent / "remove.md"
     print_markdown(file_path)
 
+# pycurl docs token import
+@token_docs.command(
+    name="import",
+    help="Show token import documentation."
+)
+def import_docs():
+    """Show token import documentation."""
+    file_path = Path(__file__).parent / "import.md"
+    print_markdown(file_path)
+
+# pycurl docs token export
+@token_docs.command(
+    name="export",
+    help="Show token export documentation."
+)
+def export_docs():
+    """Show token export documentation."""
+    file_path = Path(__file__).parent / "export.md"
+    print_markdown(file_path)
@@ -8,10 +8,13 @@ from .commands import (
     put_docs,
     patch_docs,
     delete_docs,
+    batch_docs,
+    bench_docs,
     init_docs,
     auth_docs,
     config_docs,
     token_docs,
+    cache_docs,
     workflow_docs
 )
 
@@ -76,6 +79,12 @@ docs.add_typer(
     name="token"
 )
 
+# pycurl docs cache
+docs.add_typer(
+    cache_docs, 
+    name="cache"
+)
+
 # pycurl docs workflow
 docs.add_typer(
     workflow_docs, 
@@ -120,6 +129,18 @@ docs.command(
     short_help="Show DELETE documentation."
 )(delete_docs)
 
+# pycurl docs batch
+docs.command(
+    name="batch",
+    short_help="Show BATCH documentation."
+)(batch_docs)
+
+# pycurl docs bench
+docs.command(
+    name="bench",
+    short_help="Show BENCH documentation."
+)(bench_docs)
+
 # pycurl docs init
 docs.command(
     name="init",
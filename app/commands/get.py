@@ -1,91 +1,149 @@
 import requests
 from typer import Argument, Option
 
-from app.utils import TextDisplay, saveResponseToFile, saveRequestResponse, getSavedToken, CONFIG_PATH
+from app.utils import (
+    TextDisplay,
+    RenderLimits,
+    rawOutputMode,
+    JsonQuery,
+    POOL_MAXSIZE,
+    configureSession,
+    buildRequest,
+    sendRequest,
+    handleResponse,
+    resumeHeaders,
+    discardPartialDownload,
+    segmentedDownload,
+    sendCached,
+    retryPolicyFromOptions,
+    deadlineFromOptions,
+    exitCode
+)
 
 # pycurl get
 def get(
     url: str = Argument(..., help="The URL to send the GET request to"),
     show_content: bool = Option(False, "-s", "--show-content", help="Whether to display the response content"),
+    max_render_bytes: int = Option(None, "--max-render-bytes", min=0, help="Stop printing the response content after this many bytes (default 1 MiB on a terminal, unlimited when piped; 0 disables the cap)"),
+    max_depth: int = Option(None, "--max-depth", min=1, help="Summarise JSON objects and arrays nested deeper than this when showing the response content"),
+    max_items: int = Option(None, "--max-items", min=1, help="Show at most this many elements of each JSON array when showing the response content"),
+    raw: bool = Option(None, "--raw/--no-raw", help="Write the response body bytes to stdout as they are, with messages on stderr (default when --show-content output is piped)"),
+    query: str = Option(None, "-q", "--query", help="Show or save only the parts of a JSON response selected by a jq-like path, e.g. '.items[].id' (evaluated while the body streams in)"),
+    stream: bool = Option(False, "--stream", help="Print Server-Sent Events or NDJSON records as they arrive instead of waiting for the whole body"),
+    max_events: int = Option(None, "--max-events", min=1, help="With --stream, stop after this many events"),
+    idle_timeout: float = Option(None, "--idle-timeout", min=0, help="With --stream, stop when no data arrives for this many seconds"),
     save_to_file: str = Option(None, "-o", "--output", help="File path to save the response content"),
-    response_format: str = Option("json", "-f", "--format", help="Format to save the response (json or raw)"),
+    response_format: str = Option("raw", "-f", "--format", help="Format to save the response: 'raw' streams the body to disk, 'json' pretty prints it afterwards"),
     save_request_to_file: str = Option(None, "-O", "--save-request", "--dump-request", help="File path to save the request details (json format)"),
     show_request: bool = Option(False, "-r", "--show-request", help="Whether to display the full request details"),
     headers_list: list[str] = Option(None, "-H", "--header", help="Additional headers to include in the GET request"),
     user_saved_requests: str | None = Option(None, "-U", "--use-token", help="Provide alias to use saved token from token file (type [cyan]default[/cyan] to use the default token)"),
     token_placement: str = Option("header", "-tp", "--token-placement", help="Where to attach the token: 'header' or 'cookie'"),
-    token_cookie_name: str = Option("access_token", "-cn", "--cookie-name", help="Name of the cookie if token placement is 'cookie'")
+    token_cookie_name: str = Option("access_token", "-cn", "--cookie-name", help="Name of the cookie if token placement is 'cookie'"),
+    accept_encoding: str = Option(None, "--accept-encoding", help="Response encodings to accept, comma separated, or 'all' for every installed codec (gzip, deflate, br, zstd)"),
+    show_timing: bool = Option(False, "--timing", help="Show a DNS, connect, TLS, first byte and transfer timing breakdown"),
+    write_out: str = Option(None, "-w", "--write-out", help="Print curl-style variables after the transfer, e.g. '%{http_code} %{time_total}\\n' (use '@filename' to read the format)"),
+    retries: int = Option(0, "--retry", min=0, help="Retry connection errors and --retry-on statuses up to N times"),
+    retry_backoff: float = Option(0.5, "--retry-backoff", min=0, help="Base delay in seconds for exponential backoff with full jitter (Retry-After takes precedence)"),
+    retry_max_time: float = Option(None, "--retry-max-time", min=0, help="Do not start another attempt after this many seconds"),
+    retry_on: str = Option("429,502,503,504", "--retry-on", help="Comma separated status codes that trigger a retry"),
+    connect_timeout: float = Option(None, "--connect-timeout", min=0, help="Seconds allowed for the DNS lookup, TCP connect and TLS handshake (0 disables the config default)"),
+    max_time: float = Option(None, "-m", "--max-time", min=0, help="Wall-clock limit in seconds for the whole transfer, retries and response body included (0 disables the config default)"),
+    resume: bool = Option(False, "-C", "--continue", help="Resume an interrupted --output download using HTTP Range requests"),
+    segments: int = Option(1, "-S", "--segments", min=1, help="Download --output in this many parallel byte ranges when the server supports them"),
+    use_cache: bool = Option(False, "--cache", help="Serve the response from the on-disk HTTP cache when fresh, revalidating it otherwise")
 ):
     """
     Perform a GET request to the specified URL and return the response.
     """
     try:
-        headers = {}
+        # Raw passthrough also moves every message to stderr, so decide it first
+        render_limits = RenderLimits(max_render_bytes, max_depth, max_items)
+        json_query = JsonQuery(query) if query else None
+        # Query matches are shown unless they only go to --output
+        show_content = show_content or bool(json_query and not save_to_file)
+        raw = rawOutputMode(raw, show_content or stream, render_limits)
+        show_content = show_content or raw
 
-        # Parse headers from list
-        if headers_list:
-            for header in headers_list:
-                key, value = header.split(":", 1)
-                headers[key.strip()] = value.strip()
+        if stream and (save_to_file or save_request_to_file or use_cache):
+            raise SystemExit(TextDisplay.error_text("--stream cannot be combined with --output, --save-request or --cache"))
 
-        # Handle authenticated requests
-        request_cookies = {}
-        if user_saved_requests:
-            token, token_headers = getSavedToken(user_saved_requests)
-            if token_placement.lower() == "header":
-                headers.update(token_headers)
-            elif token_placement.lower() == "cookie":
-                request_cookies[token_cookie_name] = token
-            else:
-                 TextDisplay.warn_text(f"Unknown token placement '{token_placement}', defaulting to header.")
-                 headers.update(token_headers)
-        
-        response = requests.get(url, headers=headers, cookies=request_cookies)
+        if json_query and (stream or resume or segments > 1):
+            raise SystemExit(TextDisplay.error_text("--query cannot be combined with --stream, --continue or --segments"))
 
-        # Handle failed requests
-        if response.status_code >= 400:
-            try:
-                response_json = response.json()
-                TextDisplay.error_text(f"Request failed with status code: {response.status_code}")
-                TextDisplay.print_json(response_json)
-            except ValueError:
-                TextDisplay.error_text(f"Request failed with status code: {response.status_code}")
-                print(response.text)
-            raise SystemExit(response.status_code) 
+        retry = retryPolicyFromOptions(retries, retry_backoff, retry_max_time, retry_on)
+        deadline = deadlineFromOptions(max_time, connect_timeout)
 
-        # Success message
-        TextDisplay.style_text(f"GET request to {url} successful.", style="white")
-        TextDisplay.success_text(f"Status Code: {response.status_code}")
-        
-        # Display response content if requested
-        if show_content:
-            TextDisplay.info_text("Response Content:", style="white")
-            try:
-                TextDisplay.print_json(response.json())
-            except ValueError:
-                print(response.text)
+        # Resume from the partial file of an earlier download
+        resume_from, resume_headers = 0, {}
+        if resume:
+            if not save_to_file:
+                raise SystemExit(TextDisplay.error_text("--continue requires --output"))
+            if show_content:
+                raise SystemExit(TextDisplay.error_text("--continue cannot be combined with --show-content"))
+            resume_from, resume_headers = resumeHeaders(save_to_file)
 
-        # Save response to file if path provided
-        if save_to_file:
-            saveResponseToFile(response, save_to_file, response_format)
+        request_options = dict(
+            headers_list=headers_list,
+            use_token=user_saved_requests,
+            token_placement=token_placement,
+            token_cookie_name=token_cookie_name,
+            accept_encoding=accept_encoding
+        )
 
-        # Save request/response details
-        if save_request_to_file:
-            saveRequestResponse(response, save_request_to_file)
+        if use_cache and (resume or segments > 1):
+            raise SystemExit(TextDisplay.error_text("--cache cannot be combined with --continue or --segments"))
 
-        # Show request details
-        if show_request:
-            TextDisplay.info_text("Request Details:")
-            TextDisplay.print_json({
-                "method": response.request.method,
-                "url": response.request.url,
-                "headers": dict(response.request.headers),
-                "body": (
-                    response.request.body.decode("utf-8")
-                    if isinstance(response.request.body, bytes)
-                    else response.request.body
-                ) if response.request.body else None
-            })
+        # Parallel ranged download; falls back to a single stream without range support
+        if segments > 1:
+            if not save_to_file:
+                raise SystemExit(TextDisplay.error_text("--segments requires --output"))
+            if show_content or resume or save_request_to_file or show_request:
+                raise SystemExit(TextDisplay.error_text(
+                    "--segments cannot be combined with --show-content, --continue, --save-request or --show-request"
+                ))
+
+            # One pooled connection per segment
+            configureSession(pool_maxsize=max(POOL_MAXSIZE, segments))
+            response = segmentedDownload(buildRequest("GET", url, **request_options), save_to_file, segments, response_format, retry=retry, deadline=deadline)
+            if response is None:
+                return
+        elif use_cache:
+            response = sendCached(buildRequest("GET", url, **request_options), retry=retry, deadline=deadline)
+        else:
+            response = sendRequest("GET", url, headers=resume_headers, stream=True, retry=retry, deadline=deadline, **request_options)
+
+        # Range not satisfiable: the partial file is stale, start over
+        if resume_from and response.status_code == 416:
+            response.close()
+            TextDisplay.warn_text("Partial download cannot be resumed; downloading the full response.")
+            discardPartialDownload(save_to_file)
+            resume_from = 0
+            response = sendRequest("GET", url, stream=True, retry=retry, deadline=deadline, **request_options)
+
+        handleResponse(
+            response,
+            method="GET",
+            url=url,
+            show_content=show_content,
+            save_to_file=save_to_file,
+            response_format=response_format,
+            save_request_to_file=save_request_to_file,
+            show_request=show_request,
+            show_timing=show_timing,
+            write_out=write_out,
+            resume_from=resume_from,
+            render_limits=render_limits,
+            raw=raw,
+            stream_events=stream,
+            max_events=max_events,
+            idle_timeout=idle_timeout,
+            query=json_query
+        )
 
     except requests.exceptions.RequestException as e:
-        raise SystemExit(TextDisplay.error_text(f"Error during GET request: {e}"))
+        TextDisplay.error_text(f"Error during GET request: {e}")
+        raise SystemExit(exitCode(e))
+
+    except ValueError as ve:
+        raise SystemExit(TextDisplay.error_text(str(ve)))
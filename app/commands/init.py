@@ -1,9 +1,8 @@
-import json
 from pathlib import Path
 from typer import Option
 
 from app.utils import TextDisplay
-from app.utils import CONFIG_PATH, getDefaultConfig
+from app.utils import CONFIG_PATH, getDefaultConfig, fileLock, atomicWrite, jsonDumpBytes
 
 # pycurl init
 def init(
@@ -39,8 +38,8 @@ def init(
                 config_file.parent.mkdir(parents=True, exist_ok=True)
                 TextDisplay.success_text(f"Created directory: {config_file.parent}")
             
-            with open(config_file, "w", encoding="utf-8") as cf:
-                json.dump(DEFAULT_CONFIG_TEMPLATE, cf, indent=4)
+            with fileLock(config_file):
+                atomicWrite(config_file, jsonDumpBytes(DEFAULT_CONFIG_TEMPLATE, indent=4), mode=0o644)
             
             created_config = True
             TextDisplay.success_text(f"Created configuration file at: {config_file}")
@@ -49,11 +48,8 @@ def init(
 
         # Create or update token file
         if not token_file.exists() or overwrite:
-            token_file.parent.mkdir(parents=True, exist_ok=True)
-            token_file.write_text(
-                DEFAULT_TOKEN_TEMPLATE,
-                encoding="utf-8"
-            )
+            with fileLock(token_file):
+                atomicWrite(token_file, DEFAULT_TOKEN_TEMPLATE)
             created_token = True
             TextDisplay.success_text("Created tokens file")
         else:
@@ -2,18 +2,36 @@ import json
 import requests
 from typer import Argument, Option
 
-from app.utils import TextDisplay, saveResponseToFile, saveRequestResponse, getSavedToken
+from app.utils import TextDisplay, RenderLimits, rawOutputMode, JsonQuery, sendRequest, handleResponse, retryPolicyFromOptions, deadlineFromOptions, exitCode
 
 # pycurl patch
 def patch(
     url: str = Argument(..., help="The URL to send the PATCH request to"),
     save_to_file: str = Option(None, "-o", "--output", help="File path to save the response content"),
-    response_format: str = Option("json", "-f", "--format", help="Format to save the response (json or raw)"),
+    response_format: str = Option("raw", "-f", "--format", help="Format to save the response: 'raw' streams the body to disk, 'json' pretty prints it afterwards"),
     save_request_to_file: str = Option(None, "-O", "--save-request", "--dump-request", help="File path to save the request details (json format)"),
     show_request: bool = Option(False, "-r", "--show-request", help="Whether to display the full request details"),
     show_content: bool = Option(False, "-s", "--show-content", help="Whether to display the response content"),
-    json_data: str = Option(None, "-j", "--json", help="JSON data to include in the PATCH request body (use '@filename' to read from file)"),
-    data: str = Option(None, "-d", "--data", help="Data to include in the PATCH request"),
+    max_render_bytes: int = Option(None, "--max-render-bytes", min=0, help="Stop printing the response content after this many bytes (default 1 MiB on a terminal, unlimited when piped; 0 disables the cap)"),
+    max_depth: int = Option(None, "--max-depth", min=1, help="Summarise JSON objects and arrays nested deeper than this when showing the response content"),
+    max_items: int = Option(None, "--max-items", min=1, help="Show at most this many elements of each JSON array when showing the response content"),
+    raw: bool = Option(None, "--raw/--no-raw", help="Write the response body bytes to stdout as they are, with messages on stderr (default when --show-content output is piped)"),
+    query: str = Option(None, "-q", "--query", help="Show or save only the parts of a JSON response selected by a jq-like path, e.g. '.items[].id' (evaluated while the body streams in)"),
+    json_data: str = Option(None, "-j", "--json", help="JSON data to include in the PATCH request body (use '@filename' to stream from file)"),
+    data: str = Option(None, "-d", "--data", help="Data to include in the PATCH request (use '@filename' to stream from file)"),
+    data_binary: str = Option(None, "--data-binary", help="Binary data to include in the PATCH request (use '@filename' to stream from file)"),
+    no_parse: bool = Option(False, "--no-parse", help="Send --json as-is without validating it"),
+    compress_body: str = Option(None, "--compress-body", help="Compress the request body while sending it: 'gzip' or 'deflate'"),
+    accept_encoding: str = Option(None, "--accept-encoding", help="Response encodings to accept, comma separated, or 'all' for every installed codec (gzip, deflate, br, zstd)"),
+    show_timing: bool = Option(False, "--timing", help="Show a DNS, connect, TLS, first byte and transfer timing breakdown"),
+    write_out: str = Option(None, "-w", "--write-out", help="Print curl-style variables after the transfer, e.g. '%{http_code} %{time_total}\\n' (use '@filename' to read the format)"),
+    retries: int = Option(0, "--retry", min=0, help="Retry connection errors and --retry-on statuses up to N times"),
+    retry_backoff: float = Option(0.5, "--retry-backoff", min=0, help="Base delay in seconds for exponential backoff with full jitter (Retry-After takes precedence)"),
+    retry_max_time: float = Option(None, "--retry-max-time", min=0, help="Do not start another attempt after this many seconds"),
+    retry_on: str = Option("429,502,503,504", "--retry-on", help="Comma separated status codes that trigger a retry"),
+    retry_non_idempotent: bool = Option(False, "--retry-non-idempotent", help="Allow retrying this PATCH request, which may repeat its side effects"),
+    connect_timeout: float = Option(None, "--connect-timeout", min=0, help="Seconds allowed for the DNS lookup, TCP connect and TLS handshake (0 disables the config default)"),
+    max_time: float = Option(None, "-m", "--max-time", min=0, help="Wall-clock limit in seconds for the whole transfer, retries and response body included (0 disables the config default)"),
     headers_list: list[str] = Option(None, "-H", "--header", help="Additional headers to include in the PATCH request"),
     user_saved_requests: str | None = Option(None, "-U", "--use-token", help="Provide alias to use saved token from token file (type [cyan]default[/cyan] to use the default token)"),
     token_placement: str = Option("header", "-tp", "--token-placement", help="Where to attach the token: 'header' or 'cookie'"),
@@ -23,101 +41,60 @@ def patch(
     Perform a PATCH request to the specified URL.
     """
     try:
-        headers = {}
-
-        # Parse headers from list
-        if headers_list:
-            for header in headers_list:
-                key, value = header.split(":", 1)
-                headers[key.strip()] = value.strip()
-
-        # Handle authenticated requests
-        request_cookies = {}
-        if user_saved_requests:
-            token, token_headers = getSavedToken(user_saved_requests)
-            if token_placement.lower() == "header":
-                headers.update(token_headers)
-            elif token_placement.lower() == "cookie":
-                request_cookies[token_cookie_name] = token
-            else:
-                 TextDisplay.warn_text(f"Unknown token placement '{token_placement}', defaulting to header.")
-                 headers.update(token_headers)
-
-        if not json_data and not data:
+        # Raw passthrough also moves every message to stderr, so decide it first
+        render_limits = RenderLimits(max_render_bytes, max_depth, max_items)
+        json_query = JsonQuery(query) if query else None
+        # Query matches are shown unless they only go to --output
+        show_content = show_content or bool(json_query and not save_to_file)
+        raw = rawOutputMode(raw, show_content, render_limits)
+        show_content = show_content or raw
+
+        retry = retryPolicyFromOptions(retries, retry_backoff, retry_max_time, retry_on, retry_non_idempotent)
+        deadline = deadlineFromOptions(max_time, connect_timeout)
+
+        if not json_data and not data and not data_binary:
             TextDisplay.warn_text("Sending PATCH request without a request body")
 
-        if json_data and data:
-            raise SystemExit(TextDisplay.error_text("Use either --json or --data, not both"))
-
-        if json_data:
-            # Handle JSON payload
-            headers.setdefault("Content-Type", "application/json")
-
-            if json_data.strip().startswith("@"):
-                file_path = json_data.strip()[1:]
-                with open(file_path, "r", encoding="utf-8") as f:
-                    payload = json.load(f)
-            else:
-                payload = json.loads(json_data)
-
-            response = requests.patch(url, json=payload, headers=headers, cookies=request_cookies)
-
-        # Handle form data payload
-        elif data:
-            headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
-            response = requests.patch(url, data=data, headers=headers, cookies=request_cookies)
-
-        # Handle empty body PATCH
-        else:
-            response = requests.patch(url, headers=headers, cookies=request_cookies)
-
-        # Handle failed requests
-        if response.status_code >= 400:
-            try:
-                response_json = response.json()
-                TextDisplay.error_text(f"Request failed with status code: {response.status_code}")
-                TextDisplay.print_json(response_json)
-            except ValueError:
-                TextDisplay.error_text(f"Request failed with status code: {response.status_code}")
-                print(response.text)
-            raise SystemExit(response.status_code) 
-
-        # Success message
-        TextDisplay.style_text(f"PATCH request to {url} successful.", style="white")
-        TextDisplay.success_text(f"Status Code: {response.status_code}")
- 
-        # Save response if requested
-        if save_to_file:
-            saveResponseToFile(response, save_to_file, response_format)
-
-        # Display content if requested
-        if show_content:
-            TextDisplay.info_text("Response Content:", style="white")
-            try:
-                TextDisplay.print_json(response.json())
-            except ValueError:
-                print(response.text)
-
-        # Save request/response details
-        if save_request_to_file:
-            saveRequestResponse(response, save_request_to_file)
-
-        # Show request details
-        if show_request:
-            TextDisplay.info_text("Request Details:")
-            TextDisplay.print_json({
-                "method": response.request.method,
-                "url": response.request.url,
-                "headers": dict(response.request.headers),
-                "body": (
-                    response.request.body.decode("utf-8")
-                    if isinstance(response.request.body, bytes)
-                    else response.request.body
-                )
-            })
+        if sum(bool(body) for body in (json_data, data, data_binary)) > 1:
+            raise SystemExit(TextDisplay.error_text("Use only one of --json, --data or --data-binary"))
+
+        response = sendRequest(
+            "PATCH",
+            url,
+            headers_list=headers_list,
+            use_token=user_saved_requests,
+            token_placement=token_placement,
+            token_cookie_name=token_cookie_name,
+            json_data=json_data,
+            data=data,
+            data_binary=data_binary,
+            parse_json=not no_parse,
+            compress_body=compress_body,
+            accept_encoding=accept_encoding,
+            stream=True,
+            retry=retry,
+            deadline=deadline
+        )
+
+        handleResponse(
+            response,
+            method="PATCH",
+            url=url,
+            show_content=show_content,
+            save_to_file=save_to_file,
+            response_format=response_format,
+            save_request_to_file=save_request_to_file,
+            show_request=show_request,
+            show_timing=show_timing,
+            write_out=write_out,
+            render_limits=render_limits,
+            raw=raw,
+            query=json_query
+        )
 
     except requests.exceptions.RequestException as e:
-        raise SystemExit(TextDisplay.error_text(f"Error during PATCH request: {e}"))
+        TextDisplay.error_text(f"Error during PATCH request: {e}")
+        raise SystemExit(exitCode(e))
     
     except json.JSONDecodeError as jde:
         raise SystemExit(TextDisplay.error_text(f"Invalid JSON data: {jde}"))
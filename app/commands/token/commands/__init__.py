@@ -1,5 +1,7 @@
 from .list_tokens import list_tokens
 from .set_token import set_token
 from .remove_token import remove
+from .import_tokens import import_tokens
+from .export_tokens import export_tokens
 
-__all__ = ["list_tokens", "set_token", "remove"]
\ No newline at end of file
+__all__ = ["list_tokens", "set_token", "remove", "import_tokens", "export_tokens"]
\ No newline at end of file
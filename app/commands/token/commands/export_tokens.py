@@ -0,0 +1,27 @@
+from typer import Argument
+
+from app.utils import (
+    CONFIG_PATH,
+    getConfigContext,
+    openTokenStore,
+    exportTokens,
+    TextDisplay,
+    ConfigError
+)
+
+# pycurl token export
+def export_tokens(
+    file: str = Argument("-", help="File to write alias:token lines to ('-' for stdout)")
+):
+    """Export the configured token store in the text token format."""
+    try:
+        store = openTokenStore(getConfigContext(CONFIG_PATH))
+
+        count = exportTokens(store, file)
+        if file != "-":
+            TextDisplay.success_text(f"Exported {count} token(s) to {file}")
+
+    except ConfigError as ce:
+        TextDisplay.error_text(str(ce))
+    except Exception as e:
+        TextDisplay.error_text(f"Error: {e}")
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from typer import Argument
+
+from app.utils import (
+    CONFIG_PATH,
+    getConfigContext,
+    openTokenStore,
+    importTokens,
+    TextDisplay,
+    ConfigError
+)
+
+# pycurl token import
+def import_tokens(
+    file: str = Argument(..., help="Text token file with one alias:token per line")
+):
+    """Import tokens from a text token file into the configured token store."""
+    try:
+        store = openTokenStore(getConfigContext(CONFIG_PATH))
+        source = Path(file).expanduser().resolve()
+
+        if store.kind == "text" and source == store.path:
+            raise ValueError("Cannot import the token file into itself")
+
+        imported, duplicates = importTokens(store, source)
+        if duplicates:
+            TextDisplay.warn_text(f"{duplicates} duplicate alias(es) in {source}; the last occurrence was kept.")
+        TextDisplay.success_text(f"Imported {imported} token(s) into {store.path}")
+
+    except ConfigError as ce:
+        TextDisplay.error_text(str(ce))
+    except ValueError as ve:
+        TextDisplay.error_text(str(ve))
+    except Exception as e:
+        TextDisplay.error_text(f"Error: {e}")
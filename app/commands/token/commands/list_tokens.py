@@ -2,9 +2,9 @@ from typer import Argument
 
 from app.utils import (
     CONFIG_PATH,
-    parse_token_file,
-    extractConfigAttributes,
-    loadAndValidateConfig,
+    openTokenStore,
+    formatTimestamp,
+    getConfigContext,
     TextDisplay,
     TableDisplay,
     InvalidConfig,
@@ -17,28 +17,43 @@ def list_tokens(
 ):
     """List specific tokens by alias or all available tokens."""
     try:
-        config = loadAndValidateConfig(CONFIG_PATH)
-        token_file, _, default = extractConfigAttributes(config)
-        tokens = parse_token_file(token_file)
-        
+        context = getConfigContext(CONFIG_PATH)
+        default = context.default_token
+        store = openTokenStore(context)
+
         # Handle default alias resolution
         if alias == "default":
             if not default:
                 raise ConfigError("Default alias is not set. use [blue]pycurl config generate --modify[/blue] to set")
-            if default not in tokens:
+            if store.get(default) is None:
                 raise InvalidConfig(f"Default alias '{default}' not found")
-            return tokens[default]
+            alias = default
 
         if alias:
-            if alias not in tokens:
+            record = store.get(alias)
+            if record is None:
                 raise InvalidConfig(f"Token alias '{alias}' not found")
-            token = tokens[alias]
-            TextDisplay.style_text(f"[bold]{alias}[/bold] : {token}", style="white")
+            TextDisplay.style_text(f"[bold]{alias}[/bold] : {record.token}", style="white")
+            if store.kind == "sqlite":
+                TextDisplay.style_text(
+                    f"Type: {record.token_type or '-'}  Created: {formatTimestamp(record.created_at)}  "
+                    f"Expires: {formatTimestamp(record.expires_at)}{' (expired)' if record.expired() else ''}",
+                    style="gray50"
+                )
             return
-        
-        table = TableDisplay( title="Tokens",columns=["Alias", "Token"], style="white")
-        for alias, token in tokens.items():
-            table.add_row([alias, token])
+
+        # The sqlite store also keeps per-token metadata
+        if store.kind == "sqlite":
+            table = TableDisplay(title="Tokens", columns=["Alias", "Token", "Type", "Created", "Expires"], style="white")
+            for record in store.records():
+                table.add_row(
+                    [record.alias, record.token, record.token_type or "-", formatTimestamp(record.created_at), formatTimestamp(record.expires_at)],
+                    style="red" if record.expired() else "white"
+                )
+        else:
+            table = TableDisplay( title="Tokens",columns=["Alias", "Token"], style="white")
+            for record in store.records():
+                table.add_row([record.alias, record.token])
         table.show()
 
 
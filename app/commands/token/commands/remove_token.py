@@ -1,22 +1,23 @@
 from typer import Argument, Option
 
-from app.utils import CONFIG_PATH, extractConfigAttributes, loadAndValidateConfig, TextDisplay, PromptTaker, ConfigError, ConfigNotFound
+from app.utils import CONFIG_PATH, getConfigContext, openTokenStore, TextDisplay, PromptTaker, ConfigError, ConfigNotFound
 
 def remove(
     alias: str | None = Argument(None, help="Token alias name to delete (ignored when --all is used)"),
-    all: bool = Option(False, "-a", "--all", help="Delete all tokens from the file")
+    all: bool = Option(False, "-a", "--all", help="Delete all tokens from the token store")
 ):
-    """Remove a specific token alias or clear the entire token file."""
+    """Remove a specific token alias or clear the entire token store."""
     try:
         if not alias and not all:
             raise ValueError("Give [yellow]alias name[/yellow] to delete token or \nuse [yellow]--all[/yellow] to delete all token")
-        
 
-        config = loadAndValidateConfig(CONFIG_PATH)
-        token_file_path,_,default = extractConfigAttributes(config_data=config)
-        if not token_file_path.exists():
-            raise ConfigNotFound(f"Token file not found at {token_file_path}\n use [yellow] pycurl token set[/yellow]")
-        
+
+        context = getConfigContext(CONFIG_PATH)
+        default = context.default_token
+        store = openTokenStore(context)
+        if not store.exists():
+            raise ConfigNotFound(f"Token file not found at {store.path}\n use [yellow] pycurl token set[/yellow]")
+
         # Confirmation for destructive actions
         if all:
             confirm = PromptTaker.confirm(
@@ -27,54 +28,25 @@ def remove(
                 TextDisplay.info_text("Operation cancelled")
                 return
 
-        with open(token_file_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        new_lines = []
-        found = False
-
-        for line in lines:
-            stripped = line.strip()
-
-            if not stripped or stripped.startswith("#"):
-                new_lines.append(line)
-                continue
-
-            if ":" not in stripped:
-                new_lines.append(line)
-                continue
-
-            name, _ = stripped.split(":", 1)
-
-            if all:
-                continue
-
-            # Handle default alias resolution
-            if alias == "default":
-                alias = default
-
-            if name.strip() == alias:
-                found = True
-                continue
+            store.clear()
+            TextDisplay.success_text("All tokens deleted successfully.")
+            return
 
-            new_lines.append(line)
+        # Handle default alias resolution
+        if alias == "default":
+            if not default:
+                raise ValueError("No default token is set; give the alias name to delete.")
+            alias = default
 
-        if not all and not found:
+        if not store.remove(alias):
             raise ValueError(f"Token alias '{alias}' not found.")
 
-        # Write changes
-        with open(token_file_path, "w", encoding="utf-8") as f:
-            f.writelines(new_lines)
+        TextDisplay.success_text(f"Token '{alias}' deleted successfully")
 
-        if all:
-            TextDisplay.success_text("All tokens deleted successfully.")
-        else:
-            TextDisplay.success_text(f"Token '{alias}' deleted successfully")
-
-            if alias == default:
-                TextDisplay.warn_text(
-                    "Deleted token was default. Consider setting a new default token."
-                )
+        if alias == default:
+            TextDisplay.warn_text(
+                "Deleted token was default. Consider setting a new default token."
+            )
 
 
     except ConfigError as ce:
@@ -1,81 +1,49 @@
+import time
+
 from typer import Argument, Option
 
 from app.utils import (
-    CONFIG_PATH, 
-    tokenPathResolver, 
-    loadAndValidateConfig, 
-    TextDisplay, 
-    ConfigError, 
+    CONFIG_PATH,
+    getConfigContext,
+    openTokenStore,
+    TextDisplay,
+    ConfigError,
     alias_validator
 )
 
 # pycurl token set
 def set_token(
     token: str = Argument(..., help="Token string to save"),
-    alias: str = Option(..., "-a", "--alias", help="Alias for this token")
+    alias: str = Option(..., "-a", "--alias", help="Alias for this token"),
+    token_type: str | None = Option(None, "--type", help="Token type sent with this token, overriding auth.token_type (sqlite store only)"),
+    expires_in: float | None = Option(None, "-e", "--expires-in", min=0, help="Seconds until the token expires (sqlite store only)")
 ):
-    """Add a new token or update an existing one in the token file."""
+    """Add a new token or update an existing one in the token store."""
     try:
-        config = loadAndValidateConfig(config_path=CONFIG_PATH)
-        token_file_path = tokenPathResolver(config_data=config)
-
-        # Handle token file existence
-        if not token_file_path.exists():
-            TextDisplay.warn_text(f"Token file not found at {token_file_path}\n[yellow]Creating File...[/yellow]")
-            token_file_path.parent.mkdir(parents=True, exist_ok=True)
-            token_file_path.touch()
+        store = openTokenStore(getConfigContext(CONFIG_PATH))
 
         # Validate alias format
         if alias and not alias_validator(alias):
             raise ValueError("Invalid alias format")
 
-        # Read existing file
-        with open(token_file_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        new_lines = []
-        found = False
-        new_token_line = f"{alias}:{token}\n"
-
-        for line in lines:
-            stripped = line.strip()
-            
-            # Preserve comments and empty lines
-            if not stripped or stripped.startswith("#"):
-                new_lines.append(line)
-                continue
-            
-            if ":" not in stripped:
-                new_lines.append(line)
-                continue
-                
-            current_alias, _ = stripped.split(":", 1)
-            
-            if current_alias.strip() == alias:
-                new_lines.append(new_token_line)
-                found = True
-            else:
-                new_lines.append(line)
+        # Handle token file existence
+        if not store.exists():
+            TextDisplay.warn_text(f"Token {'database' if store.kind == 'sqlite' else 'file'} not found at {store.path}\n[yellow]Creating File...[/yellow]")
 
-        # Append if new alias
-        if not found:
-            # Ensure we start on a new line if the file doesn't end with one
-            if new_lines and not new_lines[-1].endswith("\n"):
-                new_lines[-1] += "\n"
-            new_lines.append(new_token_line)
+        if store.kind == "text" and (token_type or expires_in is not None):
+            TextDisplay.warn_text("--type and --expires-in are only stored by the sqlite token store; ignoring them.")
 
-        # Write updates
-        with open(token_file_path, "w", encoding="utf-8") as f:
-            f.writelines(new_lines)
+        expires_at = time.time() + expires_in if expires_in is not None else None
+        found = store.set(alias, token, token_type=token_type, expires_at=expires_at)
 
         if found:
-            TextDisplay.info_text(f"Token '{alias}' updated successfully at {token_file_path}")
+            TextDisplay.info_text(f"Token '{alias}' updated successfully at {store.path}")
         else:
-            TextDisplay.info_text(f"Token '{alias}' set successfully at {token_file_path}")
+            TextDisplay.info_text(f"Token '{alias}' set successfully at {store.path}")
 
     except ConfigError as ce:
         TextDisplay.error_text(str(ce))
     except ValueError as ve:
         TextDisplay.error_text(str(ve))
     except Exception as e:
-        TextDisplay.error_text(f"Error: {e}")
\ No newline at end of file
+        TextDisplay.error_text(f"Error: {e}")
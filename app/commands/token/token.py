@@ -1,6 +1,6 @@
 from typer import Typer
 
-from .commands import list_tokens, set_token, remove
+from .commands import list_tokens, set_token, remove, import_tokens, export_tokens
 
 # Typer object for subcommand
 token = Typer(
@@ -53,3 +53,24 @@ token.command(
     pycurl token remove --all\n
     """
 )(remove)
+
+# pycurl token import ...
+token.command(
+    name="import",
+    short_help="Import tokens from a text token file into the token store",
+    epilog="""
+    EXAMPLES
+    pycurl token import ~/.pycurl/tokens\n
+    """
+)(import_tokens)
+
+# pycurl token export ...
+token.command(
+    name="export",
+    short_help="Export the token store as a text token file",
+    epilog="""
+    EXAMPLES
+    pycurl token export tokens.txt\n
+    pycurl token export > tokens.txt\n
+    """
+)(export_tokens)
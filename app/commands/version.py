@@ -0,0 +1,6 @@
+from app.utils import TextDisplay
+
+# pycurl version
+def version():
+    """Show the version of PyCurl"""
+    TextDisplay.style_text("PyCurl version: 1.1.1", style="white")
@@ -1,62 +1,55 @@
 from typer import Typer
 
-from app.commands import init, config, get, post, put, patch, delete, auth, token, docs
-from app.commands.docs.commands import workflow_docs
-from app.utils import PanelDisplay, TextDisplay
+from app.utils.lazyGroup import LazyGroup, lazyCommand, lazyTyper
 
 # Typer app instance
 app = Typer(
     name="pycurl", 
     help="A lightweight curl-like CLI tool written in Python using requests",
-    no_args_is_help=True
+    no_args_is_help=True,
+    cls=LazyGroup
 )
 
-# Registering subcommands
-
-# pycurl auth ...
-app.add_typer(auth)
-
-# pycurl config ...
-app.add_typer(config)
-
-# pycurl token ...
-app.add_typer(token)
-
-# pycurl docs ...
-app.add_typer(docs)
-
-# pycurl workflow ...
-app.add_typer(workflow_docs)
-
+# Root callback; subcommands are imported by LazyGroup when they run
+@app.callback()
+def main():
+    pass
 
 # Commands
 
 # pycurl init ...
-app.command(
-    name="init",
+lazyCommand(
+    "init",
+    "app.commands.init:init",
     short_help="Initialize the application with a configuration file",
     epilog="""
     EXAMPLES\n
     pycurl init\n
     pycurl init --token-file ./tokens
     """
-)(init)
+)
 
 # pycurl get ...
-app.command(
-    name="get",
+lazyCommand(
+    "get",
+    "app.commands.get:get",
     short_help="Perform a GET request",
     epilog="""
     EXAMPLES\n
     pycurl get https://jsonplaceholder.typicode.com/posts/1\n
     pycurl get https://api.example.com/data --output data.json --header "Authorization: Basic ..."\n
-    pycurl get https://api.example.com/protected --use-token mytoken -r
+    pycurl get https://api.example.com/protected --use-token mytoken -r\n
+    pycurl get https://downloads.example.com/export.tar.gz -o export.tar.gz --continue\n
+    pycurl get https://downloads.example.com/dataset.bin -o dataset.bin --segments 8\n
+    pycurl get https://api.example.com/schema.json --cache -o schema.json\n
+    pycurl get https://api.example.com/health --connect-timeout 2 --max-time 10
     """
-)(get)
+)
 
 # pycurl post ...
-app.command(
-    name="post",
+lazyCommand(
+    "post",
+    "app.commands.post:post",
     short_help="Perform a POST request",
     epilog="""
     EXAMPLES\n
@@ -64,11 +57,12 @@ app.command(
     pycurl post https://api.example.com/login --json @credentials.json\n
     pycurl post https://api.example.com/submit --data "key=value"
     """
-)(post)
+)
 
 # pycurl put ...
-app.command(
-    name="put",
+lazyCommand(
+    "put",
+    "app.commands.put:put",
     short_help="Perform a PUT request",
     epilog="""
     EXAMPLES\n
@@ -77,11 +71,12 @@ app.command(
     pycurl put https://api.example.com/resources/1 --json @payload.json\n
     pycurl put https://api.example.com/protected/1 --use-token my-alias --json '{"active": true}'
     """
-)(put)
+)
 
 # pycurl patch ...
-app.command(
-    name="patch",
+lazyCommand(
+    "patch",
+    "app.commands.patch:patch",
     short_help="Perform a PATCH request",
     epilog="""
     EXAMPLES\n
@@ -90,11 +85,12 @@ app.command(
     pycurl patch https://api.example.com/resources/1 --json @update.json\n
     pycurl patch https://api.example.com/protected/1 --use-token my-alias --json '{"status": "archived"}'
     """
-)(patch)
+)
 
 # pycurl delete ...
-app.command(
-    name="delete",
+lazyCommand(
+    "delete",
+    "app.commands.delete:delete",
     short_help="Perform a DELETE request",
     epilog="""
     EXAMPLES\n
@@ -103,43 +99,80 @@ app.command(
     pycurl delete https://api.example.com/resources/1 --json '{"reason": "cleanup"}'\n
     pycurl delete https://api.example.com/protected/1 --use-token my-alias
     """
-)(delete)
+)
+
+# pycurl batch ...
+lazyCommand(
+    "batch",
+    "app.commands.batch:batch",
+    short_help="Run a JSONL file of requests concurrently",
+    epilog="""
+    EXAMPLES\n
+    pycurl batch requests.jsonl\n
+    pycurl batch requests.jsonl --concurrency 32 --order completion\n
+    pycurl batch requests.jsonl --engine async --concurrency 2000\n
+    cat requests.jsonl | pycurl batch - --output results.jsonl
+    """
+)
 
+# pycurl bench ...
+lazyCommand(
+    "bench",
+    "app.commands.bench:bench",
+    short_help="Load test a URL and report latency percentiles",
+    epilog="""
+    EXAMPLES\n
+    pycurl bench https://api.example.com/health\n
+    pycurl bench https://api.example.com/users -n 5000 -c 50 -U my-alias\n
+    pycurl bench https://api.example.com/search -X POST --json '{"q": "x"}' --duration 30 --format json
+    """
+)
 
 # General Commands
 
 # pycurl version
-@app.command(
-    name="version",
+lazyCommand(
+    "version",
+    "app.commands.version:version",
     short_help="Show the version of PyCurl",
     epilog="""
     EXAMPLES\n
     pycurl version\n
     """
 )
-def version():
-    """Show the version of PyCurl"""
-    TextDisplay.style_text("PyCurl version: 1.1.1", style="white")
 
 # pycurl about
-@app.command(
-    name="about",
+lazyCommand(
+    "about",
+    "app.commands.about:about",
     short_help="Show information about PyCurl",
     epilog="""
     EXAMPLES\n
     pycurl about\n
     """
 )
-def about():
-    """Show information about PyCurl"""
-    PanelDisplay.print_panel(
-      "About PyCurl", 
-      "PyCurl is a lightweight curl-like CLI tool written in Python using requests.", 
-      border_style="cyan", 
-      subtitle="Version 1.1.1"
-    )
 
 
+# Registering subcommands
+
+# pycurl auth ...
+lazyTyper("auth", "app.commands.auth.auth:auth")
+
+# pycurl config ...
+lazyTyper("config", "app.commands.config.config:config")
+
+# pycurl token ...
+lazyTyper("token", "app.commands.token.token:token")
+
+# pycurl cache ...
+lazyTyper("cache", "app.commands.cache.cache:cache")
+
+# pycurl docs ...
+lazyTyper("docs", "app.commands.docs.docs:docs")
+
+# pycurl workflow ...
+lazyTyper("workflow", "app.commands.docs.commands.workflow:workflow_docs")
+
 
 if __name__ == "__main__":
     app()
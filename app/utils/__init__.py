@@ -1,72 +1,152 @@
-# UI classes for Display
-from .ui import (
-    TextDisplay, 
-    PanelDisplay, 
-    TableDisplay, 
-    PromptTaker,
-    print_markdown
-)
-
-# Save to file
-from .saveToFile import saveResponseToFile
-from .saveRequest import saveRequestResponse
-
-# Auth logic
-from .authUtils import authManager
-
-# Config and Token Parsing
-from .configParser import (
-    # Absolute Path for config dir
-    CONFIG_PATH,
-    DEFAULT_TOKEN_PATH,
-    getDefaultConfig, # Default Config Template 
-
-    # Config Operation 
-    loadConfig, 
-    configValidator, 
-    loadAndValidateConfig,
-    tokenPathResolver, 
-    extractConfigAttributes,
-
-    # Error Classes for Config
-    ConfigError,
-    ConfigNotFound,
-    InvalidConfig
-)
-
-from .tokenParser import (
-    parse_token_file,
-    resolve_token,
-    alias_validator,
-    getSavedToken,
-    storeTokenToFile,
-    saveTokenToDefaultConfig
-)
-
-__all__ = [
-    "TextDisplay",
-    "PanelDisplay",
-    "TableDisplay",
-    "PromptTaker",
-    "print_markdown",
-    "saveResponseToFile",
-    "saveRequestResponse",
-    "authManager",
-    "CONFIG_PATH",
-    "DEFAULT_TOKEN_PATH",
-    "getDefaultConfig",
-    "loadConfig",
-    "configValidator",
-    "loadAndValidateConfig",
-    "tokenPathResolver",
-    "extractConfigAttributes",
-    "ConfigError",
-    "ConfigNotFound",
-    "InvalidConfig",
-    "parse_token_file",
-    "resolve_token",
-    "alias_validator",
-    "getSavedToken",
-    "storeTokenToFile",
-    "saveTokenToDefaultConfig"
-]
\ No newline at end of file
+import importlib
+
+# Public names of each utils module. They are imported on first access (PEP 562),
+# so a command only pays for the modules it uses (requests, rich, ...).
+_EXPORTS = {
+    # UI classes for Display
+    "ui": ("TextDisplay", "PanelDisplay", "TableDisplay", "PromptTaker", "print_markdown", "useStderr"),
+    "jsonRender": ("RenderLimits", "renderJson", "renderText", "iterJson", "HIGHLIGHT_MAX_BYTES", "DEFAULT_MAX_RENDER_BYTES"),
+
+    # Save to file
+    "saveToFile": ("saveResponseToFile", "partialPath", "resumeHeaders", "discardPartialDownload"),
+    "saveRequest": ("saveRequestResponse",),
+
+    # JSON encoding with the fastest installed backend
+    "jsonCodec": ("JSON_BACKEND", "jsonLoads", "jsonDumps", "jsonDumpBytes", "jsonLoad", "jsonDump", "responseJson"),
+
+    # Streaming --query over JSON bodies
+    "jsonQuery": ("JsonQuery",),
+
+    # Locked, atomic file updates
+    "atomicFile": ("LOCK_TIMEOUT", "FileLockTimeout", "fileLock", "atomicWrite", "updateFile"),
+
+    # Auth logic
+    "authUtils": ("authManager",),
+
+    # Config and Token Parsing
+    "configParser": (
+        "CONFIG_PATH",
+        "DEFAULT_TOKEN_PATH",
+        "getDefaultConfig",
+        "loadConfig",
+        "configValidator",
+        "loadAndValidateConfig",
+        "tokenPathResolver",
+        "tokenStoreResolver",
+        "tokenDbResolver",
+        "DEFAULT_TOKEN_DB_PATH",
+        "TOKEN_STORES",
+        "extractConfigAttributes",
+        "ConfigContext",
+        "getConfigContext",
+        "ConfigError",
+        "ConfigNotFound",
+        "InvalidConfig",
+    ),
+    "tokenParser": (
+        "parse_token_file",
+        "TOKEN_INDEX_PATH",
+        "TokenIndex",
+        "loadTokenIndex",
+        "invalidateTokenIndex",
+        "resolve_token",
+        "alias_validator",
+        "getSavedToken",
+        "storeTokenToFile",
+        "saveTokenToDefaultConfig",
+    ),
+    "tokenStore": (
+        "TokenRecord",
+        "TextTokenStore",
+        "SqliteTokenStore",
+        "openTokenStore",
+        "formatTimestamp",
+        "importTokens",
+        "exportTokens",
+    ),
+
+    # Request and response compression
+    "compression": ("BODY_ENCODINGS", "availableEncodings", "acceptEncodingHeader", "CompressedBody"),
+
+    # Request timing instrumentation
+    "timing": ("RequestTiming", "TimingAdapter", "formatWriteOut", "reportTiming"),
+
+    # Connect/total timeouts
+    "deadline": (
+        "TIMEOUT_EXIT_CODE",
+        "PARTIAL_FILE_EXIT_CODE",
+        "Deadline",
+        "DeadlineExceeded",
+        "exitCode",
+        "configTimeouts",
+        "resolveTimeouts",
+        "deadlineFromOptions",
+    ),
+
+    # Retries with backoff
+    "retryEngine": (
+        "RETRY_ON_STATUS",
+        "RetryPolicy",
+        "retryPolicyFromOptions",
+        "parseRetryAfter",
+        "sendWithRetry",
+    ),
+
+    # Shared HTTP engine
+    "httpEngine": (
+        "POOL_MAXSIZE",
+        "getSession",
+        "configureSession",
+        "closeSession",
+        "parseHeaders",
+        "loadJsonPayload",
+        "openBodyFile",
+        "bodyText",
+        "buildRequest",
+        "bufferBody",
+        "sendPrepared",
+        "sendRequest",
+    ),
+    "responseView": ("ResponseView",),
+    "eventStream": ("StreamEvent", "streamFormat", "iterLines", "iterSseEvents", "iterNdjsonRecords", "showEventStream"),
+    "responseHandler": ("handleResponse", "requestDetails", "rawOutputMode"),
+    "segmentedDownload": ("segmentedDownload",),
+    "httpCache": ("CACHE_PATH", "HttpCache", "sendCached"),
+
+    # Batch execution
+    "asyncEngine": ("AsyncHttpClient", "AsyncProtocolError", "prepareAsyncRequest"),
+    "batchRunner": (
+        "BatchItem",
+        "parseBatchLine",
+        "readBatchLines",
+        "executeBatchItem",
+        "executeBatchItemAsync",
+        "runBatch",
+        "runBatchAsync",
+    ),
+
+    # Load testing
+    "benchRunner": ("LatencyHistogram", "BenchResult", "runBench"),
+}
+
+# Name -> module that defines it
+_LOCATIONS = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_LOCATIONS)
+
+# Import the defining module on first access
+def __getattr__(name: str):
+    module_name = _LOCATIONS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f".{module_name}", __name__)
+
+    # Cache every export of the module; this also replaces the submodule binding
+    # for names such as segmentedDownload that match their module
+    for export in _EXPORTS[module_name]:
+        globals()[export] = getattr(module, export)
+    return globals()[name]
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,482 @@
+import asyncio
+import socket
+import ssl
+import time
+import zlib
+from collections import deque
+from datetime import timedelta
+from urllib.parse import urlsplit, urlunsplit, urljoin
+
+import requests
+from requests.auth import _basic_auth_str
+from requests.models import DEFAULT_REDIRECT_LIMIT
+from requests.sessions import SessionRedirectMixin
+from requests.structures import CaseInsensitiveDict
+from requests.utils import (
+    DEFAULT_CA_BUNDLE_PATH,
+    default_user_agent,
+    get_encoding_from_headers,
+    get_environ_proxies,
+    get_auth_from_url,
+    prepend_scheme_if_needed,
+    requote_uri,
+    select_proxy
+)
+
+from .httpEngine import bufferBody
+from .retryEngine import IDEMPOTENT_METHODS
+
+# Content codings the async engine can decode itself
+ASYNC_ACCEPT_ENCODING = "gzip, deflate"
+
+# Upper bound for a status line or a single header line
+MAX_LINE_SIZE = 65536
+
+# requests' rule for dropping Authorization when a redirect leaves the host
+_REDIRECT_RULES = SessionRedirectMixin()
+
+# Raised when the peer sends something that is not valid HTTP/1.1
+class AsyncProtocolError(requests.exceptions.ConnectionError):
+    """Malformed or truncated HTTP response."""
+    pass
+
+# Add the defaults the requests Session would normally add
+def prepareAsyncRequest(request: requests.Request) -> requests.PreparedRequest:
+    """Prepare a Request for the async engine with requests-compatible default headers."""
+    prepared = bufferBody(request.prepare())
+    prepared.headers.setdefault("User-Agent", default_user_agent())
+    prepared.headers.setdefault("Accept-Encoding", ASYNC_ACCEPT_ENCODING)
+    prepared.headers.setdefault("Accept", "*/*")
+    prepared.headers.setdefault("Connection", "keep-alive")
+    return prepared
+
+# Try to lift the open file limit so thousands of sockets fit
+def raiseOpenFileLimit(wanted: int):
+    """Raise the soft RLIMIT_NOFILE towards `wanted` where the platform allows it."""
+    try:
+        import resource
+    except ImportError:
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+    if soft != resource.RLIM_INFINITY and soft < target:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        except (ValueError, OSError):
+            pass
+
+# Decode a response body according to Content-Encoding
+def _decodeBody(body: bytes, encoding: str) -> bytes:
+    for coding in reversed([c.strip().lower() for c in encoding.split(",") if c.strip()]):
+        if coding == "gzip" or coding == "x-gzip":
+            body = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(body)
+        elif coding == "deflate":
+            try:
+                body = zlib.decompress(body)
+            except zlib.error:
+                body = zlib.decompress(body, -zlib.MAX_WBITS)
+        elif coding != "identity":
+            break
+    return body
+
+# The request that follows a redirect response
+def _redirectRequest(prepared: requests.PreparedRequest, response: requests.Response) -> requests.PreparedRequest:
+    """
+    Apply the rules requests uses: 303, and 302 for anything but HEAD, and
+    301 for POST switch to GET without a body; 307 and 308 resend the request
+    as is; Authorization is dropped when the redirect leaves the host.
+    """
+    url = requote_uri(urljoin(prepared.url, response.headers["Location"]))
+    redirected = prepared.copy()
+    redirected.url = url
+
+    status, method = response.status_code, prepared.method
+    if (status in (302, 303) and method != "HEAD") or (status == 301 and method == "POST"):
+        redirected.method = "GET"
+    if status not in (307, 308):
+        redirected.body = None
+        for name in ("Content-Length", "Content-Type", "Transfer-Encoding"):
+            redirected.headers.pop(name, None)
+
+    if "Authorization" in redirected.headers and _REDIRECT_RULES.should_strip_auth(prepared.url, url):
+        del redirected.headers["Authorization"]
+    return redirected
+
+# Host, port and Proxy-Authorization value of an http:// proxy URL
+def _proxyAddress(proxy: str) -> tuple[str, int, str | None]:
+    parts = urlsplit(prepend_scheme_if_needed(proxy, "http"))
+    if parts.scheme.lower() != "http" or not parts.hostname:
+        raise requests.exceptions.InvalidProxyURL(f"The async engine only supports http:// proxies, got {proxy!r}")
+    username, password = get_auth_from_url(parts.geturl())
+    auth = _basic_auth_str(username, password) if username else None
+    return parts.hostname, parts.port or 80, auth
+
+# One keep-alive connection
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, forward: bool = False, forward_auth: str | None = None):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+        self.sent = False       # whether any request bytes went out on this exchange
+        # Plain http through a proxy: absolute request targets, plus the proxy credentials
+        self.forward = forward
+        self.forward_auth = forward_auth
+
+    def close(self):
+        self.writer.close()
+
+# Idle connections and the in-flight limit for one host
+class _HostPool:
+    def __init__(self, limit: int):
+        self.limit = asyncio.Semaphore(limit)
+        self.idle: deque[_Connection] = deque()
+
+# HTTP/1.1 client on asyncio streams
+class AsyncHttpClient:
+    """
+    Minimal HTTP/1.1 client with keep-alive, a global and a per-host
+    connection limit, and TLS. Like a requests Session it follows redirects
+    and uses the HTTP(S)_PROXY / NO_PROXY environment (http:// proxies, with
+    CONNECT tunnels for https). Responses are returned as requests.Response.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int | None = None,
+        verify: bool = True,
+        connect_timeout: float | None = None,
+        max_redirects: int = DEFAULT_REDIRECT_LIMIT,
+        trust_env: bool = True
+    ):
+        self.limit = asyncio.Semaphore(limit)
+        self.limit_per_host = limit_per_host or limit
+        self.connect_timeout = connect_timeout
+        self.max_redirects = max_redirects
+        self.trust_env = trust_env
+        self.pools: dict[tuple, _HostPool] = {}
+        self.proxies: dict[tuple, str | None] = {}      # environment proxy per scheme and host
+        self.ssl_context = ssl.create_default_context(cafile=DEFAULT_CA_BUNDLE_PATH)
+        if not verify:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+
+    def _pool(self, key: tuple) -> _HostPool:
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = _HostPool(self.limit_per_host)
+        return pool
+
+    def _proxyFor(self, scheme: str, host: str, url: str) -> str | None:
+        """The environment proxy for `url`, looked up once per scheme and host."""
+        if not self.trust_env:
+            return None
+        key = (scheme, host)
+        if key not in self.proxies:
+            self.proxies[key] = select_proxy(url, get_environ_proxies(url))
+        return self.proxies[key]
+
+    async def _open(self, scheme: str, host: str, port: int, proxy: str | None) -> _Connection:
+        if proxy is None:
+            if scheme == "https":
+                reader, writer = await asyncio.open_connection(
+                    host, port, ssl=self.ssl_context, server_hostname=host, limit=MAX_LINE_SIZE
+                )
+            else:
+                reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_SIZE)
+            return _Connection(reader, writer)
+
+        proxy_host, proxy_port, proxy_auth = _proxyAddress(proxy)
+        try:
+            if scheme == "http":
+                reader, writer = await asyncio.open_connection(proxy_host, proxy_port, limit=MAX_LINE_SIZE)
+                return _Connection(reader, writer, forward=True, forward_auth=proxy_auth)
+
+            sock = await self._tunnel(proxy_host, proxy_port, host, port, proxy_auth)
+        except OSError as e:
+            raise requests.exceptions.ProxyError(f"Cannot connect to proxy {proxy_host}:{proxy_port}: {e}")
+        reader, writer = await asyncio.open_connection(
+            sock=sock, ssl=self.ssl_context, server_hostname=host, limit=MAX_LINE_SIZE
+        )
+        return _Connection(reader, writer)
+
+    async def _tunnel(self, proxy_host: str, proxy_port: int, host: str, port: int, proxy_auth: str | None) -> socket.socket:
+        """Open a CONNECT tunnel to host:port through the proxy and return its socket, ready for TLS."""
+        loop = asyncio.get_running_loop()
+        sock, error = None, None
+        for family, kind, proto, _, address in await loop.getaddrinfo(proxy_host, proxy_port, type=socket.SOCK_STREAM):
+            sock = socket.socket(family, kind, proto)
+            sock.setblocking(False)
+            try:
+                await loop.sock_connect(sock, address)
+                break
+            except OSError as e:
+                sock.close()
+                sock, error = None, e
+        if sock is None:
+            raise error or OSError(f"No address for {proxy_host}")
+
+        try:
+            head = f"CONNECT {host}:{port} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+            if proxy_auth:
+                head += f"Proxy-Authorization: {proxy_auth}\r\n"
+            await loop.sock_sendall(sock, (head + "\r\n").encode("latin-1"))
+
+            # The proxy sends nothing after its response until the TLS handshake starts
+            reply = b""
+            while b"\r\n\r\n" not in reply:
+                data = await loop.sock_recv(sock, 4096)
+                if not data:
+                    raise AsyncProtocolError(f"Proxy {proxy_host}:{proxy_port} closed the connection during CONNECT")
+                reply += data
+                if len(reply) > MAX_LINE_SIZE:
+                    raise AsyncProtocolError("Proxy CONNECT response too large")
+
+            status_line = reply.split(b"\r\n", 1)[0].decode("latin-1")
+            status = status_line.split(" ", 2)[1:2]
+            if not status or not status[0].startswith("2"):
+                raise requests.exceptions.ProxyError(f"Tunnel connection failed: {status_line}")
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    async def _connect(self, scheme: str, host: str, port: int, proxy: str | None = None) -> _Connection:
+        # DNS, TCP, the proxy tunnel and TLS together get connect_timeout
+        try:
+            return await asyncio.wait_for(self._open(scheme, host, port, proxy), self.connect_timeout)
+        except asyncio.TimeoutError:
+            raise requests.exceptions.ConnectTimeout(
+                f"Connection to {host}:{port} timed out after {self.connect_timeout}s"
+            )
+
+    async def _acquire(self, key: tuple) -> _Connection:
+        pool = self._pool(key)
+        while pool.idle:
+            conn = pool.idle.pop()
+            if not conn.writer.is_closing() and not conn.reader.at_eof():
+                conn.reused = True
+                return conn
+            conn.close()
+        return await self._connect(*key)
+
+    def _release(self, key: tuple, conn: _Connection, keep_alive: bool):
+        if keep_alive and not conn.writer.is_closing():
+            self._pool(key).idle.append(conn)
+        else:
+            conn.close()
+
+    async def request(
+        self,
+        prepared: requests.PreparedRequest,
+        timeout: float | None = None,
+        allow_redirects: bool = True
+    ) -> requests.Response:
+        """
+        Send a PreparedRequest and return the complete response, following
+        up to max_redirects redirects. `timeout` covers the whole chain.
+        """
+        ends = time.monotonic() + timeout if timeout is not None else None
+        history = []
+        while True:
+            remaining = max(0.0, ends - time.monotonic()) if ends is not None else None
+            response = await self._requestOnce(prepared, remaining, timeout)
+            if not allow_redirects or not response.is_redirect:
+                break
+            if len(history) >= self.max_redirects:
+                raise requests.exceptions.TooManyRedirects(f"Exceeded {self.max_redirects} redirects.", response=response)
+            history.append(response)
+            prepared = _redirectRequest(prepared, response)
+
+        response.history = history
+        return response
+
+    async def _requestOnce(self, prepared: requests.PreparedRequest, timeout: float | None, budget: float | None) -> requests.Response:
+        parts = urlsplit(prepared.url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise requests.exceptions.InvalidSchema(f"No connection adapters were found for {prepared.url!r}")
+        if not parts.hostname:
+            raise requests.exceptions.InvalidURL(f"Invalid URL {prepared.url!r}: No host supplied")
+
+        key = (
+            scheme,
+            parts.hostname,
+            parts.port or (443 if scheme == "https" else 80),
+            self._proxyFor(scheme, parts.hostname, prepared.url)
+        )
+        started = time.perf_counter()
+
+        async with self.limit, self._pool(key).limit:
+            try:
+                return await asyncio.wait_for(self._exchange(key, parts, prepared, started), timeout)
+            except requests.exceptions.RequestException:
+                raise
+            except asyncio.LimitOverrunError as e:
+                raise AsyncProtocolError(str(e))
+            except asyncio.TimeoutError:
+                raise requests.exceptions.Timeout(f"Request to {prepared.url} timed out after {budget}s")
+            except ssl.SSLError as e:
+                raise requests.exceptions.SSLError(str(e))
+            except (OSError, asyncio.IncompleteReadError) as e:
+                raise requests.exceptions.ConnectionError(str(e) or type(e).__name__)
+
+    async def _exchange(self, key, parts, prepared, started) -> requests.Response:
+        # A reused keep-alive socket may have been closed by the server: retry once on a fresh one,
+        # unless a request that is not idempotent may already have reached the server
+        for attempt in range(2):
+            conn = await self._acquire(key)
+            conn.sent = False
+            try:
+                await self._send(conn, parts, prepared)
+                return await self._receive(key, conn, prepared, started)
+            except (ConnectionError, asyncio.IncompleteReadError, AsyncProtocolError):
+                conn.close()
+                replayable = not conn.sent or prepared.method.upper() in IDEMPOTENT_METHODS
+                if not conn.reused or attempt or not replayable:
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+
+    async def _send(self, conn: _Connection, parts, prepared: requests.PreparedRequest):
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        headers = CaseInsensitiveDict(prepared.headers)
+        headers.setdefault("Host", parts.netloc.rsplit("@", 1)[-1])
+        if conn.forward:
+            # A forwarding proxy needs the absolute URL
+            target = urlunsplit((parts.scheme, headers["Host"], target, "", ""))
+            if conn.forward_auth:
+                headers.setdefault("Proxy-Authorization", conn.forward_auth)
+
+        body = prepared.body
+        chunked = False
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if body is not None and not isinstance(body, (bytes, bytearray)):
+            if "Content-Length" not in headers:
+                chunked = True
+                headers["Transfer-Encoding"] = "chunked"
+
+        head = f"{prepared.method} {target} HTTP/1.1\r\n"
+        head += "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        conn.writer.write((head + "\r\n").encode("latin-1"))
+        conn.sent = True
+
+        if isinstance(body, (bytes, bytearray)):
+            conn.writer.write(body)
+        elif body is not None:
+            chunks = iter(lambda: body.read(65536), b"") if hasattr(body, "read") else body
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                if not chunk:
+                    continue
+                if chunked:
+                    conn.writer.write(f"{len(chunk):X}\r\n".encode() + chunk + b"\r\n")
+                else:
+                    conn.writer.write(chunk)
+                await conn.writer.drain()
+            if chunked:
+                conn.writer.write(b"0\r\n\r\n")
+        await conn.writer.drain()
+
+    async def _readLine(self, conn: _Connection) -> bytes:
+        line = await conn.reader.readuntil(b"\r\n")
+        return line[:-2]
+
+    async def _receive(self, key, conn: _Connection, prepared, started) -> requests.Response:
+        # Skip interim 1xx responses
+        while True:
+            status_line = (await self._readLine(conn)).decode("latin-1")
+            try:
+                version, status, *reason = status_line.split(" ", 2)
+                status = int(status)
+            except ValueError:
+                raise AsyncProtocolError(f"Invalid status line: {status_line!r}")
+            if not version.startswith("HTTP/"):
+                raise AsyncProtocolError(f"Invalid status line: {status_line!r}")
+
+            headers = CaseInsensitiveDict()
+            while True:
+                line = await self._readLine(conn)
+                if not line:
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                name, value = name.strip(), value.strip()
+                headers[name] = f"{headers[name]}, {value}" if name in headers else value
+
+            if status >= 200 or status == 101:
+                break
+
+        # Read the body framing
+        keep_alive = version == "HTTP/1.1"
+        connection = headers.get("Connection", "").lower()
+        if "close" in connection:
+            keep_alive = False
+        elif "keep-alive" in connection:
+            keep_alive = True
+
+        if prepared.method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif "chunked" in headers.get("Transfer-Encoding", "").lower():
+            body = await self._readChunked(conn)
+        elif "Content-Length" in headers:
+            try:
+                length = int(headers["Content-Length"])
+            except ValueError:
+                length = -1
+            if length < 0:
+                raise AsyncProtocolError(f"Invalid Content-Length: {headers['Content-Length']!r}")
+            body = await conn.reader.readexactly(length)
+        else:
+            body = await conn.reader.read()
+            keep_alive = False
+
+        self._release(key, conn, keep_alive)
+
+        if "Content-Encoding" in headers:
+            try:
+                body = _decodeBody(body, headers["Content-Encoding"])
+            except zlib.error as e:
+                raise requests.exceptions.ContentDecodingError(
+                    f"Failed to decode response body ({headers['Content-Encoding']}): {e}"
+                )
+
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason[0] if reason else ""
+        response.headers = headers
+        response.encoding = get_encoding_from_headers(headers)
+        response.url = prepared.url
+        response.request = prepared
+        response.elapsed = timedelta(seconds=time.perf_counter() - started)
+        response._content = body
+        response._content_consumed = True
+        return response
+
+    async def _readChunked(self, conn: _Connection) -> bytes:
+        body = bytearray()
+        while True:
+            size_line = await self._readLine(conn)
+            try:
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise AsyncProtocolError(f"Invalid chunk size: {size_line!r}")
+            if size == 0:
+                # Discard trailers
+                while await self._readLine(conn):
+                    pass
+                return bytes(body)
+            body += await conn.reader.readexactly(size)
+            await conn.reader.readexactly(2)
+
+    async def close(self):
+        """Close every idle connection."""
+        for pool in self.pools.values():
+            while pool.idle:
+                pool.idle.pop().close()
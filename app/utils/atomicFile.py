@@ -0,0 +1,139 @@
+import os
+import time
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+# Seconds a writer waits for another process to release the lock
+LOCK_TIMEOUT = 10.0
+
+# Pause between attempts to take a busy lock
+_LOCK_POLL_INTERVAL = 0.05
+
+# Raised when the lock stays busy for longer than the timeout
+class FileLockTimeout(TimeoutError):
+    """Another process held the file lock for too long."""
+    pass
+
+# Lock file guarding `path`; the file itself is replaced on every write, so it cannot carry the lock
+def lockPath(path: Path) -> Path:
+    return path.with_name(f"{path.name}.lock")
+
+# Try once to take an exclusive lock on an open file
+def _tryLock(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+# Release a lock taken by _tryLock
+def _unlock(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+# Exclusive advisory lock shared by every pycurl process writing `path`
+@contextmanager
+def fileLock(path: Path, timeout: float | None = LOCK_TIMEOUT):
+    """
+    Hold an exclusive lock on the '.lock' file next to `path` while the block
+    runs. Waits up to `timeout` seconds (None waits forever) and raises
+    FileLockTimeout after that. The lock is not reentrant.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lockPath(path), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while not _tryLock(fd):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise FileLockTimeout(f"Timed out after {timeout}s waiting for the lock on {path}")
+            time.sleep(_LOCK_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+# Flush a directory entry change (the rename) to disk
+def _fsyncDirectory(directory: Path):
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+# Replace a file with new content in one step
+def atomicWrite(path: Path, data: str | bytes, mode: int = 0o600):
+    """
+    Write `data` to a temporary file next to `path`, fsync it and move it
+    over `path` with os.replace, so readers see the old or the new file and
+    never a truncated one. An existing file keeps its permissions; a new
+    one gets `mode`.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        pass
+
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data.encode("utf-8") if isinstance(data, str) else data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_name, mode)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+    _fsyncDirectory(path.parent)
+
+# Locked read-modify-write of a text file
+def updateFile(
+    path: Path,
+    update: Callable[[str | None], str | None],
+    timeout: float | None = LOCK_TIMEOUT,
+    mode: int = 0o600
+) -> str | None:
+    """
+    Under the lock of `path`, call `update` with the current text (None when
+    the file does not exist) and atomically write what it returns. Returning
+    None leaves the file untouched. Returns the written text.
+    """
+    path = Path(path)
+    with fileLock(path, timeout):
+        try:
+            current = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            current = None
+
+        updated = update(current)
+        if updated is not None:
+            atomicWrite(path, updated, mode)
+        return updated
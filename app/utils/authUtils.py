@@ -4,6 +4,10 @@ import json
 from .ui import TextDisplay
 from .saveToFile import saveResponseToFile
 from .configParser import loadAndValidateConfig, extractConfigAttributes
+from .httpEngine import sendRequest
+from .deadline import deadlineFromOptions
+from .jsonRender import renderText
+from .responseView import ResponseView
 from .tokenParser import (
     alias_validator,
     storeTokenToFile,
@@ -21,24 +25,24 @@ def authManager(
     token_field: str = "token",
     store_token_to_file: str | None = None,
     cookie_token: str | None = None,
-    save_alias: str | None = None
-) -> tuple[requests.Response, str | None]:
+    save_alias: str | None = None,
+    max_time: float | None = None,
+    connect_timeout: float | None = None
+) -> tuple[ResponseView, str | None]:
     """
     Authenticate a user by sending a POST request to the specified URL with JSON data.
     """
     try:
         headers = {"Content-Type": "application/json"}
 
-        # Handle payload input (direct JSON or file)
-        if json_data.strip().startswith("@"):
-            file_path = json_data.strip()[1:]
-            with open(file_path, "r", encoding="utf-8") as f:
-                payload = json.load(f)
-        else:
-            payload = json.loads(json_data)
-
-        # Send authentication request
-        response = requests.post(url, json=payload, headers=headers)
+        # Send authentication request (payload may be inline JSON or '@file')
+        response = ResponseView(sendRequest(
+            "POST",
+            url,
+            headers=headers,
+            json_data=json_data,
+            deadline=deadlineFromOptions(max_time, connect_timeout)
+        ))
 
         try:
             response_json = response.json()
@@ -65,9 +69,9 @@ def authManager(
         if show_content:
             TextDisplay.info_text("Response Content:", style="white")
             try:
-                TextDisplay.print_json(response.json())
+                TextDisplay.print_json(response.json(), size_hint=response.size)
             except ValueError:
-                print(response.text)
+                renderText(response.text)
 
         # Handle token storage logic
         token: str | None = None
@@ -100,7 +104,7 @@ def authManager(
 
 # Token extraction logic
 def getAuthTokenFromResponse(
-    response: requests.Response,
+    response: ResponseView,
     token_field: str = "token"
 ) -> str:
     """Extract the authentication token from the response JSON."""
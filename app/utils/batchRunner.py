@@ -0,0 +1,335 @@
+import time
+import queue
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+import requests
+
+from .configParser import ConfigError
+from .httpEngine import buildRequest, sendRequest
+from .deadline import Deadline
+from .jsonCodec import jsonLoads
+from .responseView import ResponseView
+from .asyncEngine import AsyncHttpClient, prepareAsyncRequest, raiseOpenFileLimit
+
+# Methods a batch line may use
+BATCH_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+
+# One request described by a line of the batch file
+@dataclass
+class BatchItem:
+    index: int
+    method: str = "GET"
+    url: str = ""
+    headers: dict = field(default_factory=dict)
+    use_token: str | None = None
+    token_placement: str = "header"
+    token_cookie_name: str = "access_token"
+    json_data: str | None = None
+    json_payload: object = None
+    data: str | None = None
+    error: str | None = None
+
+# Parse a single JSONL line into a BatchItem
+def parseBatchLine(line: str, index: int, lineno: int | None = None) -> BatchItem:
+    """Parse one JSONL line; invalid lines carry an error instead of raising."""
+    try:
+        spec = jsonLoads(line)
+        if not isinstance(spec, dict):
+            raise ValueError("line must be a JSON object")
+
+        url = spec.get("url")
+        if not isinstance(url, str) or not url.strip():
+            raise ValueError("'url' must be a non-empty string")
+
+        method = str(spec.get("method", "GET")).upper()
+        if method not in BATCH_METHODS:
+            raise ValueError(f"unsupported method '{method}'")
+
+        # Headers as {"Key": "Value"} or ["Key: Value", ...]
+        raw_headers = spec.get("headers") or {}
+        if isinstance(raw_headers, list):
+            headers = {}
+            for header in raw_headers:
+                key, value = str(header).split(":", 1)
+                headers[key.strip()] = value.strip()
+        elif isinstance(raw_headers, dict):
+            headers = {str(k): str(v) for k, v in raw_headers.items()}
+        else:
+            raise ValueError("'headers' must be an object or a list of 'Key: Value' strings")
+
+        item = BatchItem(
+            index=index,
+            method=method,
+            url=url,
+            headers=headers,
+            use_token=spec.get("use_token") or spec.get("token"),
+            token_placement=spec.get("token_placement", "header"),
+            token_cookie_name=spec.get("cookie_name", "access_token"),
+            data=spec.get("data")
+        )
+
+        # --json accepts a JSON string ('@file' allowed) or an inline object
+        json_value = spec.get("json")
+        if isinstance(json_value, str):
+            item.json_data = json_value
+        elif json_value is not None:
+            item.json_payload = json_value
+
+        return item
+
+    except (ValueError, TypeError) as e:
+        return BatchItem(index=index, error=f"Invalid batch line {lineno or index + 1}: {e}")
+
+# Read batch items lazily from JSONL text
+def readBatchLines(lines: Iterable[str]) -> Iterator[BatchItem]:
+    """Yield a BatchItem for every non-empty, non-comment line."""
+    index = 0
+    for lineno, line in enumerate(lines, start=1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        yield parseBatchLine(stripped, index, lineno)
+        index += 1
+
+# Decode a response body for the NDJSON result
+def _resultBody(response: requests.Response):
+    view = ResponseView(response)
+    if "json" in view.headers.get("Content-Type", ""):
+        try:
+            return view.json()
+        except ValueError:
+            pass
+    return view.text
+
+# Request options of a BatchItem
+def _itemOptions(item: BatchItem) -> dict:
+    return dict(
+        headers=item.headers,
+        use_token=item.use_token,
+        token_placement=item.token_placement,
+        token_cookie_name=item.token_cookie_name,
+        json_data=item.json_data,
+        json_payload=item.json_payload,
+        data=item.data
+    )
+
+# Fill a result dict from a received response
+def _fillResult(result: dict, response: requests.Response, started: float, include_body: bool, include_headers: bool):
+    result["status"] = response.status_code
+    result["ok"] = response.status_code < 400
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    if include_headers:
+        result["headers"] = dict(response.headers)
+    if include_body:
+        result["body"] = _resultBody(response)
+
+# Errors a single batch line may end with
+BATCH_ERRORS = (requests.exceptions.RequestException, ConfigError, OSError, ValueError)
+
+# Execute one batch item and describe the outcome
+def executeBatchItem(
+    item: BatchItem,
+    include_body: bool = True,
+    include_headers: bool = False,
+    max_time: float | None = None,
+    connect_timeout: float | None = None
+) -> dict:
+    """Send the request for a BatchItem and return an NDJSON-ready result."""
+    result = {"index": item.index, "method": item.method, "url": item.url}
+
+    if item.error:
+        result.update(ok=False, error=item.error)
+        return result
+
+    # Every item gets its own budget, starting when a worker picks it up
+    deadline = Deadline(max_time, connect_timeout) if max_time or connect_timeout else None
+    started = time.perf_counter()
+    try:
+        response = sendRequest(item.method, item.url, deadline=deadline, **_itemOptions(item))
+        _fillResult(result, response, started, include_body, include_headers)
+        response.close()
+
+    except BATCH_ERRORS as e:
+        result.update(
+            ok=False,
+            error=str(e),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3)
+        )
+
+    finally:
+        if deadline is not None:
+            deadline.cancel()
+
+    return result
+
+# Execute one batch item on the async engine
+async def executeBatchItemAsync(
+    client: AsyncHttpClient,
+    item: BatchItem,
+    include_body: bool = True,
+    include_headers: bool = False,
+    max_time: float | None = None
+) -> dict:
+    """Async counterpart of executeBatchItem; connect timeouts are set on the client."""
+    result = {"index": item.index, "method": item.method, "url": item.url}
+
+    if item.error:
+        result.update(ok=False, error=item.error)
+        return result
+
+    started = time.perf_counter()
+    try:
+        prepared = prepareAsyncRequest(buildRequest(item.method, item.url, **_itemOptions(item)))
+        response = await client.request(prepared, timeout=max_time)
+        _fillResult(result, response, started, include_body, include_headers)
+
+    except BATCH_ERRORS as e:
+        result.update(
+            ok=False,
+            error=str(e),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3)
+        )
+
+    return result
+
+# Run batch items on a bounded worker pool
+def runBatch(
+    items: Iterable[BatchItem],
+    concurrency: int = 8,
+    ordered: bool = True,
+    include_body: bool = True,
+    include_headers: bool = False,
+    max_time: float | None = None,
+    connect_timeout: float | None = None
+) -> Iterator[dict]:
+    """
+    Execute items with at most `concurrency` requests in flight and yield results,
+    either in input order or as they complete.
+    """
+    concurrency = max(1, concurrency)
+    window = concurrency * 2    # items read ahead of the slowest in-flight request
+    pending = set()
+    finished: dict[int, dict] = {}
+    next_index = 0
+    source = iter(items)
+    exhausted = False
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while True:
+            # Keep the window full without reading the whole file
+            while not exhausted and len(pending) + len(finished) < window:
+                try:
+                    item = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(
+                    executeBatchItem, item, include_body, include_headers, max_time, connect_timeout
+                ))
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if not ordered:
+                    yield result
+                    continue
+                finished[result["index"]] = result
+
+            # Release results that are next in input order
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+
+# Async scheduling loop, mirrors runBatch
+async def _runBatchLoop(
+    items, emit, concurrency, limit_per_host, ordered, include_body, include_headers, max_time, connect_timeout
+):
+    client = AsyncHttpClient(limit=concurrency, limit_per_host=limit_per_host, connect_timeout=connect_timeout)
+    window = concurrency * 2
+    pending = set()
+    finished: dict[int, dict] = {}
+    next_index = 0
+    source = iter(items)
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) + len(finished) < window:
+                try:
+                    item = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(
+                    executeBatchItemAsync(client, item, include_body, include_headers, max_time)
+                ))
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if not ordered:
+                    emit(result)
+                    continue
+                finished[result["index"]] = result
+
+            while next_index in finished:
+                emit(finished.pop(next_index))
+                next_index += 1
+    finally:
+        await client.close()
+
+# Run batch items on the asyncio engine
+def runBatchAsync(
+    items: Iterable[BatchItem],
+    concurrency: int = 100,
+    limit_per_host: int | None = None,
+    ordered: bool = True,
+    include_body: bool = True,
+    include_headers: bool = False,
+    max_time: float | None = None,
+    connect_timeout: float | None = None
+) -> Iterator[dict]:
+    """
+    Same contract as runBatch, but requests run on an asyncio event loop in a
+    background thread so thousands of them can be in flight at once.
+    """
+    concurrency = max(1, concurrency)
+    raiseOpenFileLimit(concurrency + 256)
+
+    results: queue.Queue = queue.Queue()
+    done = object()
+    failure: list[BaseException] = []
+
+    def worker():
+        try:
+            asyncio.run(_runBatchLoop(
+                items, results.put, concurrency, limit_per_host, ordered, include_body, include_headers,
+                max_time, connect_timeout
+            ))
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            results.put(done)
+
+    thread = threading.Thread(target=worker, name="pycurl-async-batch", daemon=True)
+    thread.start()
+
+    while True:
+        result = results.get()
+        if result is done:
+            break
+        yield result
+
+    thread.join()
+    if failure:
+        raise failure[0]
@@ -0,0 +1,239 @@
+import math
+import time
+import asyncio
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .httpEngine import sendPrepared
+from .deadline import Deadline
+from .asyncEngine import AsyncHttpClient, raiseOpenFileLimit
+
+# Percentiles reported by pycurl bench
+BENCH_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+# Log-linear latency histogram (HDR style) with bounded memory
+class LatencyHistogram:
+    """
+    Records values (microseconds) into buckets that are linear inside each
+    power of two. With `sub_bucket_bits=8` every value is kept within ~0.8%
+    relative error while the bucket array stays a few thousand entries long.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 8, max_value: int = 3_600_000_000):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.max_trackable = max_value
+        self.counts = [0] * (self._index(max_value) + 1)
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        sub = value >> shift
+        return self.sub_bucket_count + (shift - 1) * self.half_count + (sub - self.half_count)
+
+    def _upperBound(self, index: int) -> int:
+        if index < self.sub_bucket_count:
+            return index
+        offset = index - self.sub_bucket_count
+        shift = offset // self.half_count + 1
+        sub = offset % self.half_count + self.half_count
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value: int):
+        """Record one value, clamped to the trackable range."""
+        value = min(max(int(value), 0), self.max_trackable)
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add the counts of another histogram with the same layout."""
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> int:
+        """Value at or below which `percent` of the recorded values fall."""
+        if not self.total:
+            return 0
+        rank = max(1, math.ceil(percent / 100.0 * self.total))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._upperBound(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.total if self.total else 0.0
+
+# Aggregated outcome of a benchmark run
+@dataclass
+class BenchResult:
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    bytes_received: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def failed(self) -> int:
+        return sum(self.errors.values()) + sum(c for s, c in self.statuses.items() if s >= 400)
+
+    def merge(self, other: "BenchResult"):
+        self.histogram.merge(other.histogram)
+        self.statuses.update(other.statuses)
+        self.errors.update(other.errors)
+        self.bytes_received += other.bytes_received
+
+    def report(self) -> dict:
+        """Summary as a plain dict (latencies in milliseconds)."""
+        total = self.completed + sum(self.errors.values())
+        histogram = self.histogram
+        latency = {
+            "min": (histogram.min or 0) / 1000,
+            "mean": round(histogram.mean / 1000, 3),
+            **{f"p{p:g}": histogram.percentile(p) / 1000 for p in BENCH_PERCENTILES},
+            "max": histogram.max / 1000,
+        }
+        return {
+            "requests": total,
+            "duration_s": round(self.elapsed, 3),
+            "throughput_rps": round(total / self.elapsed, 2) if self.elapsed else 0.0,
+            "bytes_received": self.bytes_received,
+            "success": total - self.failed,
+            "failed": self.failed,
+            "error_rate": round(self.failed / total, 4) if total else 0.0,
+            "status_codes": {str(s): c for s, c in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+            "latency_ms": latency,
+        }
+
+# Shared stop condition for a fixed count or a fixed duration
+class _Budget:
+    def __init__(self, total: int | None, duration: float | None):
+        self.remaining = total
+        self.deadline = time.perf_counter() + duration if duration else None
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return False
+        if self.remaining is None:
+            return True
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+# Thread engine worker: issue requests until the budget runs out
+def _threadWorker(
+    prepared: requests.PreparedRequest,
+    budget: _Budget,
+    max_time: float | None = None,
+    connect_timeout: float | None = None
+) -> BenchResult:
+    result = BenchResult()
+    while budget.take():
+        deadline = Deadline(max_time, connect_timeout) if max_time or connect_timeout else None
+        started = time.perf_counter()
+        try:
+            response = sendPrepared(prepared.copy(), deadline=deadline)
+            size = len(response.content)
+            result.histogram.record((time.perf_counter() - started) * 1_000_000)
+            result.statuses[response.status_code] += 1
+            result.bytes_received += size
+            response.close()
+        except requests.exceptions.RequestException as e:
+            result.errors[type(e).__name__] += 1
+        finally:
+            if deadline is not None:
+                deadline.cancel()
+    return result
+
+# Async engine worker
+async def _asyncWorker(
+    client: AsyncHttpClient,
+    prepared: requests.PreparedRequest,
+    budget: _Budget,
+    result: BenchResult,
+    max_time: float | None = None
+):
+    while budget.take():
+        started = time.perf_counter()
+        try:
+            response = await client.request(prepared.copy(), timeout=max_time)
+            result.histogram.record((time.perf_counter() - started) * 1_000_000)
+            result.statuses[response.status_code] += 1
+            result.bytes_received += len(response.content)
+        except requests.exceptions.RequestException as e:
+            result.errors[type(e).__name__] += 1
+
+async def _runAsync(prepared, budget, concurrency, max_time=None, connect_timeout=None) -> BenchResult:
+    client = AsyncHttpClient(limit=concurrency, connect_timeout=connect_timeout)
+    result = BenchResult()
+    try:
+        await asyncio.gather(*[
+            _asyncWorker(client, prepared, budget, result, max_time) for _ in range(concurrency)
+        ])
+    finally:
+        await client.close()
+    return result
+
+# Run a benchmark against one prepared request
+def runBench(
+    prepared: requests.PreparedRequest,
+    *,
+    total: int | None = None,
+    duration: float | None = None,
+    concurrency: int = 10,
+    engine: str = "thread",
+    max_time: float | None = None,
+    connect_timeout: float | None = None
+) -> BenchResult:
+    """
+    Send `prepared` repeatedly with `concurrency` workers until `total`
+    requests were issued or `duration` seconds elapsed. `max_time` and
+    `connect_timeout` limit every single request.
+    """
+    if total is None and duration is None:
+        raise ValueError("Either a request count or a duration is required")
+
+    concurrency = max(1, concurrency)
+    budget = _Budget(total, duration)
+    started = time.perf_counter()
+
+    if engine == "async":
+        raiseOpenFileLimit(concurrency + 256)
+        result = asyncio.run(_runAsync(prepared, budget, concurrency, max_time, connect_timeout))
+    else:
+        result = BenchResult()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for partial in pool.map(lambda _: _threadWorker(prepared, budget, max_time, connect_timeout), range(concurrency)):
+                result.merge(partial)
+
+    result.elapsed = time.perf_counter() - started
+    return result
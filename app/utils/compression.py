@@ -0,0 +1,84 @@
+import zlib
+from typing import Iterator
+
+import urllib3.response
+
+# Codecs a request body can be compressed with
+BODY_ENCODINGS = ("gzip", "deflate")
+
+# Size of the chunks read from the body while compressing
+COMPRESS_CHUNK_SIZE = 64 * 1024
+COMPRESS_LEVEL = 6
+
+# Libraries that enable the optional response codecs
+OPTIONAL_CODECS = {"br": "brotli", "zstd": "zstandard"}
+
+# Response codecs the HTTP stack can decode
+def availableEncodings() -> list[str]:
+    """Return the content codings urllib3 can decode in this environment."""
+    encodings = ["gzip", "deflate"]
+    if getattr(urllib3.response, "brotli", None) is not None:
+        encodings.append("br")
+    if getattr(urllib3.response, "HAS_ZSTD", False):
+        encodings.append("zstd")
+    return encodings
+
+# Resolve an --accept-encoding value to a header
+def acceptEncodingHeader(value: str) -> str:
+    """Turn 'all' or a comma separated list of codecs into an Accept-Encoding value."""
+    available = availableEncodings()
+    if value.strip().lower() == "all":
+        return ", ".join(available)
+
+    wanted = [coding.strip().lower() for coding in value.split(",") if coding.strip()]
+    for coding in wanted:
+        if coding not in available and coding != "identity":
+            hint = f" (install '{OPTIONAL_CODECS[coding]}')" if coding in OPTIONAL_CODECS else ""
+            raise ValueError(f"Cannot decode '{coding}' responses{hint}. Available: {', '.join(available)}")
+    return ", ".join(wanted)
+
+# Request body that is compressed while it is being sent
+class CompressedBody:
+    """
+    Iterable that reads `source` (bytes, str, a binary file or an iterable of
+    chunks) and yields it gzip or deflate compressed. requests sends it with
+    chunked transfer encoding, so the compressed size never needs to be known.
+    """
+
+    def __init__(self, source, encoding: str = "gzip", level: int = COMPRESS_LEVEL):
+        if encoding not in BODY_ENCODINGS:
+            raise ValueError(f"Unsupported body compression '{encoding}'. Use 'gzip' or 'deflate'.")
+        self.source = source
+        self.encoding = encoding
+        self.level = level
+
+    def _chunks(self) -> Iterator[bytes]:
+        source = self.source
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+
+        if isinstance(source, bytes):
+            view = memoryview(source)
+            for start in range(0, len(view), COMPRESS_CHUNK_SIZE):
+                yield view[start:start + COMPRESS_CHUNK_SIZE]
+        elif hasattr(source, "read"):
+            while chunk := source.read(COMPRESS_CHUNK_SIZE):
+                yield chunk
+        else:
+            for chunk in source:
+                yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+    def __iter__(self) -> Iterator[bytes]:
+        # gzip adds its header and trailer; HTTP 'deflate' is the zlib format
+        wbits = 16 + zlib.MAX_WBITS if self.encoding == "gzip" else zlib.MAX_WBITS
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, wbits)
+        for chunk in self._chunks():
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    def close(self):
+        """Close the source file, if the body streams from one."""
+        if hasattr(self.source, "close"):
+            self.source.close()
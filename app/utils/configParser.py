@@ -1,12 +1,21 @@
 from pathlib import Path
+from dataclasses import dataclass
 import json
 
+from .jsonCodec import jsonLoad
+
 # Default Config Path
 CONFIG_PATH = Path.home() / ".pycurl" / "config.json"
 
 # Default Token Path
 DEFAULT_TOKEN_PATH = Path.home() / ".pycurl" / "tokens"
 
+# Default Token Database Path (sqlite token store)
+DEFAULT_TOKEN_DB_PATH = Path.home() / ".pycurl" / "tokens.db"
+
+# Supported token storage backends
+TOKEN_STORES = ("text", "sqlite")
+
 # Fetch default config template
 def getDefaultConfig(token_file:Path = DEFAULT_TOKEN_PATH, token_type:str = "Bearer", default_token:str|None = None) -> dict:
     """Returns the default configuration template."""
@@ -14,7 +23,12 @@ def getDefaultConfig(token_file:Path = DEFAULT_TOKEN_PATH, token_type:str = "Bea
         "auth": {
             "token_file": str(token_file),
             "token_type": token_type,
-            "default_token": default_token
+            "default_token": default_token,
+            "token_store": "text"
+        },
+        "http": {
+            "timeout": None,
+            "connect_timeout": None
         }
     }
     return DEFAULT_CONFIG_TEMPLATE
@@ -40,7 +54,7 @@ def loadConfig(config_path: Path) -> dict:
         raise ConfigNotFound(f"Config not found at {config_path}")
     try:
         with open(config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+            return jsonLoad(f)
 
     except json.JSONDecodeError as e:
         raise InvalidConfig(f"Invalid JSON in {config_path}") from e
@@ -56,7 +70,7 @@ def configValidator(config_data: dict) -> tuple[bool, list[ConfigError]]:
         return False, [InvalidConfig("Missing or invalid 'auth' section")]
 
     # Check for unexpected top-level keys
-    allowed_top_keys = {"auth"}
+    allowed_top_keys = {"auth", "http"}
     actual_keys = set(config_data.keys())
     extra_keys = actual_keys - allowed_top_keys
     if extra_keys:
@@ -80,12 +94,36 @@ def configValidator(config_data: dict) -> tuple[bool, list[ConfigError]]:
         elif ":" in default_token:
             errors.append(InvalidConfig("'auth.default_token' cannot contain ':'"))
 
+    # Validate token_store and token_db fields
+    token_store = auth.get("token_store")
+    if token_store is not None and token_store not in TOKEN_STORES:
+        errors.append(InvalidConfig(f"'auth.token_store' must be one of: {', '.join(TOKEN_STORES)}"))
+
+    token_db = auth.get("token_db")
+    if token_db is not None and (not isinstance(token_db, str) or not token_db.strip()):
+        errors.append(InvalidConfig("'auth.token_db' must be a non-empty string or null"))
+
     # Check for unexpected keys inside auth section
-    allowed_auth_keys = {"token_file", "token_type", "default_token"}
+    allowed_auth_keys = {"token_file", "token_type", "default_token", "token_store", "token_db"}
     extra_auth = set(auth.keys()) - allowed_auth_keys
     if extra_auth:
         errors.append(InvalidConfig(f"Unknown keys in 'auth': {', '.join(extra_auth)}"))
 
+    # Optional http section with default timeouts in seconds
+    http = config_data.get("http")
+    if http is not None:
+        if not isinstance(http, dict):
+            errors.append(InvalidConfig("'http' section must be an object"))
+        else:
+            for key in ("timeout", "connect_timeout"):
+                value = http.get(key)
+                if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0):
+                    errors.append(InvalidConfig(f"'http.{key}' must be a non-negative number of seconds or null"))
+
+            extra_http = set(http.keys()) - {"timeout", "connect_timeout"}
+            if extra_http:
+                errors.append(InvalidConfig(f"Unknown keys in 'http': {', '.join(extra_http)}"))
+
     return len(errors) == 0, errors
 
 # For Future Use
@@ -116,6 +154,17 @@ def defaultTokenResolver(config_data: dict) -> str | None:
     """Returns the default token from configuration."""
     return config_data["auth"].get("default_token")
 
+# Token storage backend from configuration
+def tokenStoreResolver(config_data: dict) -> str:
+    """Returns the token store backend ('text' unless configured)."""
+    return config_data.get("auth", {}).get("token_store") or "text"
+
+# Token database path from configuration
+def tokenDbResolver(config_data: dict) -> Path:
+    """Resolves the absolute path to the sqlite token database."""
+    raw_path = config_data.get("auth", {}).get("token_db") or DEFAULT_TOKEN_DB_PATH
+    return Path(raw_path).expanduser().resolve()
+
 # Implement attribute extraction logic here
 def extractConfigAttributes(config_data: dict) -> tuple[Path, str, str | None]:
     """Extracts all core configuration attributes."""
@@ -124,3 +173,68 @@ def extractConfigAttributes(config_data: dict) -> tuple[Path, str, str | None]:
         tokenTypeResolver(config_data),
         defaultTokenResolver(config_data)
     )
+
+# Positive number of seconds from the config, or None
+def _configSeconds(value) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        return None
+    return float(value)
+
+# Validated config with every setting resolved
+@dataclass(frozen=True)
+class ConfigContext:
+    """
+    Typed, read-only view of one validated config file. Get it through
+    getConfigContext, which loads the file once per change; `data` is the
+    shared parsed JSON and must not be modified.
+    """
+    path: Path
+    data: dict
+    token_file: Path
+    token_type: str
+    default_token: str | None
+    token_store: str
+    token_db: Path
+    timeout: float | None
+    connect_timeout: float | None
+
+    @classmethod
+    def fromData(cls, path: Path, config_data: dict) -> "ConfigContext":
+        http = config_data.get("http") or {}
+        return cls(
+            path=path,
+            data=config_data,
+            token_file=tokenPathResolver(config_data),
+            token_type=tokenTypeResolver(config_data),
+            default_token=defaultTokenResolver(config_data),
+            token_store=tokenStoreResolver(config_data),
+            token_db=tokenDbResolver(config_data),
+            timeout=_configSeconds(http.get("timeout")),
+            connect_timeout=_configSeconds(http.get("connect_timeout"))
+        )
+
+# Contexts loaded by this process: {path: ((mtime_ns, size, inode), context)}
+_config_contexts: dict[Path, tuple[tuple[int, int, int], ConfigContext]] = {}
+
+# Load + validate once per change of the file
+def getConfigContext(config_path: Path = CONFIG_PATH) -> ConfigContext:
+    """
+    Return the ConfigContext of `config_path`, memoized for the process and
+    reloaded when the file's mtime, size or inode changes. Raises the same
+    errors as loadAndValidateConfig.
+    """
+    config_path = Path(config_path)
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
+        raise ConfigNotFound(f"Config not found at {config_path}")
+    # Taken before reading, so a concurrent change can only cause an extra reload
+    signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    cached = _config_contexts.get(config_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    context = ConfigContext.fromData(config_path, loadAndValidateConfig(config_path))
+    _config_contexts[config_path] = (signature, context)
+    return context
@@ -0,0 +1,207 @@
+import time
+import socket
+import threading
+from contextlib import contextmanager
+
+import requests
+
+from .configParser import CONFIG_PATH, ConfigError, getConfigContext
+
+# Deadline of the request currently being sent on this thread
+_active = threading.local()
+
+# Exit status after a timeout, as curl's CURLE_OPERATION_TIMEDOUT
+TIMEOUT_EXIT_CODE = 28
+
+# Exit status after a download that stopped early, as curl's CURLE_PARTIAL_FILE
+PARTIAL_FILE_EXIT_CODE = 18
+
+# Raised once the --max-time budget is spent
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """The wall-clock budget of the operation ran out."""
+    pass
+
+# Wall-clock budget of one operation, shared by its retries and its body
+class Deadline:
+    """
+    Monotonic deadline `max_time` seconds from creation. Every attempt,
+    retry sleep and socket read gets at most the time that is left, and
+    new connections additionally stop after `connect_timeout` seconds.
+    Socket timeouts only bound a single read, so a watchdog timer also
+    shuts down the sockets that are still blocked when the time is up.
+    """
+
+    def __init__(self, max_time: float | None = None, connect_timeout: float | None = None):
+        self.max_time = max_time
+        self.connect_timeout = connect_timeout
+        self.expires_at = time.monotonic() + max_time if max_time else None
+        self._lock = threading.Lock()
+        self._watched: set = set()
+        self._timer: threading.Timer | None = None
+
+    def remaining(self) -> float | None:
+        """Seconds left, or None without a total limit."""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def exceeded(self) -> DeadlineExceeded:
+        return DeadlineExceeded(f"Operation timed out after {self.max_time}s (--max-time)")
+
+    def check(self) -> float | None:
+        """Raise DeadlineExceeded when no time is left, otherwise return the seconds left."""
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise self.exceeded()
+        return remaining
+
+    def timeout(self) -> tuple[float | None, float | None]:
+        """(connect, read) timeout for requests, capped by the time left."""
+        remaining = self.check()
+        connect = self.connect_timeout
+        if remaining is not None:
+            connect = remaining if connect is None else min(connect, remaining)
+        return connect, remaining
+
+    def tighten(self, sock: socket.socket | None):
+        """Cap the timeout of the next blocking socket call by the time left."""
+        remaining = self.check()
+        if remaining is not None and sock is not None:
+            sock.settimeout(remaining)
+
+    @contextmanager
+    def watch(self, sock: socket.socket | None):
+        """Shut `sock` down if the deadline passes while the block is running."""
+        if self.expires_at is None or sock is None:
+            yield
+            return
+
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(max(0.0, self.remaining()), self._expire)
+                self._timer.daemon = True
+                self._timer.start()
+            self._watched.add(sock)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._watched.discard(sock)
+
+    def _expire(self):
+        # Blocked reads return EOF and fail; the callers turn that into DeadlineExceeded
+        with self._lock:
+            for sock in self._watched:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def cancel(self):
+        """Stop the watchdog once the operation is over."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+
+    @contextmanager
+    def activate(self):
+        """Make this the deadline the instrumented connections of this thread enforce."""
+        previous = getattr(_active, "deadline", None)
+        _active.deadline = self
+        try:
+            yield self
+        finally:
+            _active.deadline = previous
+
+    def guard(self, response: requests.Response) -> requests.Response:
+        """Enforce the deadline while the body of a streamed response is read."""
+        raw = response.raw
+        if raw is None or not hasattr(raw, "read"):
+            return response
+
+        def tighten() -> socket.socket | None:
+            sock = getattr(getattr(raw, "connection", None), "sock", None)
+            self.tighten(sock)
+            return sock
+
+        def guarded(read):
+            def deadlineRead(*args, **kwargs):
+                try:
+                    with self.watch(tighten()):
+                        return read(*args, **kwargs)
+                except DeadlineExceeded:
+                    raise
+                except Exception as e:
+                    if self.expired():
+                        raise self.exceeded() from e
+                    raise
+            return deadlineRead
+
+        raw.read = guarded(raw.read)
+
+        # Event streams read with read1, which also bypasses read (urllib3 2 only)
+        if hasattr(raw, "read1"):
+            raw.read1 = guarded(raw.read1)
+
+        # Chunked bodies are read by read_chunked, which bypasses read
+        read_chunked = getattr(raw, "read_chunked", None)
+        if read_chunked is not None:
+            def deadlineReadChunked(*args, **kwargs):
+                chunks = read_chunked(*args, **kwargs)
+                while True:
+                    try:
+                        with self.watch(tighten()):
+                            chunk = next(chunks)
+                    except StopIteration:
+                        return
+                    except DeadlineExceeded:
+                        raise
+                    except Exception as e:
+                        if self.expired():
+                            raise self.exceeded() from e
+                        raise
+                    yield chunk
+
+            raw.read_chunked = deadlineReadChunked
+
+        return response
+
+# Deadline enforced by the connections of this thread, if any
+def activeDeadline() -> Deadline | None:
+    return getattr(_active, "deadline", None)
+
+# Exit status for a request that failed with `error`
+def exitCode(error: BaseException, default: int | None = None) -> int | None:
+    """Return TIMEOUT_EXIT_CODE for connect, read and --max-time timeouts, `default` otherwise."""
+    if isinstance(error, requests.exceptions.Timeout):
+        return TIMEOUT_EXIT_CODE
+    return default
+
+# Default timeouts from the 'http' section of the config file
+def configTimeouts(config_path=CONFIG_PATH) -> tuple[float | None, float | None]:
+    """Return (timeout, connect_timeout) from the config, (None, None) without a valid one."""
+    try:
+        context = getConfigContext(config_path)
+    except (ConfigError, OSError):
+        return None, None
+    return context.timeout, context.connect_timeout
+
+# Command line timeouts with the config defaults filled in
+def resolveTimeouts(max_time: float | None = None, connect_timeout: float | None = None) -> tuple[float | None, float | None]:
+    """Return (max_time, connect_timeout); options win over the config and 0 disables a limit, like curl."""
+    default_max_time, default_connect_timeout = configTimeouts()
+    max_time = max_time if max_time is not None else default_max_time
+    connect_timeout = connect_timeout if connect_timeout is not None else default_connect_timeout
+    return max_time or None, connect_timeout or None
+
+# Build a deadline from the command line options
+def deadlineFromOptions(max_time: float | None = None, connect_timeout: float | None = None) -> Deadline | None:
+    """Return a Deadline starting now, or None when no limit applies."""
+    max_time, connect_timeout = resolveTimeouts(max_time, connect_timeout)
+    if max_time is None and connect_timeout is None:
+        return None
+    return Deadline(max_time, connect_timeout)
@@ -0,0 +1,236 @@
+import os
+import sys
+import time
+import socket
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import requests
+import urllib3.exceptions
+
+from .ui import TextDisplay
+from .jsonRender import renderText
+from .jsonCodec import jsonLoads
+
+# Largest single read from the socket while streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Longest line or event kept in memory; anything bigger is not a sane event
+MAX_EVENT_BYTES = 16 * 1024 * 1024
+
+# One Server-Sent Event or NDJSON record
+@dataclass
+class StreamEvent:
+    data: str
+    event: str | None = None
+    id: str | None = None
+    retry: int | None = None
+
+# Wire format of a streamed response
+def streamFormat(response: requests.Response) -> str:
+    """'sse' for text/event-stream responses, 'ndjson' (one record per line) otherwise."""
+    content_type = response.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+    return "sse" if content_type == "text/event-stream" else "ndjson"
+
+# Body chunks as soon as they arrive
+def iterChunks(response: requests.Response, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield whatever the socket has, up to `chunk_size` bytes, instead of
+    waiting for full chunks the way iter_content does on bodies that are not
+    chunked. Older urllib3 versions without read1 fall back to iter_content.
+    """
+    raw = response.raw
+    if response._content_consumed or not hasattr(raw, "read1"):
+        yield from response.iter_content(chunk_size=chunk_size)
+        return
+
+    try:
+        while True:
+            # requests opens the raw stream without decoding; gzip and deflate bodies are decoded here
+            chunk = raw.read1(chunk_size, decode_content=True)
+            if not chunk:
+                break
+            yield chunk
+    except urllib3.exceptions.HTTPError as e:
+        raise requests.exceptions.ConnectionError(e) from e
+    finally:
+        response._content_consumed = True
+
+# Split chunks into lines, keeping at most one partial line in memory
+def iterLines(chunks: Iterable[bytes], max_line: int = MAX_EVENT_BYTES) -> Iterator[bytes]:
+    """Yield lines without their LF or CRLF ending; a final line without a newline is yielded too."""
+    parts: list[bytes] = []
+    size = 0
+    for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                break
+            parts.append(chunk[start:end])
+            line = b"".join(parts)
+            parts, size = [], 0
+            yield line[:-1] if line.endswith(b"\r") else line
+            start = end + 1
+
+        if start < len(chunk):
+            parts.append(chunk[start:])
+            size += len(chunk) - start
+            if size > max_line:
+                raise ValueError(f"Stream line longer than {max_line} bytes")
+
+    if parts:
+        yield b"".join(parts)
+
+# Server-Sent Events from lines
+def iterSseEvents(lines: Iterable[bytes], max_event: int = MAX_EVENT_BYTES) -> Iterator[StreamEvent]:
+    """
+    Parse the text/event-stream format: 'field: value' lines, ':' comments,
+    and a blank line that dispatches the event. The last event id carries
+    over to later events, and an unterminated event at the end is dropped.
+    """
+    data: list[str] = []
+    size = 0
+    event = retry = None
+    last_id = None
+    for line in lines:
+        if not line:
+            if data:
+                yield StreamEvent("\n".join(data), event, last_id, retry)
+            data, size = [], 0
+            event = retry = None
+            continue
+        if line.startswith(b":"):
+            continue
+
+        field, _, value = line.partition(b":")
+        if value.startswith(b" "):
+            value = value[1:]
+        value = value.decode("utf-8", "replace")
+
+        if field == b"data":
+            data.append(value)
+            size += len(value)
+            if size > max_event:
+                raise ValueError(f"Stream event larger than {max_event} bytes")
+        elif field == b"event":
+            event = value
+        elif field == b"id":
+            if "\0" not in value:
+                last_id = value
+        elif field == b"retry":
+            if value.isdigit():
+                retry = int(value)
+
+# NDJSON records from lines
+def iterNdjsonRecords(lines: Iterable[bytes]) -> Iterator[StreamEvent]:
+    for line in lines:
+        if line.strip():
+            yield StreamEvent(line.decode("utf-8", "replace"))
+
+# Closes the connection when the server goes quiet
+class IdleWatch:
+    """
+    Watchdog thread that shuts the socket of `response` down when no data
+    arrived for `timeout` seconds, which ends a blocked read. Call touch()
+    after every read.
+    """
+
+    def __init__(self, response: requests.Response, timeout: float | None):
+        self.timeout = timeout
+        self.sock = getattr(getattr(response.raw, "connection", None), "sock", None)
+        self.expired = False
+        self._last = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def touch(self):
+        self._last = time.monotonic()
+
+    def _watch(self):
+        while not self._stop.wait(max(0.0, self._last + self.timeout - time.monotonic())):
+            if time.monotonic() - self._last >= self.timeout:
+                self.expired = True
+                try:
+                    self.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                return
+
+    def wrap(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Pass `chunks` through, touching the watch on each one."""
+        for chunk in chunks:
+            self.touch()
+            yield chunk
+
+    def __enter__(self) -> "IdleWatch":
+        if self.timeout and self.sock is not None:
+            self._thread = threading.Thread(target=self._watch, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+
+# Print one event for a person or a pipe
+def renderEvent(event: StreamEvent, format: str, raw: bool = False):
+    """
+    Raw output writes each SSE data payload or NDJSON record on its own
+    line and flushes it. Otherwise SSE events get an 'event / id' header
+    and JSON payloads are pretty printed.
+    """
+    if raw:
+        sys.stdout.buffer.write(event.data.encode("utf-8") + b"\n")
+        sys.stdout.buffer.flush()
+        return
+
+    if format == "sse":
+        header = f"event: {event.event or 'message'}"
+        if event.id is not None:
+            header += f"  id: {event.id}"
+        TextDisplay.style_text(header, style="gray50")
+    try:
+        TextDisplay.print_json(jsonLoads(event.data), size_hint=len(event.data))
+    except ValueError:
+        renderText(event.data)
+
+# Read and print a streamed response event by event
+def showEventStream(
+    response: requests.Response,
+    *,
+    max_events: int | None = None,
+    idle_timeout: float | None = None,
+    raw: bool = False
+) -> int:
+    """
+    Print SSE events or NDJSON records as they arrive, stopping after
+    `max_events` or when no data arrived for `idle_timeout` seconds.
+    Returns the number of events shown.
+    """
+    format = streamFormat(response)
+    count = 0
+    with IdleWatch(response, idle_timeout) as idle:
+        try:
+            lines = iterLines(idle.wrap(iterChunks(response)))
+            events = iterSseEvents(lines) if format == "sse" else iterNdjsonRecords(lines)
+            for event in events:
+                renderEvent(event, format, raw)
+                count += 1
+                if max_events and count >= max_events:
+                    TextDisplay.info_text(f"Stopped after {count} events (--max-events).")
+                    break
+
+        except BrokenPipeError:
+            # The reader went away; stop quietly
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            raise SystemExit(0)
+
+        except requests.exceptions.RequestException:
+            # A read cut short by the idle watch is the end of the stream, not an error
+            if not idle.expired:
+                raise
+
+    if idle.expired:
+        TextDisplay.warn_text(f"No data for {idle_timeout}s; stream closed (--idle-timeout).")
+    return count
@@ -0,0 +1,315 @@
+import os
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .ui import TextDisplay
+from .configParser import CONFIG_PATH
+from .httpEngine import getSession, sendPrepared
+from .retryEngine import RetryPolicy
+from .deadline import Deadline
+from .saveToFile import DOWNLOAD_CHUNK_SIZE
+from .jsonCodec import jsonLoad, jsonDump
+
+# Cache directory, next to the config file
+CACHE_PATH = CONFIG_PATH.parent / "cache"
+
+# Total size of cached bodies before least recently used entries are evicted
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Request headers that do not select a different representation
+_KEY_IGNORED_HEADERS = {"if-none-match", "if-modified-since", "range", "if-range", "cache-control", "pragma"}
+
+# Response headers that no longer apply once the body is stored decoded
+_STORED_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+# Headers a 304 response may update on the stored entry
+_REVALIDATION_HEADERS = ("Cache-Control", "Expires", "Date", "ETag", "Last-Modified", "Age", "Vary")
+
+# Create a uniquely named temp file next to `path`, readable by the owner only, so concurrent
+# writers never share it; entries may hold authenticated responses
+def _openPrivateTemp(path: Path, mode: str = "wb", **kwargs):
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    os.chmod(temp_name, 0o600)
+    return os.fdopen(fd, mode, **kwargs), Path(temp_name)
+
+# Parse a Cache-Control header into a dict of directives
+def parseCacheControl(value: str | None) -> dict:
+    """Return Cache-Control directives as {name: value or True}."""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') if arg else True
+    return directives
+
+# Seconds a stored response stays fresh, None when the server gave no hint
+def freshnessLifetime(headers) -> float | None:
+    """Freshness lifetime from Cache-Control max-age or Expires (minus Age)."""
+    directives = parseCacheControl(headers.get("Cache-Control"))
+    age = int(headers.get("Age", "0")) if headers.get("Age", "0").isdigit() else 0
+
+    if "max-age" in directives:
+        try:
+            return max(0, int(directives["max-age"]) - age)
+        except ValueError:
+            return 0
+
+    if headers.get("Expires"):
+        try:
+            expires = parsedate_to_datetime(headers["Expires"])
+            date = parsedate_to_datetime(headers["Date"]) if headers.get("Date") else None
+            now = date.timestamp() if date else time.time()
+            return max(0, expires.timestamp() - now - age)
+        except (TypeError, ValueError):
+            # Invalid Expires means already expired
+            return 0
+
+    return None
+
+# On-disk cache of GET responses
+class HttpCache:
+    """
+    Stores GET bodies (decoded) with their headers and validators under
+    `path`. Entries are `<key>.body` + `<key>.json`; the metadata file's
+    mtime records the last use for LRU eviction.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+
+    def key(self, prepared: requests.PreparedRequest) -> str:
+        """Cache key from the method, URL and representation selecting headers."""
+        parts = [prepared.method or "GET", prepared.url or ""]
+        for name, value in sorted(prepared.headers.items(), key=lambda item: item[0].lower()):
+            if name.lower() not in _KEY_IGNORED_HEADERS:
+                parts.append(f"{name.lower()}:{value}")
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _bodyPath(self, key: str) -> Path:
+        return self.path / f"{key}.body"
+
+    def _metaPath(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def lookup(self, key: str) -> dict | None:
+        """Return the stored metadata for `key`, or None when nothing usable is cached."""
+        meta_path, body_path = self._metaPath(key), self._bodyPath(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = jsonLoad(f)
+            if body_path.stat().st_size != meta.get("size"):
+                raise ValueError("body size mismatch")
+            return meta
+        except (OSError, ValueError):
+            self.remove(key)
+            return None
+
+    @staticmethod
+    def isFresh(meta: dict, request_headers=None) -> bool:
+        """Whether the entry can be served without contacting the server."""
+        request_directives = parseCacheControl((request_headers or {}).get("Cache-Control"))
+        if "no-cache" in request_directives or request_directives.get("max-age") == "0":
+            return False
+        if "no-cache" in parseCacheControl(meta["headers"].get("Cache-Control")):
+            return False
+        return meta.get("expires_at") is not None and time.time() < meta["expires_at"]
+
+    @staticmethod
+    def conditionalHeaders(meta: dict) -> dict:
+        """Validators to revalidate a stale entry."""
+        headers = {}
+        if meta["headers"].get("ETag"):
+            headers["If-None-Match"] = meta["headers"]["ETag"]
+        if meta["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+        return headers
+
+    @staticmethod
+    def isCacheable(response: requests.Response) -> bool:
+        """200 responses that allow storing and can be reused or revalidated."""
+        if response.status_code != 200:
+            return False
+        directives = parseCacheControl(response.headers.get("Cache-Control"))
+        if "no-store" in directives or response.headers.get("Vary", "").strip() == "*":
+            return False
+        has_validator = bool(response.headers.get("ETag") or response.headers.get("Last-Modified"))
+        return has_validator or bool(freshnessLifetime(response.headers))
+
+    def _writeMeta(self, key: str, meta: dict):
+        f, temp_path = _openPrivateTemp(self._metaPath(key), "w", encoding="utf-8")
+        try:
+            with f:
+                jsonDump(meta, f)
+            os.replace(temp_path, self._metaPath(key))
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def _expiresAt(self, headers) -> float | None:
+        lifetime = freshnessLifetime(headers)
+        return time.time() + lifetime if lifetime is not None else None
+
+    def store(self, key: str, response: requests.Response) -> dict:
+        """Stream the response body into the cache and return the new metadata."""
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        body_path = self._bodyPath(key)
+
+        size = 0
+        f, temp_path = _openPrivateTemp(body_path)
+        try:
+            with f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(temp_path, body_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+            response.close()
+
+        # The body is stored decoded, so the transfer headers no longer apply
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in _STORED_DROPPED_HEADERS
+        }
+        headers["Content-Length"] = str(size)
+
+        meta = {
+            "url": response.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": headers,
+            "size": size,
+            "stored_at": time.time(),
+            "expires_at": self._expiresAt(response.headers)
+        }
+        self._writeMeta(key, meta)
+        self.evict()
+        return meta
+
+    def refresh(self, key: str, meta: dict, not_modified: requests.Response) -> dict:
+        """Merge the headers of a 304 response into the stored entry."""
+        for name in _REVALIDATION_HEADERS:
+            if name in not_modified.headers:
+                meta["headers"][name] = not_modified.headers[name]
+        meta["stored_at"] = time.time()
+        meta["expires_at"] = self._expiresAt(meta["headers"])
+        self._writeMeta(key, meta)
+        return meta
+
+    def toResponse(self, key: str, meta: dict, prepared: requests.PreparedRequest) -> requests.Response:
+        """Build a Response whose body streams from the cached file."""
+        # Record the use for LRU eviction
+        os.utime(self._metaPath(key))
+
+        response = requests.Response()
+        response.status_code = meta["status"]
+        response.reason = meta.get("reason") or "OK"
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.url = meta["url"]
+        response.request = prepared
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.elapsed = timedelta(0)
+        response.raw = open(self._bodyPath(key), "rb")
+        return response
+
+    def remove(self, key: str):
+        """Delete one entry."""
+        self._bodyPath(key).unlink(missing_ok=True)
+        self._metaPath(key).unlink(missing_ok=True)
+
+    def entries(self) -> list[tuple[str, dict, float]]:
+        """All readable entries as (key, metadata, last used time)."""
+        entries = []
+        if not self.path.exists():
+            return entries
+        for meta_path in self.path.glob("*.json"):
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = jsonLoad(f)
+                entries.append((meta_path.stem, meta, meta_path.stat().st_mtime))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(meta.get("size", 0) for _, meta, _ in entries)
+        for key, meta, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self.remove(key)
+            total -= meta.get("size", 0)
+
+    def clear(self) -> int:
+        """Delete every entry and return how many were removed."""
+        removed = 0
+        for key, _, _ in self.entries():
+            self.remove(key)
+            removed += 1
+        # Leftovers from interrupted writes
+        if self.path.exists():
+            for leftover in self.path.glob("*.tmp"):
+                leftover.unlink(missing_ok=True)
+        return removed
+
+    def stats(self) -> dict:
+        """Entry count, sizes and freshness of the cache."""
+        entries = self.entries()
+        fresh = sum(1 for _, meta, _ in entries if self.isFresh(meta))
+        return {
+            "path": str(self.path),
+            "entries": len(entries),
+            "fresh": fresh,
+            "stale": len(entries) - fresh,
+            "size_bytes": sum(meta.get("size", 0) for _, meta, _ in entries),
+            "max_bytes": self.max_bytes
+        }
+
+# GET through the on-disk cache
+def sendCached(
+    request: requests.Request,
+    cache: HttpCache | None = None,
+    retry: RetryPolicy | None = None,
+    deadline: Deadline | None = None
+) -> requests.Response:
+    """
+    Serve a fresh cached entry from disk, revalidate a stale one with
+    If-None-Match/If-Modified-Since (a 304 is served from disk), and store
+    cacheable responses. Always returns a streamable Response.
+    """
+    cache = cache or HttpCache()
+    prepared = getSession().prepare_request(request)
+    key = cache.key(prepared)
+    meta = cache.lookup(key)
+
+    if meta and cache.isFresh(meta, prepared.headers):
+        TextDisplay.info_text("Served from cache")
+        return cache.toResponse(key, meta, prepared)
+
+    conditional = prepared.copy()
+    if meta:
+        for name, value in cache.conditionalHeaders(meta).items():
+            conditional.headers.setdefault(name, value)
+
+    response = sendPrepared(conditional, stream=True, retry=retry, deadline=deadline)
+
+    if meta and response.status_code == 304:
+        response.close()
+        TextDisplay.info_text("Not modified; served from cache")
+        return cache.toResponse(key, cache.refresh(key, meta, response), prepared)
+
+    if cache.isCacheable(response):
+        return cache.toResponse(key, cache.store(key, response), prepared)
+
+    if meta:
+        cache.remove(key)
+    return response
@@ -0,0 +1,294 @@
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+
+from .tokenParser import getSavedToken
+from .ui import TextDisplay
+from .timing import TimingAdapter
+from .retryEngine import RetryPolicy, sendWithRetry
+from .deadline import Deadline, DeadlineExceeded
+from .compression import BODY_ENCODINGS, CompressedBody, acceptEncodingHeader
+from .jsonCodec import jsonLoad, jsonLoads, jsonDumpBytes
+
+# Connection pool tuning for the shared session
+POOL_CONNECTIONS = 16   # distinct hosts kept in the pool
+POOL_MAXSIZE = 32       # keep-alive connections kept per host
+
+# Process wide session, created on first use
+_session: requests.Session | None = None
+
+# Build a session with pooled keep-alive adapters
+def createSession(pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE) -> requests.Session:
+    """Create a requests Session with a tuned, instrumented connection pool."""
+    session = requests.Session()
+
+    # TimingAdapter records DNS/connect/TLS/first byte times on every response
+    adapter = TimingAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=False
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # Cookies set by one response must not leak into the next request
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    return session
+
+# Shared session used by every HTTP command
+def getSession() -> requests.Session:
+    """Return the shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = createSession()
+    return _session
+
+# Recreate the shared session with new pool settings
+def configureSession(**kwargs) -> requests.Session:
+    """Replace the shared session with one built from the given settings."""
+    global _session
+    closeSession()
+    _session = createSession(**kwargs)
+    return _session
+
+# Release pooled connections
+def closeSession():
+    """Close the shared session and drop its pooled connections."""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+# Parse 'Key: Value' header strings into a dict
+def parseHeaders(headers_list: list[str] | None) -> dict:
+    """Parse a list of 'Key: Value' strings into a headers dict."""
+    headers = {}
+    if headers_list:
+        for header in headers_list:
+            key, value = header.split(":", 1)
+            headers[key.strip()] = value.strip()
+    return headers
+
+# Attach a saved token to the request headers or cookies
+def attachToken(
+    headers: dict,
+    cookies: dict,
+    alias: str,
+    token_placement: str = "header",
+    token_cookie_name: str = "access_token"
+):
+    """Resolve a saved token alias and place it in the headers or cookies."""
+    token, token_headers = getSavedToken(alias)
+    if token_placement.lower() == "header":
+        headers.update(token_headers)
+    elif token_placement.lower() == "cookie":
+        cookies[token_cookie_name] = token
+    else:
+        TextDisplay.warn_text(f"Unknown token placement '{token_placement}', defaulting to header.")
+        headers.update(token_headers)
+
+# Load JSON payload from an inline string or '@file'
+def loadJsonPayload(json_data: str):
+    """Parse inline JSON or read it from a file when prefixed with '@'."""
+    if json_data.strip().startswith("@"):
+        file_path = json_data.strip()[1:]
+        with open(file_path, "rb") as f:
+            return jsonLoad(f)
+    return jsonLoads(json_data)
+
+# Open the file named by an '@filename' body argument
+def openBodyFile(value: str):
+    """Open a request body file for binary streaming; requests sizes it with fstat."""
+    return open(value.strip()[1:], "rb")
+
+# Body of a sent request as printable text
+def bodyText(body) -> str | None:
+    """Decode a request body for display; streamed files are shown by name."""
+    if body is None:
+        return None
+    if isinstance(body, CompressedBody):
+        source = f" from {body.source.name}" if hasattr(body.source, "name") else ""
+        return f"<{body.encoding} compressed stream{source}>"
+    if hasattr(body, "read"):
+        return f"<streamed from {getattr(body, 'name', 'file')}>"
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    return body
+
+# Single request building path for every command
+def buildRequest(
+    method: str,
+    url: str,
+    *,
+    headers: dict | None = None,
+    headers_list: list[str] | None = None,
+    use_token: str | None = None,
+    token_placement: str = "header",
+    token_cookie_name: str = "access_token",
+    json_data: str | None = None,
+    json_payload: object = None,
+    data: str | None = None,
+    data_binary: str | None = None,
+    parse_json: bool = True,
+    compress_body: str | None = None,
+    accept_encoding: str | None = None
+) -> requests.Request:
+    """
+    Build a Request from the common command options. '@filename' bodies are
+    streamed from an open file handle; the caller closes it after sending.
+    """
+    request_headers = dict(headers or {})
+    request_headers.update(parseHeaders(headers_list))
+
+    # Handle authenticated requests
+    request_cookies = {}
+    if use_token:
+        attachToken(request_headers, request_cookies, use_token, token_placement, token_cookie_name)
+
+    if sum(bool(option) for option in (json_data or json_payload is not None, data, data_binary)) > 1:
+        raise ValueError("Use only one of --json, --data or --data-binary")
+
+    # Validate the encoding options before any body file is opened
+    if compress_body and compress_body.lower() not in BODY_ENCODINGS:
+        raise ValueError(f"Unsupported body compression '{compress_body}'. Use 'gzip' or 'deflate'.")
+    accept_header = acceptEncodingHeader(accept_encoding) if accept_encoding else None
+
+    payload = None
+    body = None
+
+    # Handle JSON payload (already decoded payloads skip the parse)
+    if json_payload is not None:
+        request_headers.setdefault("Content-Type", "application/json")
+        payload = json_payload
+
+    elif json_data:
+        request_headers.setdefault("Content-Type", "application/json")
+        if json_data.strip().startswith("@"):
+            # Send the file bytes as they are; parse only to validate them
+            body = openBodyFile(json_data)
+            if parse_json:
+                try:
+                    jsonLoad(body)
+                except ValueError:
+                    body.close()
+                    raise
+                body.seek(0)
+        elif parse_json:
+            payload = jsonLoads(json_data)
+        else:
+            body = json_data.encode("utf-8")
+
+    # Handle form data payload
+    elif data:
+        request_headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
+        body = openBodyFile(data) if data.startswith("@") else data
+
+    # Handle binary payload
+    elif data_binary:
+        request_headers.setdefault("Content-Type", "application/octet-stream")
+        body = openBodyFile(data_binary) if data_binary.startswith("@") else data_binary.encode("utf-8")
+
+    # Encode JSON payloads here rather than in requests, with the fastest installed backend
+    if payload is not None:
+        body = jsonDumpBytes(payload)
+
+    # Compress the body while it is sent (chunked, so no Content-Length is needed)
+    if compress_body:
+        if body is None:
+            TextDisplay.warn_text("--compress-body ignored: the request has no body")
+        else:
+            body = CompressedBody(body, compress_body.lower())
+            request_headers["Content-Encoding"] = body.encoding
+
+    # Advertise extra response codecs unless a header already chose them
+    if accept_header:
+        request_headers.setdefault("Accept-Encoding", accept_header)
+
+    return requests.Request(
+        method=method.upper(),
+        url=url,
+        headers=request_headers,
+        cookies=request_cookies,
+        data=body
+    )
+
+# Read a streamed file body into memory for requests that are sent repeatedly
+def bufferBody(prepared: requests.PreparedRequest) -> requests.PreparedRequest:
+    """Replace a file or streamed body with its bytes so the request can be copied and resent."""
+    body = prepared.body
+    if hasattr(body, "read"):
+        with body as f:
+            prepared.body = f.read()
+    elif body is not None and not isinstance(body, (bytes, str)):
+        try:
+            prepared.body = b"".join(body)
+        finally:
+            if hasattr(body, "close"):
+                body.close()
+        prepared.headers.pop("Transfer-Encoding", None)
+        prepared.headers["Content-Length"] = str(len(prepared.body))
+    return prepared
+
+# Send a prepared request through the shared session
+def _sendOnce(
+    prepared: requests.PreparedRequest,
+    *,
+    stream: bool = False,
+    deadline: Deadline | None = None,
+    **kwargs
+) -> requests.Response:
+    session = getSession()
+    settings = session.merge_environment_settings(
+        prepared.url, kwargs.pop("proxies", {}), stream, kwargs.pop("verify", None), kwargs.pop("cert", None)
+    )
+    settings.update(kwargs)
+    if deadline is None:
+        return session.send(prepared, **settings)
+
+    settings.update(stream=True, timeout=deadline.timeout())
+    with deadline.activate():
+        try:
+            response = deadline.guard(session.send(prepared, **settings))
+            # Read buffered bodies here, under the same deadline
+            if not stream:
+                response.content
+        except DeadlineExceeded:
+            raise
+        except requests.exceptions.RequestException as e:
+            # A socket timeout cut short by the deadline
+            if deadline.expired():
+                raise deadline.exceeded() from e
+            raise
+    return response
+
+def sendPrepared(
+    prepared: requests.PreparedRequest,
+    *,
+    stream: bool = False,
+    retry: RetryPolicy | None = None,
+    deadline: Deadline | None = None,
+    **kwargs
+) -> requests.Response:
+    """Send a PreparedRequest over the pooled session, retrying per `retry` within `deadline`."""
+    return sendWithRetry(_sendOnce, prepared, retry, deadline=deadline, stream=stream, **kwargs)
+
+# Build and send a request in one call
+def sendRequest(
+    method: str,
+    url: str,
+    *,
+    stream: bool = False,
+    retry: RetryPolicy | None = None,
+    deadline: Deadline | None = None,
+    **options
+) -> requests.Response:
+    """Build a request from command options and send it over the pooled session."""
+    request = buildRequest(method, url, **options)
+    try:
+        prepared = getSession().prepare_request(request)
+        return sendPrepared(prepared, stream=stream, retry=retry, deadline=deadline)
+    finally:
+        # The body has been sent (or the send failed); release streamed files
+        if hasattr(request.data, "close"):
+            request.data.close()
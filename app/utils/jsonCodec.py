@@ -0,0 +1,148 @@
+import json
+import math
+from typing import Any, IO
+
+# Optional encoders, fastest first; the standard library is used when neither is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "msgspec" if msgspec is not None else "json"
+
+# Widen the two space indentation of orjson to `indent` spaces per level
+def _reindent(out: bytes, indent: int) -> bytes:
+    """
+    orjson escapes every control character inside strings, so NUL bytes can
+    mark the indentation pairs: the first pair after each newline, then each
+    pair following a marker, one nesting level per pass.
+    """
+    out = out.replace(b"\n  ", b"\n\x00")
+    while b"\x00  " in out:
+        out = out.replace(b"\x00  ", b"\x00\x00")
+    return out.replace(b"\x00", b" " * indent)
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def _fastLoads(data: str | bytes) -> Any:
+        return orjson.loads(data)
+
+    def _fastDumps(obj: Any, indent: int | None) -> bytes:
+        if indent is None:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        out = orjson.dumps(obj, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2)
+        return out if indent == 2 else _reindent(out, indent)
+
+elif msgspec is not None:
+    _encoder = msgspec.json.Encoder()
+    _decoder = msgspec.json.Decoder()
+
+    def _fastLoads(data: str | bytes) -> Any:
+        try:
+            return _decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise json.JSONDecodeError(str(e), "", 0) from None
+
+    def _fastDumps(obj: Any, indent: int | None) -> bytes:
+        try:
+            out = _encoder.encode(obj)
+        except msgspec.EncodeError as e:
+            raise TypeError(str(e)) from None
+        return msgspec.json.format(out, indent=indent) if indent is not None else out
+
+else:
+    _fastLoads = _fastDumps = None
+
+# Whether a fast backend would encode `obj` exactly like json.dumps
+def _fastEncodable(obj: Any) -> bool:
+    """
+    The fast backends write NaN and Infinity as null, format floats outside
+    1e-4 <= |x| < 1e16 with a different exponent style and convert non-string
+    keys their own way. Values holding any of those go to the standard library.
+    """
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            if not all(type(key) is str for key in value):
+                return False
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, float):
+            if not (value == 0 or (math.isfinite(value) and 1e-4 <= abs(value) < 1e16)):
+                return False
+    return True
+
+# Parse JSON text or UTF-8 bytes
+def jsonLoads(data: str | bytes) -> Any:
+    """
+    Decode a JSON document with the fastest installed backend. Input the fast
+    backends reject (NaN, integers beyond 64 bits, non UTF-8 bytes) is handed
+    to the standard library, so anything json.loads accepts still parses and
+    invalid documents raise ValueError as before.
+    """
+    if _fastLoads is not None:
+        try:
+            return _fastLoads(data)
+        except ValueError:
+            pass
+    return json.loads(data)
+
+# Encode with a fast backend when its output equals json.dumps
+def _fastEncode(obj: Any, indent: int | None, ensure_ascii: bool) -> bytes | None:
+    """
+    The fast backends only handle indented output (compact json.dumps uses
+    ', ' and ': ' separators they cannot produce, and its C encoder is fast
+    already) of values they encode identically. Their UTF-8 output is kept
+    for `ensure_ascii` only when it is plain ASCII anyway. None means the
+    standard library has to encode `obj`.
+    """
+    if _fastDumps is None or indent is None or not _fastEncodable(obj):
+        return None
+    try:
+        out = _fastDumps(obj, indent)
+    except TypeError:
+        return None
+    return out if not ensure_ascii or out.isascii() else None
+
+# Serialize to UTF-8 bytes
+def jsonDumpBytes(obj: Any, indent: int | None = None, ensure_ascii: bool = True) -> bytes:
+    """Encode `obj` as JSON bytes, byte for byte what json.dumps would write."""
+    out = _fastEncode(obj, indent, ensure_ascii)
+    if out is None:
+        out = json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii).encode("utf-8")
+    return out
+
+# Serialize to text
+def jsonDumps(obj: Any, indent: int | None = None, ensure_ascii: bool = True) -> str:
+    """Encode `obj` as a JSON string; see jsonDumpBytes."""
+    out = _fastEncode(obj, indent, ensure_ascii)
+    if out is None:
+        return json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii)
+    return out.decode("utf-8")
+
+# Parse a JSON file object (text or binary)
+def jsonLoad(fp: IO) -> Any:
+    return jsonLoads(fp.read())
+
+# Write JSON to a file object (text or binary)
+def jsonDump(obj: Any, fp: IO, indent: int | None = None, ensure_ascii: bool = True):
+    fp.write(jsonDumpBytes(obj, indent, ensure_ascii) if "b" in getattr(fp, "mode", "") else jsonDumps(obj, indent, ensure_ascii))
+
+# Decode the body of a requests response
+def responseJson(response) -> Any:
+    """
+    Drop-in for response.json(). UTF-8 bodies are parsed straight from the
+    raw bytes; bodies declared in another charset go through response.text.
+    """
+    encoding = (response.encoding or "utf-8").lower().replace("_", "-")
+    if encoding in ("utf-8", "utf8"):
+        return jsonLoads(response.content)
+    return jsonLoads(response.text)
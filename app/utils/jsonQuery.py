@@ -0,0 +1,301 @@
+import re
+from typing import Any, Iterable, Iterator
+
+from .jsonCodec import jsonLoads
+
+# Query syntax: .key  ."quoted key"  ["quoted key"]  [N]  []
+_QUERY_STEP = re.compile(r'\.([A-Za-z_$][\w$-]*)|\.?("(?:[^"\\]|\\.)*")|\.?\[\s*("(?:[^"\\]|\\.)*"|\d+)?\s*\]')
+
+# Tokens of the JSON scanner
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_SCALAR = re.compile(rb"[^\s,:\]}\"\[{]+")
+_STRING_PATTERN = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_STRING = re.compile(_STRING_PATTERN)
+# Unrolled loops, so a failed match backtracks in linear time:
+# the inside of a container without nested containers, a leaf container, and everything up to the next bracket
+_PLAIN = rb'[^"\[\]{}]*'
+_FLAT = _PLAIN + rb'(?:' + _STRING_PATTERN + _PLAIN + rb')*'
+_LEAF_PATTERN = rb'\[' + _FLAT + rb'\]|\{' + _FLAT + rb'\}'
+_LEAF = re.compile(_LEAF_PATTERN)
+_SKIP = re.compile(_PLAIN + rb'(?:(?:' + _STRING_PATTERN + rb'|' + _LEAF_PATTERN + rb')' + _PLAIN + rb')*')
+
+_OPEN_OBJECT, _CLOSE_OBJECT = ord("{"), ord("}")
+_OPEN_ARRAY, _CLOSE_ARRAY = ord("["), ord("]")
+_QUOTE, _COLON, _COMMA = ord('"'), ord(":"), ord(",")
+
+# Parsed --query expression
+class JsonQuery:
+    """
+    A jq-like path: '.key', '."key"' or '["key"]' select a member, '[N]' an
+    array element, '[]' every element of an array (or value of an object),
+    and '.' the whole document. Members that do not exist produce nothing.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.steps = self._parse(text.strip())
+        # Without '[]' a query matches at most once, so reading can stop at the first match
+        self.single = all(kind != "iter" for kind, _ in self.steps)
+
+    @staticmethod
+    def _parse(text: str) -> list[tuple[str, Any]]:
+        if not text.startswith((".", "[")):
+            raise ValueError(f"Invalid --query '{text}': it must start with '.'")
+        if text == ".":
+            return []
+
+        steps = []
+        pos = 0
+        while pos < len(text):
+            match = _QUERY_STEP.match(text, pos)
+            if match is None:
+                raise ValueError(f"Invalid --query '{text}' at position {pos}: expected .key, [N] or []")
+            name, quoted, bracket = match.groups()
+            if name is not None:
+                steps.append(("key", name))
+            elif quoted is not None:
+                steps.append(("key", jsonLoads(quoted)))
+            elif bracket is None:
+                steps.append(("iter", None))
+            elif bracket.startswith('"'):
+                steps.append(("key", jsonLoads(bracket)))
+            else:
+                steps.append(("index", int(bracket)))
+            pos = match.end()
+        return steps
+
+    def run(self, chunks: Iterable[bytes]) -> Iterator[Any]:
+        """
+        Yield the matches in document order while reading `chunks`. Only the
+        matches, and containers small enough to sit in the buffer, are decoded.
+        """
+        scanner = _Scanner(chunks)
+        for value in _evaluate(scanner, self.steps, 0):
+            yield value
+            if self.single:
+                return
+        scanner.end()
+
+# Incremental reader over the body chunks
+class _Scanner:
+    """
+    Walks a JSON document held in a sliding buffer: consumed bytes are
+    dropped whenever more input is needed, so memory stays at about one
+    chunk plus the value being captured.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.buf = b""
+        self.pos = 0
+        self.offset = 0                             # bytes dropped before buf
+        self.captured: list[bytes] | None = None
+        self.capture_start = 0
+
+    def _more(self) -> bool:
+        """Append the next chunk, dropping what was consumed; False at the end of input."""
+        for chunk in self.chunks:
+            if not chunk:
+                continue
+            if self.captured is not None:
+                self.captured.append(self.buf[self.capture_start:self.pos])
+                self.capture_start = 0
+            self.offset += self.pos
+            self.buf = self.buf[self.pos:] + chunk
+            self.pos = 0
+            return True
+        return False
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"Response is not valid JSON at byte {self.offset + self.pos}: {message}")
+
+    def peek(self) -> int | None:
+        """Skip whitespace and return the next byte without consuming it (None at the end)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                return None
+
+    def expect(self, byte: int):
+        if self.peek() != byte:
+            raise self.error(f"expected '{chr(byte)}'")
+        self.pos += 1
+
+    def _token(self, pattern: re.Pattern) -> bytes:
+        """Match `pattern` at the current byte, reading more input while the token may continue."""
+        while True:
+            match = pattern.match(self.buf, self.pos)
+            if match is not None and match.end() < len(self.buf):
+                break
+            if not self._more():
+                if match is None:
+                    raise self.error("unexpected end of input")
+                break
+        self.pos = match.end()
+        return match.group()
+
+    def readKey(self) -> str:
+        if self.peek() != _QUOTE:
+            raise self.error("expected a member name")
+        return jsonLoads(self._token(_STRING))
+
+    def skipValue(self):
+        """Step over one value without decoding it."""
+        first = self.peek()
+        if first is None:
+            raise self.error("unexpected end of input")
+        if first == _QUOTE:
+            self._token(_STRING)
+            return
+        if first not in (_OPEN_OBJECT, _OPEN_ARRAY):
+            self._token(_SCALAR)
+            return
+
+        # A container without nested containers is matched in one step
+        leaf = _LEAF.match(self.buf, self.pos)
+        if leaf is not None:
+            self.pos = leaf.end()
+            return
+
+        # Otherwise count brackets; strings and leaf containers between them are skipped whole
+        depth = 1
+        self.pos += 1
+        while True:
+            self.pos = _SKIP.match(self.buf, self.pos).end()
+            if self.pos == len(self.buf) or self.buf[self.pos] == _QUOTE:
+                # The buffer ends inside a string
+                if not self._more():
+                    raise self.error("unexpected end of input")
+                continue
+            depth += 1 if self.buf[self.pos] in (_OPEN_OBJECT, _OPEN_ARRAY) else -1
+            self.pos += 1
+            if depth == 0:
+                return
+
+    def localEnd(self) -> int | None:
+        """End of the container at the current byte when all of it is already buffered, else None."""
+        buf = self.buf
+        leaf = _LEAF.match(buf, self.pos)
+        if leaf is not None:
+            return leaf.end()
+
+        depth = 1
+        pos = self.pos + 1
+        while True:
+            pos = _SKIP.match(buf, pos).end()
+            if pos == len(buf) or buf[pos] == _QUOTE:
+                return None
+            depth += 1 if buf[pos] in (_OPEN_OBJECT, _OPEN_ARRAY) else -1
+            pos += 1
+            if depth == 0:
+                return pos
+
+    def readValue(self) -> Any:
+        """Decode one value; its bytes are collected across chunks and parsed in one call."""
+        self.peek()
+        self.captured, self.capture_start = [], self.pos
+        try:
+            self.skipValue()
+            self.captured.append(self.buf[self.capture_start:self.pos])
+            data = b"".join(self.captured)
+        finally:
+            self.captured = None
+        return jsonLoads(data)
+
+    def members(self) -> Iterator[str]:
+        """Yield each member name of an object, positioned at its value; the caller consumes the value."""
+        self.expect(_OPEN_OBJECT)
+        if self.peek() == _CLOSE_OBJECT:
+            self.pos += 1
+            return
+        while True:
+            key = self.readKey()
+            self.expect(_COLON)
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == _CLOSE_OBJECT:
+                return
+            if separator != _COMMA:
+                self.pos -= 1
+                raise self.error("expected ',' or '}'")
+
+    def elements(self) -> Iterator[int]:
+        """Yield the index of each array element, positioned at it; the caller consumes the element."""
+        self.expect(_OPEN_ARRAY)
+        if self.peek() == _CLOSE_ARRAY:
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            separator = self.peek()
+            self.pos += 1
+            if separator == _CLOSE_ARRAY:
+                return
+            if separator != _COMMA:
+                self.pos -= 1
+                raise self.error("expected ',' or ']'")
+
+    def end(self):
+        if self.peek() is not None:
+            raise self.error("unexpected data after the document")
+
+# Walk the document along the query steps
+def _evaluate(scanner: _Scanner, steps: list, index: int) -> Iterator[Any]:
+    if index == len(steps):
+        yield scanner.readValue()
+        return
+
+    kind, argument = steps[index]
+    first = scanner.peek()
+
+    # A container that is already buffered is cheaper to decode in one call and walk in memory
+    if first == _OPEN_OBJECT or first == _OPEN_ARRAY:
+        end = scanner.localEnd()
+        if end is not None:
+            value = jsonLoads(scanner.buf[scanner.pos:end])
+            scanner.pos = end
+            yield from _select(value, steps, index)
+            return
+
+    if first == _OPEN_OBJECT and kind in ("key", "iter"):
+        for key in scanner.members():
+            if kind == "iter" or key == argument:
+                yield from _evaluate(scanner, steps, index + 1)
+            else:
+                scanner.skipValue()
+
+    elif first == _OPEN_ARRAY and kind in ("index", "iter"):
+        for position in scanner.elements():
+            if kind == "iter" or position == argument:
+                yield from _evaluate(scanner, steps, index + 1)
+            else:
+                scanner.skipValue()
+
+    else:
+        scanner.skipValue()
+
+# Apply the remaining query steps to a decoded value
+def _select(value: Any, steps: list, index: int) -> Iterator[Any]:
+    if index == len(steps):
+        yield value
+        return
+
+    kind, argument = steps[index]
+    if isinstance(value, dict):
+        if kind == "iter":
+            for member in value.values():
+                yield from _select(member, steps, index + 1)
+        elif kind == "key" and argument in value:
+            yield from _select(value[argument], steps, index + 1)
+
+    elif isinstance(value, list):
+        if kind == "iter":
+            for element in value:
+                yield from _select(element, steps, index + 1)
+        elif kind == "index" and argument < len(value):
+            yield from _select(value[argument], steps, index + 1)
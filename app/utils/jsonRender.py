@@ -0,0 +1,165 @@
+import json
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Iterable, Iterator
+
+from .ui import getConsole, TextDisplay
+from .jsonCodec import jsonDumps
+
+# Largest body (bytes) that is syntax highlighted; rich needs about a second per 128 KiB
+HIGHLIGHT_MAX_BYTES = 64 * 1024
+
+# Output cap on a terminal when --max-render-bytes is not given; piped output is not capped
+DEFAULT_MAX_RENDER_BYTES = 1024 * 1024
+
+# Indentation of rendered JSON
+RENDER_INDENT = 4
+
+# Characters collected before a write to stdout
+WRITE_BUFFER_SIZE = 64 * 1024
+
+_dumps = partial(json.dumps, ensure_ascii=False)
+
+# How much of a document to render
+@dataclass
+class RenderLimits:
+    max_bytes: int | None = None    # None: DEFAULT_MAX_RENDER_BYTES on a terminal, unlimited when piped; 0: unlimited
+    max_depth: int | None = None    # containers nested deeper are summarised
+    max_items: int | None = None    # array elements shown before the rest is summarised
+
+    def byteCap(self, terminal: bool) -> int | None:
+        if self.max_bytes is None:
+            return DEFAULT_MAX_RENDER_BYTES if terminal else None
+        return self.max_bytes or None
+
+# Pretty printed JSON, produced piece by piece
+def iterJson(
+    data: Any,
+    indent: int = RENDER_INDENT,
+    max_depth: int | None = None,
+    max_items: int | None = None,
+    level: int = 0
+) -> Iterator[str]:
+    """
+    Yield `data` as indented JSON text. Containers below `max_depth` and
+    array elements past `max_items` are replaced by string placeholders,
+    so the output stays valid JSON. Rendering stops as soon as the
+    consumer stops iterating. Without limits, members below the top
+    level are encoded in one piece, which is several times faster than
+    walking them.
+    """
+    unlimited = max_depth is None and max_items is None and level > 0
+    if isinstance(data, dict):
+        if not data:
+            yield "{}"
+            return
+        if max_depth is not None and level >= max_depth:
+            yield _dumps(f"{{…}} {len(data)} keys")
+            return
+
+        padding = "\n" + " " * (indent * (level + 1))
+        yield "{"
+        for index, (key, value) in enumerate(data.items()):
+            yield f"{',' if index else ''}{padding}{_dumps(key if isinstance(key, str) else str(key))}: "
+            if unlimited:
+                yield jsonDumps(value, indent, ensure_ascii=False).replace("\n", padding)
+            else:
+                yield from iterJson(value, indent, max_depth, max_items, level + 1)
+        yield "\n" + " " * (indent * level) + "}"
+
+    elif isinstance(data, (list, tuple)):
+        if not data:
+            yield "[]"
+            return
+        if max_depth is not None and level >= max_depth:
+            yield _dumps(f"[…] {len(data)} items")
+            return
+
+        padding = "\n" + " " * (indent * (level + 1))
+        yield "["
+        for index, value in enumerate(data):
+            if max_items is not None and index >= max_items:
+                yield f",{padding}{_dumps(f'… {len(data) - index} more items')}"
+                break
+            yield f"{',' if index else ''}{padding}"
+            if unlimited:
+                yield jsonDumps(value, indent, ensure_ascii=False).replace("\n", padding)
+            else:
+                yield from iterJson(value, indent, max_depth, max_items, level + 1)
+        yield "\n" + " " * (indent * level) + "]"
+
+    else:
+        yield _dumps(data)
+
+# Write text pieces to the console stream until `max_bytes` have been written
+def writeCapped(chunks: Iterable[str], max_bytes: int | None = None) -> bool:
+    """
+    Write `chunks` and a final newline to the console stream (stderr once raw
+    output owns stdout); returns True when the output was cut at `max_bytes`.
+    """
+    out = getConsole().file
+    written = 0
+    pending, pending_size = [], 0
+    for chunk in chunks:
+        if max_bytes is not None:
+            data = chunk.encode("utf-8")
+            if written + len(data) > max_bytes:
+                pending.append(data[:max_bytes - written].decode("utf-8", "ignore") + "\n")
+                out.write("".join(pending))
+                out.flush()
+                return True
+            written += len(data)
+
+        # Small pieces are joined so the stream sees few large writes
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= WRITE_BUFFER_SIZE:
+            out.write("".join(pending))
+            pending, pending_size = [], 0
+
+    pending.append("\n")
+    out.write("".join(pending))
+    out.flush()
+    return False
+
+# Tell the user the output was cut
+def _truncatedNote(max_bytes: int):
+    TextDisplay.warn_text(f"Output truncated at {max_bytes} bytes; use --max-render-bytes 0 to show everything.")
+
+# Render a decoded JSON document, picking a strategy by size
+def renderJson(data: Any, limits: RenderLimits | None = None, size_hint: int | None = None, style: str = "White"):
+    """
+    Syntax highlight small documents on a terminal. Larger documents, or
+    any document when stdout is not a terminal, are streamed as plain
+    indented text. `size_hint` is the encoded size of the document, when
+    known; documents without one count as small.
+    """
+    limits = limits or RenderLimits()
+    console = getConsole()
+    terminal = console.is_terminal
+    max_bytes = limits.byteCap(terminal)
+    # Without any limit the document is encoded in one call, the fastest way with a fast JSON backend
+    if max_bytes is None and limits.max_depth is None and limits.max_items is None:
+        chunks = [jsonDumps(data, RENDER_INDENT, ensure_ascii=False)]
+    else:
+        chunks = iterJson(data, RENDER_INDENT, limits.max_depth, limits.max_items)
+
+    # Small documents are cheap enough to highlight; the size check covers callers without a hint
+    if terminal and (size_hint is None or size_hint <= HIGHLIGHT_MAX_BYTES):
+        text = "".join(chunks)
+        size = len(text.encode("utf-8"))
+        if size <= HIGHLIGHT_MAX_BYTES and (max_bytes is None or size <= max_bytes):
+            from rich.json import JSON
+            console.print(JSON(text, indent=RENDER_INDENT), style=style)
+            return
+        chunks = [text]
+
+    if writeCapped(chunks, max_bytes):
+        _truncatedNote(max_bytes)
+
+# Render a body that is not JSON
+def renderText(text: str, limits: RenderLimits | None = None):
+    """Print `text` as is, cut at the byte cap of `limits`."""
+    max_bytes = (limits or RenderLimits()).byteCap(getConsole().is_terminal)
+    if writeCapped([text], max_bytes):
+        _truncatedNote(max_bytes)
@@ -0,0 +1,52 @@
+import importlib
+
+from typer import Typer
+from typer.core import TyperGroup
+from typer.main import get_command
+
+# Commands registered by import path, in the order they are listed
+_LAZY_COMMANDS: dict[str, tuple[str, dict | None]] = {}
+
+# Register a command function without importing its module
+def lazyCommand(name: str, target: str, **options):
+    """Register 'module:function' as command `name`; `options` are passed to Typer.command."""
+    _LAZY_COMMANDS[name] = (target, options)
+
+# Register a Typer sub-application without importing its module
+def lazyTyper(name: str, target: str):
+    """Register the Typer instance at 'module:attribute' as command group `name`."""
+    _LAZY_COMMANDS[name] = (target, None)
+
+# Import a registered command and build its click command
+def _loadCommand(name: str):
+    target, options = _LAZY_COMMANDS[name]
+    module_name, attribute = target.split(":")
+    obj = getattr(importlib.import_module(module_name), attribute)
+
+    if isinstance(obj, Typer):
+        command = get_command(obj)
+    else:
+        # A single-command Typer turns the function into a plain command
+        wrapper = Typer()
+        wrapper.command(name=name, **options)(obj)
+        command = get_command(wrapper)
+
+    command.name = name
+    return command
+
+# Root group that loads subcommands on demand
+class LazyGroup(TyperGroup):
+    """
+    TyperGroup whose subcommands are imported only when they run, so a
+    command pays for its own dependencies (requests, rich, ...) and no one
+    else's. Listing them for --help imports them all.
+    """
+
+    def list_commands(self, ctx) -> list[str]:
+        eager = [name for name in super().list_commands(ctx) if name not in _LAZY_COMMANDS]
+        return [*_LAZY_COMMANDS, *eager]
+
+    def get_command(self, ctx, cmd_name: str):
+        if cmd_name not in self.commands and cmd_name in _LAZY_COMMANDS:
+            self.commands[cmd_name] = _loadCommand(cmd_name)
+        return super().get_command(ctx, cmd_name)
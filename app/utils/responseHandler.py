@@ -0,0 +1,245 @@
+import os
+import sys
+
+import requests
+
+from .ui import TextDisplay, useStderr
+from .jsonRender import RenderLimits, renderText
+from .responseView import ResponseView
+from .jsonQuery import JsonQuery
+from .jsonCodec import jsonDumpBytes
+from .eventStream import showEventStream
+from .saveToFile import saveResponseToFile, partialPath
+from .saveRequest import saveRequestResponse
+from .httpEngine import bodyText
+from .saveToFile import DOWNLOAD_CHUNK_SIZE
+from .timing import reportTiming
+
+# Print the body of a response as JSON or plain text
+def showResponseContent(response: ResponseView, limits: RenderLimits | None = None):
+    """Display the response body, pretty printed when it is JSON, within `limits`."""
+    try:
+        TextDisplay.print_json(response.json(), limits=limits, size_hint=response.size)
+    except ValueError:
+        renderText(response.text, limits)
+
+# Decide whether --show-content writes the body bytes as they are
+def rawOutputMode(raw: bool | None, show_content: bool, limits: RenderLimits | None = None) -> bool:
+    """
+    --raw forces the passthrough and --no-raw disables it. Otherwise it is
+    used for --show-content when stdout is not a terminal, unless
+    --max-depth or --max-items ask for rendered JSON. In raw mode all
+    messages go to stderr.
+    """
+    if raw is None:
+        limits = limits or RenderLimits()
+        raw = show_content and not sys.stdout.isatty() and limits.max_depth is None and limits.max_items is None
+    if raw:
+        useStderr()
+    return raw
+
+# Write the undecoded body to stdout
+def showRawContent(response: ResponseView, limits: RenderLimits | None = None, stream: bool = True):
+    """
+    Copy the body bytes to stdout in chunks, without decoding them. With
+    `stream` an unread body goes straight from the socket to stdout;
+    otherwise it is read into memory first so later outputs can reuse it.
+    """
+    max_bytes = (limits or RenderLimits()).byteCap(sys.stdout.isatty())
+    chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE) if stream and not response.loaded else [response.content]
+
+    out = sys.stdout.buffer
+    written = 0
+    try:
+        sys.stdout.flush()
+        for chunk in chunks:
+            if max_bytes is not None and written + len(chunk) > max_bytes:
+                out.write(chunk[:max_bytes - written])
+                out.flush()
+                TextDisplay.warn_text(f"Output truncated at {max_bytes} bytes; use --max-render-bytes 0 to show everything.")
+                return
+            out.write(chunk)
+            written += len(chunk)
+        out.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); stop quietly and keep the interpreter from complaining at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        raise SystemExit(0)
+
+# Evaluate --query over the body and send each match to the terminal and/or --output
+def showQueryResults(
+    response: ResponseView,
+    query: JsonQuery,
+    *,
+    show: bool = True,
+    raw: bool = False,
+    save_to_file: str | None = None,
+    response_format: str = "raw",
+    limits: RenderLimits | None = None
+) -> int:
+    """
+    Matches are printed and written as the body is read, so the document is
+    never held in memory. Raw output and the 'raw' file format get one
+    compact JSON value per line; otherwise each match is pretty printed.
+    Returns the number of matches.
+    """
+    out = open(partialPath(save_to_file), "wb") if save_to_file else None
+    indent = 4 if response_format == "json" else None
+    count = 0
+    try:
+        for value in query.run(response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)):
+            count += 1
+            if out is not None:
+                out.write(jsonDumpBytes(value, indent, ensure_ascii=False) + b"\n")
+            if show and raw:
+                sys.stdout.buffer.write(jsonDumpBytes(value, ensure_ascii=False) + b"\n")
+                sys.stdout.buffer.flush()
+            elif show:
+                TextDisplay.print_json(value, limits=limits)
+
+    except BrokenPipeError:
+        # The reader went away; stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        raise SystemExit(0)
+
+    except BaseException:
+        if out is not None:
+            out.close()
+            partialPath(save_to_file).unlink(missing_ok=True)
+        raise
+
+    if out is not None:
+        out.close()
+        os.replace(partialPath(save_to_file), save_to_file)
+        TextDisplay.success_text(f"{count} {'match' if count == 1 else 'matches'} saved to {save_to_file}", style="white")
+    if not count:
+        TextDisplay.warn_text(f"No match for --query '{query.text}'")
+    return count
+
+# Request details as a plain dict
+def requestDetails(response: requests.Response) -> dict:
+    """Extract the method, url, headers and body of the sent request."""
+    return {
+        "method": response.request.method,
+        "url": response.request.url,
+        "headers": dict(response.request.headers),
+        "body": bodyText(response.request.body) if response.request.body else None
+    }
+
+# Read whatever is left of the body so the timing covers the whole transfer
+def _drainBody(response: requests.Response):
+    if not response._content_consumed:
+        for _ in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            pass
+    # A stream that was stopped early (--max-events, a single --query match) ends here
+    _finishTiming(response)
+
+# Stamp the end of the transfer, if it was not stamped at the end of the body already
+def _finishTiming(response: requests.Response):
+    timing = getattr(response, "timing", None)
+    if timing is not None:
+        timing.finish()
+
+# Timing output requested on the command line
+def _showTiming(response: requests.Response, show_timing: bool, write_out: str | None):
+    if show_timing or write_out:
+        _drainBody(response)
+        reportTiming(response, show_timing, write_out)
+
+# Shared output path for every HTTP command
+def handleResponse(
+    response: requests.Response | ResponseView,
+    *,
+    method: str,
+    url: str,
+    show_content: bool = False,
+    save_to_file: str | None = None,
+    response_format: str = "raw",
+    save_request_to_file: str | None = None,
+    show_request: bool = False,
+    resume_from: int = 0,
+    show_timing: bool = False,
+    write_out: str | None = None,
+    render_limits: RenderLimits | None = None,
+    raw: bool = False,
+    stream_events: bool = False,
+    max_events: int | None = None,
+    idle_timeout: float | None = None,
+    query: JsonQuery | None = None
+):
+    """
+    Report failures, then display and save the response as requested. Every
+    output shares one ResponseView, so the body is decoded and parsed once.
+    """
+    response = ResponseView.of(response)
+    try:
+        # With --timing or -w the body is read before any output, so the transfer time holds no
+        # local work; downloads and event streams are still timed while they are written out
+        if (show_timing or write_out) and not (stream_events or save_to_file):
+            response.content
+            _finishTiming(response)
+
+        # Handle failed requests
+        if response.status_code >= 400:
+            TextDisplay.error_text(f"Request failed with status code: {response.status_code}")
+            if raw:
+                showRawContent(response, render_limits)
+            else:
+                showResponseContent(response, render_limits)
+            _showTiming(response, show_timing, write_out)
+            raise SystemExit(response.status_code)
+
+        # Success message
+        TextDisplay.style_text(f"{method.upper()} request to {url} successful.", style="white")
+        TextDisplay.success_text(f"Status Code: {response.status_code}")
+
+        # Print SSE events or NDJSON records as they arrive
+        if stream_events:
+            if not raw:
+                TextDisplay.info_text("Streaming events:", style="white")
+            showEventStream(response, max_events=max_events, idle_timeout=idle_timeout, raw=raw)
+
+        # Print and/or save only the parts selected by --query
+        elif query is not None:
+            if save_request_to_file:
+                # --save-request needs the whole body afterwards, so read it first
+                response.content
+            if show_content and not raw:
+                TextDisplay.info_text("Query Results:", style="white")
+            showQueryResults(
+                response,
+                query,
+                show=show_content,
+                raw=raw,
+                save_to_file=save_to_file,
+                response_format=response_format,
+                limits=render_limits
+            )
+
+        # Display response content if requested
+        elif show_content:
+            if raw:
+                # The body is streamed only when no other output needs it afterwards
+                showRawContent(response, render_limits, stream=not (save_request_to_file or save_to_file))
+            else:
+                TextDisplay.info_text("Response Content:", style="white")
+                showResponseContent(response, render_limits)
+
+        # Save request/response details
+        if save_request_to_file:
+            saveRequestResponse(response, save_request_to_file)
+
+        # Save response to file if path provided (streams the body when nothing read it yet)
+        if save_to_file and query is None:
+            saveResponseToFile(response, save_to_file, response_format, resume_from=resume_from)
+
+        # Show request details
+        if show_request:
+            TextDisplay.info_text("Request Details:")
+            TextDisplay.print_json(requestDetails(response))
+
+        _showTiming(response, show_timing, write_out)
+
+    finally:
+        # Streamed responses hold their connection until closed
+        response.close()
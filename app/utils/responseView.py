@@ -0,0 +1,60 @@
+import requests
+
+from .jsonCodec import responseJson
+
+# Marks a body that has not been parsed yet
+_UNPARSED = object()
+
+# One response shared by every output of a command
+class ResponseView:
+    """
+    Wrap a requests.Response so the body is read, decoded to text and parsed
+    as JSON at most once, however many outputs (display, --output,
+    --save-request) use it. Anything else is looked up on the response.
+    """
+
+    def __init__(self, response: requests.Response):
+        self.response = response
+        self._text: str | None = None
+        self._json = _UNPARSED
+        self._json_error: ValueError | None = None
+
+    @classmethod
+    def of(cls, response: "requests.Response | ResponseView") -> "ResponseView":
+        """Wrap `response` unless it already is a view."""
+        return response if isinstance(response, cls) else cls(response)
+
+    def __getattr__(self, name: str):
+        return getattr(self.response, name)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the body has been read into memory (a streamed body is not)."""
+        return self.response._content is not False
+
+    @property
+    def content(self) -> bytes:
+        """Raw body bytes; requests keeps them after the first read."""
+        return self.response.content
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    @property
+    def text(self) -> str:
+        """Body decoded with the response charset, detected once when none is declared."""
+        if self._text is None:
+            self._text = self.response.text
+        return self._text
+
+    def json(self):
+        """Parsed JSON body; a body that is not JSON raises the same ValueError every time."""
+        if self._json is _UNPARSED:
+            try:
+                self._json = responseJson(self)
+            except ValueError as e:
+                self._json, self._json_error = None, e
+        if self._json_error is not None:
+            raise self._json_error
+        return self._json
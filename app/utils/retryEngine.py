@@ -0,0 +1,167 @@
+import time
+import random
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from .ui import TextDisplay
+from .compression import CompressedBody
+from .deadline import Deadline, DeadlineExceeded
+
+# Status codes retried by default
+RETRY_ON_STATUS = (429, 502, 503, 504)
+
+# Methods that may be repeated without changing the outcome (RFC 9110)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "TRACE", "PUT", "DELETE"})
+
+# Failures worth another attempt; other errors (invalid URL, TLS verification, ...) are final
+RETRY_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError)
+
+# Retry settings shared by every command
+@dataclass
+class RetryPolicy:
+    retries: int = 0
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    max_retry_after: float = 120.0      # longer Retry-After waits give up instead of sleeping
+    max_time: float | None = None
+    retry_on: frozenset = frozenset(RETRY_ON_STATUS)
+    retry_non_idempotent: bool = False
+
+    def allows(self, method: str | None) -> bool:
+        """Whether requests with this method may be repeated."""
+        return self.retry_non_idempotent or (method or "GET").upper() in IDEMPOTENT_METHODS
+
+    def delay(self, attempt: int, response: requests.Response | None = None) -> float:
+        """Retry-After when the server sent one, otherwise exponential backoff with full jitter."""
+        if response is not None:
+            retry_after = parseRetryAfter(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+# Build a policy from the command line options
+def retryPolicyFromOptions(
+    retries: int = 0,
+    backoff: float = 0.5,
+    max_time: float | None = None,
+    retry_on: str | None = None,
+    retry_non_idempotent: bool = False
+) -> RetryPolicy | None:
+    """Return a RetryPolicy, or None when retries are disabled."""
+    if not retries:
+        return None
+
+    statuses = RETRY_ON_STATUS
+    if retry_on:
+        try:
+            statuses = tuple(int(code) for code in retry_on.split(",") if code.strip())
+        except ValueError:
+            raise ValueError(f"Invalid --retry-on value '{retry_on}'. Use comma separated status codes, e.g. 429,503")
+
+    return RetryPolicy(
+        retries=retries,
+        backoff=backoff,
+        max_time=max_time,
+        retry_on=frozenset(statuses),
+        retry_non_idempotent=retry_non_idempotent
+    )
+
+# Seconds to wait from a Retry-After header (delta seconds or HTTP date)
+def parseRetryAfter(value: str | None) -> float | None:
+    """Parse Retry-After into seconds from now, or None if absent or invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+# Remember where a request body starts so it can be sent again
+def _bodyCheckpoint(body) -> tuple[bool, object, int | None]:
+    """Return (replayable, stream, position) for a prepared request body."""
+    stream = body.source if isinstance(body, CompressedBody) else body
+    if stream is None or isinstance(stream, (bytes, str)):
+        return True, None, None
+    if hasattr(stream, "seek") and hasattr(stream, "tell"):
+        try:
+            return True, stream, stream.tell()
+        except OSError:
+            return False, None, None
+    # A generator or other one-shot iterable cannot be replayed
+    return False, None, None
+
+# Send a prepared request, retrying transient failures
+def sendWithRetry(
+    send,
+    prepared: requests.PreparedRequest,
+    retry: RetryPolicy | None = None,
+    deadline: Deadline | None = None,
+    **kwargs
+) -> requests.Response:
+    """
+    Send `prepared` with `send(prepared, **kwargs)` and retry
+    connection errors and `retry.retry_on` statuses up to `retry.retries`
+    times, sleeping per RetryPolicy.delay. Non-idempotent methods are only
+    retried when the policy allows it, seekable bodies are rewound between
+    attempts, and no attempt starts after `retry.max_time` seconds, when
+    the wait would outlast `deadline`, which every attempt shares, or when
+    Retry-After asks for more than `retry.max_retry_after` seconds.
+    """
+    if deadline is not None:
+        kwargs["deadline"] = deadline
+
+    if retry is None or retry.retries <= 0 or not retry.allows(prepared.method):
+        return send(prepared, **kwargs)
+
+    replayable, stream, position = _bodyCheckpoint(prepared.body)
+    started = time.monotonic()
+    attempt = 0
+
+    while True:
+        response, error = None, None
+        try:
+            response = send(prepared, **kwargs)
+            if response.status_code not in retry.retry_on:
+                return response
+            reason = f"status {response.status_code}"
+        except (requests.exceptions.SSLError, DeadlineExceeded):
+            # Certificate problems do not go away on their own, and the time budget is spent
+            raise
+        except RETRY_ERRORS as e:
+            error = e
+            reason = type(e).__name__
+
+        delay = retry.delay(attempt, response)
+        remaining = deadline.remaining() if deadline is not None else None
+        out_of_time = retry.max_time is not None and time.monotonic() - started + delay > retry.max_time
+        out_of_deadline = remaining is not None and delay >= remaining
+        # Backoff never gets this long, so only a Retry-After header can ask for it
+        too_long = delay > retry.max_retry_after
+
+        if attempt >= retry.retries or out_of_time or out_of_deadline or too_long or not replayable:
+            if not replayable:
+                TextDisplay.warn_text("Request body cannot be replayed; not retrying.")
+            elif out_of_time and attempt < retry.retries:
+                TextDisplay.warn_text(f"Retry time limit of {retry.max_time}s reached; giving up.")
+            elif out_of_deadline and attempt < retry.retries:
+                TextDisplay.warn_text(f"Not enough time left before --max-time {deadline.max_time}s for another attempt; giving up.")
+            elif too_long and attempt < retry.retries:
+                TextDisplay.warn_text(f"Server asked to wait {delay:.0f}s (Retry-After), more than {retry.max_retry_after:.0f}s; giving up.")
+            if error is not None:
+                raise error
+            return response
+
+        if response is not None:
+            response.close()
+
+        attempt += 1
+        TextDisplay.warn_text(f"Attempt {attempt} failed ({reason}); retrying in {delay:.2f}s ({attempt}/{retry.retries})")
+        time.sleep(delay)
+
+        if stream is not None:
+            stream.seek(position)
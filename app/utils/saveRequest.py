@@ -1,23 +1,22 @@
-import json
 import requests
 
 from app.utils import TextDisplay
+from .responseView import ResponseView
+from .httpEngine import bodyText
+from .jsonCodec import jsonDump
 
 # Helper Function to save Response in file
-def saveRequestResponse(response: requests.Response, filename: str="request.response.json"):
+def saveRequestResponse(response: requests.Response | ResponseView, filename: str="request.response.json"):
     """Save the request and response details to a file in JSON format."""
 
     try:
+        response = ResponseView.of(response)
         data = {
             "request": {
                 "method": response.request.method,
                 "url": response.request.url,
                 "headers": dict(response.request.headers),
-                "body": (
-                    response.request.body.decode("utf-8")
-                    if isinstance(response.request.body, bytes)
-                    else response.request.body
-                ),
+                "body": bodyText(response.request.body),
             },
             "response": {
                 "status_code": response.status_code,
@@ -26,8 +25,13 @@ def saveRequestResponse(response: requests.Response, filename: str="request.resp
             },
         }
 
+        # Performance profile of the exchange (after the body was read above)
+        timing = getattr(response, "timing", None)
+        if timing is not None:
+            data["timing"] = timing.report(response)
+
         with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+            jsonDump(data, f, indent=4)
         TextDisplay.success_text(f"Request and response saved to {filename}")
 
     except Exception as e:
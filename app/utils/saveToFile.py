@@ -1,28 +1,167 @@
-import json
+import os
 import requests
+from pathlib import Path
 
 from app.utils import TextDisplay
+from .jsonCodec import jsonLoad, jsonDump
+from .responseView import ResponseView
+from .deadline import PARTIAL_FILE_EXIT_CODE, exitCode
+
+# Size of the chunks written to disk while streaming a download
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Temporary sibling file used until a download is complete
+def partialPath(file_path: str | Path) -> Path:
+    """Return the '.part' path a download is written to before the final rename."""
+    target = Path(file_path)
+    return target.with_name(target.name + ".part")
+
+# Sidecar file holding the validators of a partial download
+def partialMetaPath(file_path: str | Path) -> Path:
+    """Return the path of the metadata kept next to a '.part' download."""
+    part = partialPath(file_path)
+    return part.with_name(part.name + ".meta")
+
+# Remove a partial download and its metadata
+def discardPartialDownload(file_path: str | Path):
+    """Delete the '.part' file and its metadata, if present."""
+    partialPath(file_path).unlink(missing_ok=True)
+    partialMetaPath(file_path).unlink(missing_ok=True)
+
+# Record validators so an interrupted download can be resumed
+def _writePartialMeta(file_path: str | Path, response: requests.Response):
+    total = response.headers.get("Content-Length")
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+
+    meta = {
+        "url": response.url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "total_size": int(total) if total and total.isdigit() else None
+    }
+    with open(partialMetaPath(file_path), "w", encoding="utf-8") as f:
+        jsonDump(meta, f)
+
+# Range headers to resume a partial download
+def resumeHeaders(file_path: str | Path) -> tuple[int, dict]:
+    """
+    Return the byte offset to resume from and the Range/If-Range headers
+    for it. (0, {}) means there is nothing to resume.
+    """
+    part = partialPath(file_path)
+    if not part.exists() or part.stat().st_size == 0:
+        return 0, {}
+
+    offset = part.stat().st_size
+
+    # Byte offsets refer to the unencoded body, so ask for it uncompressed
+    headers = {"Range": f"bytes={offset}-", "Accept-Encoding": "identity"}
+
+    meta = {}
+    meta_path = partialMetaPath(file_path)
+    if meta_path.exists():
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = jsonLoad(f)
+        except (OSError, ValueError):
+            meta = {}
+
+    # Strong ETag first, Last-Modified otherwise; the server sends the full body if they changed
+    etag = meta.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["If-Range"] = etag
+    elif meta.get("last_modified"):
+        headers["If-Range"] = meta["last_modified"]
+    else:
+        TextDisplay.warn_text("No validators saved for the partial download; resuming without If-Range.")
+
+    return offset, headers
+
+# Start offset announced by a 206 response
+def _rangeStart(response: requests.Response) -> int | None:
+    content_range = response.headers.get("Content-Range", "")
+    try:
+        unit, spec = content_range.split(" ", 1)
+        if unit.strip().lower() != "bytes":
+            return None
+        return int(spec.split("-", 1)[0])
+    except ValueError:
+        return None
+
+# Re-write a JSON file pretty printed
+def prettyPrintJsonFile(file_path: Path):
+    """Parse a downloaded JSON file and rewrite it with indentation."""
+    with open(file_path, "rb") as f:
+        data = jsonLoad(f)
+
+    pretty_path = file_path.with_name(file_path.name + ".json")
+    with open(pretty_path, "wb") as f:
+        jsonDump(data, f, indent=4)
+    os.replace(pretty_path, file_path)
 
 # Helper function to save response to file
-def saveResponseToFile(response: requests.Response, file_path: str, format: str = "json"):
-    """Save the response content to a file in either JSON or raw format."""
+def saveResponseToFile(response: requests.Response | ResponseView, file_path: str, format: str = "raw", resume_from: int = 0):
+    """
+    Stream the response body to a file in fixed-size chunks, then atomically
+    move it into place. The 'json' format pretty prints the file afterwards,
+    or directly when the body was already read for display.
+    With `resume_from`, a 206 response is appended to the existing '.part'
+    file; any other status rewrites it from the start.
+    """
+    response = ResponseView.of(response)
+    temp_path = partialPath(file_path)
 
     try:
         if format not in ["json", "raw"]:
             raise ValueError("Unsupported format. Use 'json' or 'raw'.")
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            if format == "json":
-                if 'application/json' not in response.headers.get('Content-Type', ''):
-                    raise ValueError("Response content is not in JSON format.")
-                json.dump(response.json(), f, indent=4)
+        if format == "json" and 'application/json' not in response.headers.get('Content-Type', ''):
+            raise ValueError("Response content is not in JSON format.")
+
+        # Append only when the server honoured the range request
+        mode = "wb"
+        if resume_from and response.status_code == 206:
+            if _rangeStart(response) != resume_from:
+                raise ValueError(f"Server returned an unexpected range: {response.headers.get('Content-Range')}")
+            mode = "ab"
+            TextDisplay.info_text(f"Resuming download at byte {resume_from}")
+        elif resume_from:
+            TextDisplay.warn_text("Server ignored the range request; downloading the full response.")
+
+        if mode == "wb":
+            _writePartialMeta(file_path, response)
+
+        # A body already in memory is parsed once and written pretty printed
+        pretty_written = format == "json" and mode == "wb" and response.loaded
+        with open(temp_path, mode) as f:
+            if pretty_written:
+                jsonDump(response.json(), f, indent=4)
             else:
-                f.write(response.text)
-        
+                # iter_content streams an unread body and re-slices one that was already read
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+
+        # Optional post-step, only for the json format
+        if format == "json" and not pretty_written:
+            prettyPrintJsonFile(temp_path)
+
+        os.replace(temp_path, file_path)
+        partialMetaPath(file_path).unlink(missing_ok=True)
         TextDisplay.success_text(f"Response saved to {file_path}", style="white")
-    
+
     except ValueError as ve:
+        discardPartialDownload(file_path)
         raise SystemExit(TextDisplay.error_text(str(ve)))
-    
+
+    except requests.exceptions.RequestException as rqe:
+        # Keep the partial file so the download can be resumed
+        TextDisplay.error_text(
+            f"Download interrupted: {rqe}\nPartial data kept in {temp_path}; run again with --continue to resume."
+        )
+        raise SystemExit(exitCode(rqe, PARTIAL_FILE_EXIT_CODE))
+
     except Exception as e:
-        raise SystemExit(TextDisplay.error_text(f"Error saving response to file: {e}"))
\ No newline at end of file
+        discardPartialDownload(file_path)
+        raise SystemExit(TextDisplay.error_text(f"Error saving response to file: {e}"))
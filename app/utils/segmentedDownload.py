@@ -0,0 +1,153 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .ui import TextDisplay
+from .httpEngine import getSession, sendPrepared
+from .retryEngine import RetryPolicy
+from .deadline import PARTIAL_FILE_EXIT_CODE, Deadline, exitCode
+from .saveToFile import DOWNLOAD_CHUNK_SIZE, partialPath, prettyPrintJsonFile, discardPartialDownload
+
+# Smallest byte range worth its own connection
+MIN_SEGMENT_SIZE = 1024 * 1024
+
+# Total size announced by a 206 Content-Range header
+def _totalSize(response: requests.Response) -> int | None:
+    content_range = response.headers.get("Content-Range", "")
+    total = content_range.rsplit("/", 1)[-1] if "/" in content_range else ""
+    return int(total) if total.isdigit() else None
+
+# Split [0, total) into contiguous (start, end) ranges, end inclusive
+def splitRanges(total: int, segments: int) -> list[tuple[int, int]]:
+    """Split `total` bytes into at most `segments` ranges of at least MIN_SEGMENT_SIZE."""
+    segments = max(1, min(segments, total // MIN_SEGMENT_SIZE or 1))
+    size, extra = divmod(total, segments)
+    ranges = []
+    start = 0
+    for index in range(segments):
+        length = size + (1 if index < extra else 0)
+        ranges.append((start, start + length - 1))
+        start += length
+    return ranges
+
+# Fetch one byte range and write it at its offset
+def _fetchSegment(
+    prepared: requests.PreparedRequest,
+    file_path,
+    start: int,
+    end: int,
+    validator: str | None,
+    retry: RetryPolicy | None = None,
+    deadline: Deadline | None = None
+) -> int:
+    segment = prepared.copy()
+    segment.headers["Range"] = f"bytes={start}-{end}"
+    if validator:
+        segment.headers["If-Range"] = validator
+
+    response = sendPrepared(segment, stream=True, retry=retry, deadline=deadline)
+    try:
+        if response.status_code != 206:
+            raise ValueError(f"Segment {start}-{end} returned status {response.status_code} instead of 206")
+        if not response.headers.get("Content-Range", "").startswith(f"bytes {start}-"):
+            raise ValueError(f"Segment {start}-{end} returned range {response.headers.get('Content-Range')}")
+
+        # Own handle per segment, positioned at the segment offset
+        written = 0
+        with open(file_path, "r+b") as f:
+            f.seek(start)
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if written + len(chunk) > end - start + 1:
+                    raise ValueError(f"Segment {start}-{end} returned more data than requested")
+                f.write(chunk)
+                written += len(chunk)
+
+        if written != end - start + 1:
+            raise ValueError(f"Segment {start}-{end} is incomplete ({written} bytes)")
+        return written
+
+    finally:
+        response.close()
+
+# Parallel ranged download into a preallocated file
+def segmentedDownload(
+    request: requests.Request,
+    file_path: str,
+    segments: int,
+    format: str = "raw",
+    retry: RetryPolicy | None = None,
+    deadline: Deadline | None = None
+) -> requests.Response | None:
+    """
+    Probe the server with a one byte range request. When ranges are supported,
+    download `segments` byte ranges in parallel into a preallocated '.part'
+    file, verify its size and move it into place, returning None. Otherwise
+    return the probe response so the caller can save it as a single stream.
+    """
+    if format not in ["json", "raw"]:
+        raise SystemExit(TextDisplay.error_text("Unsupported format. Use 'json' or 'raw'."))
+
+    prepared = getSession().prepare_request(request)
+
+    # Byte offsets refer to the unencoded body
+    prepared.headers["Accept-Encoding"] = "identity"
+
+    probe = prepared.copy()
+    probe.headers["Range"] = "bytes=0-0"
+    response = sendPrepared(probe, stream=True, retry=retry, deadline=deadline)
+
+    total = _totalSize(response) if response.status_code == 206 else None
+    if response.status_code >= 400 or total is None:
+        if response.status_code < 400:
+            TextDisplay.warn_text("Server does not support range requests; downloading as a single stream.")
+        # A server that ignored the range already sent the full body
+        return response
+
+    response.close()
+
+    if format == "json" and 'application/json' not in response.headers.get('Content-Type', ''):
+        raise SystemExit(TextDisplay.error_text("Response content is not in JSON format."))
+
+    etag = response.headers.get("ETag")
+    validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+    ranges = splitRanges(total, segments)
+
+    temp_path = partialPath(file_path)
+    started = time.perf_counter()
+
+    try:
+        # Preallocate so every segment can write at its own offset
+        with open(temp_path, "wb") as f:
+            f.truncate(total)
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [
+                pool.submit(_fetchSegment, prepared, temp_path, start, end, validator, retry, deadline)
+                for start, end in ranges
+            ]
+            received = sum(future.result() for future in futures)
+
+        # Verify the assembled file before it replaces the target
+        if received != total or os.path.getsize(temp_path) != total:
+            raise ValueError(f"Assembled size {os.path.getsize(temp_path)} does not match expected {total} bytes")
+
+        if format == "json":
+            prettyPrintJsonFile(temp_path)
+
+        os.replace(temp_path, file_path)
+
+    except (ValueError, OSError) as e:
+        discardPartialDownload(file_path)
+        raise SystemExit(TextDisplay.error_text(f"Segmented download failed: {e}"))
+
+    except requests.exceptions.RequestException as e:
+        discardPartialDownload(file_path)
+        TextDisplay.error_text(f"Segmented download failed: {e}")
+        raise SystemExit(exitCode(e, PARTIAL_FILE_EXIT_CODE))
+
+    elapsed = time.perf_counter() - started
+    TextDisplay.style_text(f"Downloaded {total} bytes in {len(ranges)} segments ({elapsed:.2f}s).", style="white")
+    TextDisplay.success_text(f"Response saved to {file_path}", style="white")
+    return None
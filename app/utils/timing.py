@@ -0,0 +1,366 @@
+import sys
+import time
+import socket
+import threading
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NameResolutionError, ConnectTimeoutError, NewConnectionError
+from urllib3.util import connection
+
+from .ui import TextDisplay, TableDisplay, getConsole
+from .deadline import activeDeadline
+from .jsonCodec import jsonDumps
+
+# Timing of the request currently being sent on this thread
+_current = threading.local()
+
+# Phase timestamps of one request, in the spirit of curl's -w variables
+class RequestTiming:
+    """
+    perf_counter timestamps recorded by the instrumented connection classes
+    while a request is sent. Reused connections skip the DNS, connect and
+    TLS marks, which then report the previous phase like curl does.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.namelookup = None
+        self.connect = None
+        self.appconnect = None
+        self.pretransfer = None
+        self.starttransfer = None
+        self.end = None
+        self.num_connects = 0
+        self.bytes_sent = 0
+        self.header_bytes = 0
+        self.remote_ip = None
+        self.remote_port = None
+
+    def mark(self, phase: str):
+        setattr(self, phase, time.perf_counter())
+
+    def finish(self):
+        """Record the end of the transfer, once."""
+        if self.end is None:
+            self.mark("end")
+
+    def watchBody(self, raw):
+        """
+        Wrap the body reads of the urllib3 response `raw` so the end is
+        stamped when the last byte arrives, not when the report is printed
+        after pycurl rendered or saved the body.
+        """
+        for name in ("read", "read1"):
+            read = getattr(raw, name, None)
+            if read is None:
+                continue
+
+            def timedRead(*args, _read=read, **kwargs):
+                data = _read(*args, **kwargs)
+                if not data or raw.closed:
+                    self.finish()
+                return data
+
+            setattr(raw, name, timedRead)
+
+        # Chunked bodies are read by read_chunked, which bypasses read
+        read_chunked = getattr(raw, "read_chunked", None)
+        if read_chunked is not None:
+            def timedReadChunked(*args, **kwargs):
+                yield from read_chunked(*args, **kwargs)
+                self.finish()
+
+            raw.read_chunked = timedReadChunked
+
+    def _since(self, value: float | None, fallback: float = 0.0) -> float:
+        return value - self.start if value is not None else fallback
+
+    def report(self, response: requests.Response | None = None) -> dict:
+        """
+        curl style variables (seconds, cumulative from the start of the
+        request). A body that was not read to the end reports no transfer time.
+        """
+        namelookup = self._since(self.namelookup)
+        connect = self._since(self.connect, namelookup)
+        appconnect = self._since(self.appconnect)
+        pretransfer = self._since(self.pretransfer, max(connect, appconnect))
+        starttransfer = self._since(self.starttransfer, pretransfer)
+        total = self._since(self.end, starttransfer)
+
+        # Bytes read off the wire (still compressed, like curl's size_download)
+        try:
+            size_download = response.raw.tell() if response is not None else 0
+        except (AttributeError, ValueError, OSError):
+            size_download = 0
+        size_upload = self.bytes_sent - self.header_bytes
+
+        values = {
+            "time_namelookup": namelookup,
+            "time_connect": connect,
+            "time_appconnect": appconnect,
+            "time_pretransfer": pretransfer,
+            "time_starttransfer": starttransfer,
+            "time_total": total,
+            "size_request": self.header_bytes,
+            "size_upload": size_upload,
+            "size_download": size_download,
+            "speed_download": int(size_download / total) if total else 0,
+            "speed_upload": int(size_upload / total) if total else 0,
+            "num_connects": self.num_connects,
+            "remote_ip": self.remote_ip or "",
+            "remote_port": self.remote_port or 0,
+        }
+        if response is not None:
+            values.update({
+                "http_code": response.status_code,
+                "method": response.request.method if response.request else "",
+                "url_effective": response.url,
+                "content_type": response.headers.get("Content-Type", ""),
+            })
+        return values
+
+def _currentTiming() -> RequestTiming | None:
+    return getattr(_current, "timing", None)
+
+# getaddrinfo bounded by the connect timeout (the resolver ignores socket timeouts)
+def _resolve(host: str, port: int, timeout) -> list:
+    if not isinstance(timeout, (int, float)):
+        return socket.getaddrinfo(host, port, connection.allowed_gai_family(), socket.SOCK_STREAM)
+
+    result = {}
+
+    def lookup():
+        try:
+            result["addresses"] = socket.getaddrinfo(host, port, connection.allowed_gai_family(), socket.SOCK_STREAM)
+        except OSError as e:
+            result["error"] = e
+
+    # A daemon thread, so a hung lookup cannot keep the process alive
+    thread = threading.Thread(target=lookup, name="pycurl-resolve", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise socket.timeout(f"DNS lookup of {host} timed out")
+    if "error" in result:
+        raise result["error"]
+    return result["addresses"]
+
+# Instrumentation shared by the plain and TLS connection classes
+class _TimingMixin:
+
+    def _new_conn(self) -> socket.socket:
+        timing = _currentTiming()
+        if timing is None:
+            return super()._new_conn()
+
+        timing.num_connects += 1
+        try:
+            # Resolve separately so the lookup can be timed, then connect to each address in turn
+            addresses = _resolve(self._dns_host, self.port, self.timeout)
+            timing.mark("namelookup")
+
+            error = None
+            for *_, sockaddr in addresses:
+                try:
+                    sock = connection.create_connection(
+                        sockaddr[:2],
+                        self.timeout,
+                        source_address=self.source_address,
+                        socket_options=self.socket_options,
+                    )
+                    break
+                except OSError as e:
+                    error = e
+            else:
+                raise error or OSError(f"No address found for {self.host}")
+
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        except socket.timeout as e:
+            raise ConnectTimeoutError(
+                self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})"
+            ) from e
+        except OSError as e:
+            raise NewConnectionError(self, f"Failed to establish a new connection: {e}") from e
+
+        timing.mark("connect")
+        sys.audit("http.client.connect", self, self.host, self.port)
+        return sock
+
+    def connect(self):
+        super().connect()
+        timing = _currentTiming()
+        if timing is not None:
+            if isinstance(self, HTTPSConnection):
+                timing.mark("appconnect")
+            timing.mark("pretransfer")
+            self._recordPeer(timing)
+
+    def _recordPeer(self, timing: RequestTiming):
+        try:
+            timing.remote_ip, timing.remote_port = self.sock.getpeername()[:2]
+        except (OSError, AttributeError, TypeError):
+            pass
+
+    def request(self, method, url, body=None, headers=None, **kwargs):
+        timing = _currentTiming()
+        # A connection that is already open was reused from the pool
+        if timing is not None and self.sock is not None and timing.pretransfer is None:
+            timing.mark("pretransfer")
+            self._recordPeer(timing)
+        return super().request(method, url, body=body, headers=headers, **kwargs)
+
+    def send(self, data):
+        timing = _currentTiming()
+        if timing is not None and hasattr(data, "__len__"):
+            timing.bytes_sent += len(data)
+
+        # Uploads stop when the --max-time deadline passes
+        deadline = activeDeadline()
+        if deadline is None:
+            return super().send(data)
+        deadline.tighten(self.sock)
+        with deadline.watch(self.sock):
+            return super().send(data)
+
+    def endheaders(self, *args, **kwargs):
+        timing = _currentTiming()
+        sent = timing.bytes_sent if timing is not None else 0
+        result = super().endheaders(*args, **kwargs)
+        if timing is not None:
+            timing.header_bytes += timing.bytes_sent - sent
+        return result
+
+    def getresponse(self, *args, **kwargs):
+        # Waiting for the status line gets only the time left (applied to the socket by urllib3)
+        deadline = activeDeadline()
+        if deadline is not None:
+            remaining = deadline.check()
+            if remaining is not None:
+                self.timeout = remaining
+            with deadline.watch(self.sock):
+                response = super().getresponse(*args, **kwargs)
+        else:
+            response = super().getresponse(*args, **kwargs)
+        timing = _currentTiming()
+        if timing is not None:
+            # The status line and headers have arrived
+            timing.mark("starttransfer")
+        return response
+
+class TimedHTTPConnection(_TimingMixin, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(_TimingMixin, HTTPSConnection):
+    pass
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+# Adapter that attaches a RequestTiming to every response
+class TimingAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools use the instrumented connection classes."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        timing = RequestTiming()
+        _current.timing = timing
+        try:
+            response = super().send(request, *args, **kwargs)
+        finally:
+            _current.timing = None
+        response.timing = timing
+        timing.watchBody(response.raw)
+        return response
+
+# Expand a curl style --write-out format
+def formatWriteOut(format_string: str, values: dict) -> str:
+    """Replace %{variable} placeholders and backslash escapes in a -w format."""
+    if format_string.startswith("@"):
+        format_string = Path(format_string[1:]).read_text(encoding="utf-8")
+
+    output = []
+    index = 0
+    while index < len(format_string):
+        char = format_string[index]
+
+        if char == "%" and format_string.startswith("%{", index):
+            close = format_string.find("}", index)
+            if close != -1:
+                name = format_string[index + 2:close]
+                if name == "json":
+                    output.append(jsonDumps(values))
+                elif name in values:
+                    value = values[name]
+                    output.append(f"{value:.6f}" if isinstance(value, float) else str(value))
+                else:
+                    TextDisplay.warn_text(f"Unknown --write-out variable: {name}")
+                index = close + 1
+                continue
+
+        if char == "%" and format_string.startswith("%%", index):
+            output.append("%")
+            index += 2
+            continue
+
+        if char == "\\" and index + 1 < len(format_string):
+            escape = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\"}.get(format_string[index + 1])
+            if escape is not None:
+                output.append(escape)
+                index += 2
+                continue
+
+        output.append(char)
+        index += 1
+
+    return "".join(output)
+
+# Print the timing breakdown and/or the --write-out line for a response
+def reportTiming(response: requests.Response, show_timing: bool = False, write_out: str | None = None):
+    """Report the timing of a finished response."""
+    timing = getattr(response, "timing", None)
+    if timing is None:
+        TextDisplay.warn_text("No timing available: the response was not received over the network.")
+        return
+
+    values = timing.report(response)
+
+    if show_timing:
+        phases = [
+            ("DNS lookup", 0.0, values["time_namelookup"]),
+            ("TCP connect", values["time_namelookup"], values["time_connect"]),
+            ("TLS handshake", values["time_connect"], values["time_appconnect"] or values["time_connect"]),
+            ("Server processing", values["time_pretransfer"], values["time_starttransfer"]),
+            ("Content transfer", values["time_starttransfer"], values["time_total"]),
+        ]
+        table = TableDisplay(title="Timing", columns=["Phase", "Duration (ms)", "Elapsed (ms)"], style="white")
+        for phase, started, ended in phases:
+            table.add_row([phase, f"{max(0.0, ended - started) * 1000:.3f}", f"{ended * 1000:.3f}"])
+        table.add_row(["Total", "", f"{values['time_total'] * 1000:.3f}"], style="cyan")
+        table.show()
+
+        connection_note = "new connection" if values["num_connects"] else "reused connection"
+        TextDisplay.style_text(
+            f"Sent {values['size_request'] + values['size_upload']} bytes, received {values['size_download']} bytes "
+            f"({values['remote_ip']}:{values['remote_port']}, {connection_note})",
+            style="white"
+        )
+
+    if write_out:
+        # The console stream, so the variables never end up inside a raw body on stdout
+        out = getConsole().file
+        out.write(formatWriteOut(write_out, values))
+        out.flush()
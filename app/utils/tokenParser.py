@@ -1,78 +1,230 @@
 from pathlib import Path
 from typing import Dict
+from collections.abc import Mapping
 
 from .configParser import (
     CONFIG_PATH,
-    loadAndValidateConfig, 
-    extractConfigAttributes, 
+    ConfigContext,
+    getConfigContext,
     InvalidConfig
 )
+from .atomicFile import atomicWrite
+from .jsonCodec import jsonLoad, jsonDumpBytes
 
 
-# Parse token alias file into {alias: token}
-def parse_token_file(token_file: Path) -> Dict[str, str]:
-
+# Scan a token alias file into ({alias: (start, end)}, {alias: token})
+def _scanTokenFile(token_file: Path) -> tuple[Dict[str, tuple[int, int]], Dict[str, str]]:
+    """Validate the file; offsets are the byte range of each token in it."""
     if not token_file.exists():
         raise InvalidConfig(f"Token file not found at {token_file}")
 
+    offsets: Dict[str, tuple[int, int]] = {}
     tokens: Dict[str, str] = {}
 
-    with open(token_file, "r", encoding="utf-8") as f:
-        for lineno, line in enumerate(f, start=1):
-            line = line.strip()
+    with open(token_file, "rb") as f:
+        data = f.read()
+
+    position = 0
+    for lineno, raw in enumerate(data.splitlines(keepends=True), start=1):
+        line_start = position
+        position += len(raw)
+        text = raw.decode("utf-8")
+        line = text.strip()
 
-            # Ignore comments & empty lines
-            if not line or line.startswith("#"):
-                continue
-            
-            if ":" not in line:
-                raise InvalidConfig(
-                    f"Invalid token format at line {lineno}: {line}"
-                )
+        # Ignore comments & empty lines
+        if not line or line.startswith("#"):
+            continue
+
+        if ":" not in line:
+            raise InvalidConfig(
+                f"Invalid token format at line {lineno}: {line}"
+            )
 
-            alias, token = line.split(":", 1)
+        alias, value = text.split(":", 1)
 
-            alias = alias.strip()
-            token = token.strip()
+        alias = alias.strip()
+        value = value.lstrip()
+        token = value.rstrip()
 
-            if not alias or not token:
-                raise InvalidConfig(
-                    f"Empty alias or token at line {lineno}"
-                )
+        if not alias or not token:
+            raise InvalidConfig(
+                f"Empty alias or token at line {lineno}"
+            )
 
-            if alias in tokens:
-                raise InvalidConfig(
-                    f"Duplicate alias '{alias}' at line {lineno}"
-                )
+        if alias in tokens:
+            raise InvalidConfig(
+                f"Duplicate alias '{alias}' at line {lineno}"
+            )
 
-            tokens[alias] = token
-    
-    return tokens
+        # Character counts are byte counts unless the line has non-ASCII text
+        prefix_length = len(text) - len(value)
+        token_length = len(token)
+        if not raw.isascii():
+            prefix_length = len(text[:prefix_length].encode("utf-8"))
+            token_length = len(token.encode("utf-8"))
+        offsets[alias] = (line_start + prefix_length, line_start + prefix_length + token_length)
+        tokens[alias] = token
 
-# Resolve token alias into actual token
-def resolve_token(alias: str = "", config_path: Path = CONFIG_PATH) -> str:
-    config = loadAndValidateConfig(config_path)
-    token_file, _, default_token = extractConfigAttributes(config)
+    return offsets, tokens
 
-    tokens = parse_token_file(token_file)
+# Parse token alias file into {alias: token}
+def parse_token_file(token_file: Path) -> Dict[str, str]:
+    return _scanTokenFile(token_file)[1]
+
+# On-disk alias index, next to the config file
+TOKEN_INDEX_PATH = CONFIG_PATH.parent / "tokens.index.json"
+
+# Bumped whenever the index layout changes
+_TOKEN_INDEX_VERSION = 1
+
+# Read-only {alias: token} view of a token file
+class TokenIndex(Mapping):
+    """
+    Alias -> token mapping backed by the byte offset of every token, so a
+    lookup reads one token from the file instead of parsing all of them.
+    """
+
+    def __init__(self, token_file: Path, offsets: Dict[str, tuple[int, int]], tokens: Dict[str, str] | None = None):
+        self.token_file = token_file
+        self.offsets = offsets
+        self._tokens: Dict[str, str] = dict(tokens or {})
+
+    def __getitem__(self, alias: str) -> str:
+        token = self._tokens.get(alias)
+        if token is None:
+            start, end = self.offsets[alias]
+            with open(self.token_file, "rb") as f:
+                f.seek(start)
+                token = f.read(end - start).decode("utf-8")
+            self._tokens[alias] = token
+        return token
+
+    def __iter__(self):
+        return iter(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def items(self):
+        """All (alias, token) pairs, reading the file once."""
+        if len(self._tokens) < len(self.offsets):
+            with open(self.token_file, "rb") as f:
+                data = f.read()
+            self._tokens = {alias: data[start:end].decode("utf-8") for alias, (start, end) in self.offsets.items()}
+        return self._tokens.items()
+
+# Token indexes of this process: {path: ((mtime_ns, size), index)}
+_token_indexes: Dict[Path, tuple[tuple[int, int], TokenIndex]] = {}
+
+# Read the on-disk offsets if they were built from this exact file
+def _readTokenIndex(index_path: Path, token_file: Path, signature: tuple[int, int]) -> Dict[str, tuple[int, int]] | None:
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = jsonLoad(f)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(index, dict)
+        or index.get("version") != _TOKEN_INDEX_VERSION
+        or index.get("path") != str(token_file)
+        or [index.get("mtime_ns"), index.get("size")] != list(signature)
+        or not isinstance(index.get("aliases"), list)
+        or not isinstance(index.get("offsets"), list)
+        or len(index["offsets"]) != 2 * len(index["aliases"])
+    ):
+        return None
+
+    # Flat [start, end, start, end, ...] loads much faster than one pair per alias
+    bounds = iter(index["offsets"])
+    return dict(zip(index["aliases"], zip(bounds, bounds)))
+
+# Write the offsets atomically, readable by the owner only
+def _writeTokenIndex(index_path: Path, token_file: Path, signature: tuple[int, int], offsets: Dict[str, tuple[int, int]]):
+    index = {
+        "version": _TOKEN_INDEX_VERSION,
+        "path": str(token_file),
+        "mtime_ns": signature[0],
+        "size": signature[1],
+        "aliases": list(offsets),
+        "offsets": [bound for bounds in offsets.values() for bound in bounds]
+    }
+    try:
+        atomicWrite(index_path, jsonDumpBytes(index))
+    except OSError:
+        # The index is only a shortcut; the token file stays the source of truth
+        pass
+
+# Alias -> token map of a token file, parsed at most once per change
+def loadTokenIndex(token_file: Path, index_path: Path = TOKEN_INDEX_PATH) -> TokenIndex:
+    """
+    Return the {alias: token} index of `token_file`. It is memoized for the
+    process and its offsets are persisted in `index_path`, both keyed on
+    the file's path, mtime and size, so the file is only re-parsed after
+    it changes.
+    """
+    # absolute() instead of resolve(): paths from the config are already resolved
+    token_file = Path(token_file).absolute()
+    try:
+        stat = token_file.stat()
+    except FileNotFoundError:
+        raise InvalidConfig(f"Token file not found at {token_file}")
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _token_indexes.get(token_file)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    offsets = _readTokenIndex(index_path, token_file, signature)
+    if offsets is not None:
+        index = TokenIndex(token_file, offsets)
+    else:
+        offsets, tokens = _scanTokenFile(token_file)
+        _writeTokenIndex(index_path, token_file, signature, offsets)
+        index = TokenIndex(token_file, offsets, tokens)
+
+    _token_indexes[token_file] = (signature, index)
+    return index
+
+# Forget the index after this process rewrote the token file
+def invalidateTokenIndex(token_file: Path | None = None, index_path: Path = TOKEN_INDEX_PATH):
+    """Drop the memoized and on-disk index (of `token_file`, or all of them)."""
+    if token_file is None:
+        _token_indexes.clear()
+    else:
+        _token_indexes.pop(Path(token_file).absolute(), None)
+    Path(index_path).unlink(missing_ok=True)
+
+# Look up a saved token in the configured token store
+def _savedRecord(context: ConfigContext, alias: str):
+    # Imported here: tokenStore builds on the index functions above
+    from .tokenStore import openTokenStore
+
+    default_token = context.default_token
+    store = openTokenStore(context)
 
-    # If alias explicitly provided
-    if alias and alias != "default":
-        if alias not in tokens:
+    if alias == "default":
+        if not default_token:
+            raise InvalidConfig("No token alias provided and no default_token set in config")
+        record = store.get(default_token)
+        if record is None:
+            raise InvalidConfig(f"Default token alias '{default_token}' not found")
+    else:
+        record = store.get(alias)
+        if record is None:
             raise InvalidConfig(f"Token alias '{alias}' not found")
-        return tokens[alias]
 
-    # Fallback to default token
-    if default_token and alias == "default":
-        if default_token not in tokens:
-            raise InvalidConfig(
-                f"Default token alias '{default_token}' not found"
-            )
-        return tokens[default_token]
+    if record.expired():
+        raise InvalidConfig(f"Token alias '{record.alias}' has expired")
+    return record
 
-    raise InvalidConfig(
-        "No token alias provided and no default_token set in config"
-    )
+# Resolve token alias into actual token
+def resolve_token(alias: str = "", config_path: Path = CONFIG_PATH) -> str:
+    if not alias:
+        raise InvalidConfig(
+            "No token alias provided and no default_token set in config"
+        )
+    return _savedRecord(getConfigContext(config_path), alias).token
 
 # Check if alias is correct or not
 def alias_validator(alias: str) -> bool:
@@ -81,23 +233,12 @@ def alias_validator(alias: str) -> bool:
     return True
 
 def getSavedToken(alias: str, config_path: Path = CONFIG_PATH) -> tuple[str, dict]:
-    config = loadAndValidateConfig(config_path)
-    token_file, token_type, default_token = extractConfigAttributes(config)
-    tokens = parse_token_file(token_file)
-    
-    headers = {}
+    context = getConfigContext(config_path)
+    record = _savedRecord(context, alias)
 
-    if alias == "default":
-        if default_token not in tokens:
-            raise InvalidConfig(f"Default token alias '{default_token}' not found in token file")
-        headers["Authorization"] = f"{token_type} {tokens[default_token]}"
-        return tokens[default_token], headers
-
-    if alias not in tokens:
-        raise InvalidConfig(f"Token alias '{alias}' not found")
-
-    headers["Authorization"] = f"{token_type} {tokens[alias]}"
-    return tokens[alias], headers
+    # A type stored with the token wins over the configured one
+    headers = {"Authorization": f"{record.token_type or context.token_type} {record.token}"}
+    return record.token, headers
 
 
 # Store the authentication token to a specified file
@@ -110,8 +251,7 @@ def storeTokenToFile(token: str, file_path: str):
         raise ValueError("No file path provided to store the token.")
 
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(token)
+        atomicWrite(Path(file_path), token)
     except Exception as e:
         raise RuntimeError(f"Error storing token to file: {e}")
 
@@ -123,40 +263,11 @@ def saveTokenToDefaultConfig(token: str, alias: str):
         raise ValueError(f"Invalid alias '{alias}'. Aliases cannot contain ':'.")
 
     try:
-        # Load config to find the token file path
-        config = loadAndValidateConfig(CONFIG_PATH) # using default global path
-        token_file, _, _ = extractConfigAttributes(config)
-
-        # Ensure directory exists
-        token_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        lines = []
-        if token_file.exists():
-            with open(token_file, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-        
-        updated = False
-        new_lines = []
-        for line in lines:
-            if line.strip().startswith("#") or not line.strip():
-                new_lines.append(line)
-                continue
-                
-            if ":" in line:
-                current_alias, _ = line.split(":", 1)
-                if current_alias.strip() == alias:
-                    new_lines.append(f"{alias}: {token}\n")
-                    updated = True
-                else:
-                    new_lines.append(line)
-            else:
-                new_lines.append(line)
-        
-        if not updated:
-            new_lines.append(f"{alias}: {token}\n")
-
-        with open(token_file, "w", encoding="utf-8") as f:
-            f.writelines(new_lines)
+        # Load config to find the token store
+        context = getConfigContext(CONFIG_PATH) # using default global path
+
+        from .tokenStore import openTokenStore
+        openTokenStore(context).set(alias, token)
 
     except Exception as e:
-        raise RuntimeError(f"Error saving token to default config: {e}")
\ No newline at end of file
+        raise RuntimeError(f"Error saving token to default config: {e}")
@@ -0,0 +1,309 @@
+import io
+import os
+import sys
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+from .configParser import ConfigContext, InvalidConfig
+from .tokenParser import loadTokenIndex, invalidateTokenIndex
+from .atomicFile import atomicWrite, updateFile
+
+# Seconds a writer waits for another process holding the database lock
+SQLITE_BUSY_TIMEOUT = 10.0
+
+# One table, keyed (and therefore indexed) by alias
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    alias TEXT PRIMARY KEY,
+    token TEXT NOT NULL,
+    token_type TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL
+) WITHOUT ROWID
+"""
+
+# Insert or replace one token, keeping its original created_at
+_SQLITE_UPSERT = """
+INSERT INTO tokens (alias, token, token_type, created_at, updated_at, expires_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (alias) DO UPDATE SET
+    token = excluded.token,
+    token_type = excluded.token_type,
+    updated_at = excluded.updated_at,
+    expires_at = excluded.expires_at
+"""
+
+# A saved token and the metadata its store keeps
+@dataclass
+class TokenRecord:
+    alias: str
+    token: str
+    token_type: str | None = None
+    created_at: float | None = None
+    expires_at: float | None = None
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and self.expires_at <= time.time()
+
+# Alias of an 'alias:token' line, None for comments, blank or malformed lines
+def _lineAlias(line: str) -> str | None:
+    stripped = line.strip()
+    if not stripped or stripped.startswith("#") or ":" not in stripped:
+        return None
+    return stripped.split(":", 1)[0].strip()
+
+# Tokens as 'alias:token' lines of a text file (the default store)
+class TextTokenStore:
+    """
+    Text file store. Lookups go through the alias index of tokenParser;
+    updates rewrite the file, keeping comments and unrelated lines.
+    Metadata other than the token itself is not stored.
+    """
+    kind = "text"
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def get(self, alias: str) -> TokenRecord | None:
+        token = loadTokenIndex(self.path).get(alias)
+        return TokenRecord(alias, token) if token is not None else None
+
+    def records(self) -> Iterator[TokenRecord]:
+        for alias, token in loadTokenIndex(self.path).items():
+            yield TokenRecord(alias, token)
+
+    def _rewrite(self, edit: Callable[[list[str]], list[str] | None]):
+        # Locked read-modify-write; `edit` returns the new lines or None to keep the file
+        def update(text: str | None) -> str | None:
+            lines = edit(io.StringIO(text).readlines() if text else [])
+            return "".join(lines) if lines is not None else None
+
+        try:
+            updateFile(self.path, update)
+        finally:
+            invalidateTokenIndex(self.path)
+
+    def _update(self, pending: dict[str, str]) -> set[str]:
+        # Replace existing aliases in place and append the new ones
+        replaced = set()
+
+        def edit(current: list[str]) -> list[str]:
+            replaced.clear()
+            lines = []
+            for line in current:
+                alias = _lineAlias(line)
+                if alias in pending and alias not in replaced:
+                    line = f"{alias}:{pending[alias]}\n"
+                    replaced.add(alias)
+                lines.append(line)
+
+            added = [f"{alias}:{token}\n" for alias, token in pending.items() if alias not in replaced]
+            # Ensure we start on a new line if the file doesn't end with one
+            if added and lines and not lines[-1].endswith("\n"):
+                lines[-1] += "\n"
+            return lines + added
+
+        self._rewrite(edit)
+        return replaced
+
+    def setMany(self, records: Iterable[TokenRecord]) -> int:
+        """Add or replace tokens with a single rewrite of the file; returns how many were written."""
+        pending = {record.alias: record.token for record in records}
+        self._update(pending)
+        return len(pending)
+
+    def set(self, alias: str, token: str, token_type: str | None = None, expires_at: float | None = None) -> bool:
+        """Add or replace one token; returns True when the alias already existed."""
+        return alias in self._update({alias: token})
+
+    def remove(self, alias: str) -> bool:
+        """Delete one alias; returns False when it was not found."""
+        if not alias:
+            raise ValueError("Token alias must not be empty")
+        found = False
+
+        def edit(current: list[str]) -> list[str] | None:
+            nonlocal found
+            kept = [line for line in current if _lineAlias(line) != alias]
+            found = len(kept) != len(current)
+            return kept if found else None
+
+        self._rewrite(edit)
+        return found
+
+    def clear(self) -> int:
+        """Delete every token, keeping comments; returns how many were removed."""
+        removed = 0
+
+        def edit(current: list[str]) -> list[str]:
+            nonlocal removed
+            kept = [line for line in current if _lineAlias(line) is None]
+            removed = len(current) - len(kept)
+            return kept
+
+        self._rewrite(edit)
+        return removed
+
+# Tokens as rows of an sqlite database
+class SqliteTokenStore:
+    """
+    SQLite store for large token sets: every operation touches a single
+    row through the alias primary key, and each token keeps its type,
+    creation and expiry time.
+    """
+    kind = "sqlite"
+
+    def __init__(self, path: Path):
+        self.path = path
+        # sqlite connections may only be used by the thread that opened them
+        self._local = threading.local()
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _connect(self, create: bool = False) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if not self.path.exists():
+                if not create:
+                    raise InvalidConfig(f"Token database not found at {self.path}")
+                # Tokens are secrets: only the owner may read the database
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                os.close(os.open(self.path, os.O_WRONLY | os.O_CREAT, 0o600))
+
+            connection = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT)
+            connection.execute(_SQLITE_SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        """Close the connection of the calling thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def get(self, alias: str) -> TokenRecord | None:
+        row = self._connect().execute(
+            "SELECT alias, token, token_type, created_at, expires_at FROM tokens WHERE alias = ?", (alias,)
+        ).fetchone()
+        return TokenRecord(*row) if row else None
+
+    def records(self) -> Iterator[TokenRecord]:
+        rows = self._connect().execute(
+            "SELECT alias, token, token_type, created_at, expires_at FROM tokens ORDER BY alias"
+        )
+        for row in rows:
+            yield TokenRecord(*row)
+
+    def setMany(self, records: Iterable[TokenRecord]) -> int:
+        """Add or replace tokens in one transaction; returns how many were written."""
+        now = time.time()
+        connection = self._connect(create=True)
+        with connection:
+            cursor = connection.executemany(
+                _SQLITE_UPSERT,
+                ((record.alias, record.token, record.token_type, now, now, record.expires_at) for record in records)
+            )
+        return cursor.rowcount
+
+    def set(self, alias: str, token: str, token_type: str | None = None, expires_at: float | None = None) -> bool:
+        """Add or replace one token; returns True when the alias already existed."""
+        now = time.time()
+        connection = self._connect(create=True)
+        with connection:
+            existed = connection.execute("SELECT 1 FROM tokens WHERE alias = ?", (alias,)).fetchone() is not None
+            connection.execute(_SQLITE_UPSERT, (alias, token, token_type, now, now, expires_at))
+        return existed
+
+    def remove(self, alias: str) -> bool:
+        """Delete one alias; returns False when it was not found."""
+        if not alias:
+            raise ValueError("Token alias must not be empty")
+        connection = self._connect()
+        with connection:
+            return connection.execute("DELETE FROM tokens WHERE alias = ?", (alias,)).rowcount > 0
+
+    def clear(self) -> int:
+        """Delete every token; returns how many were removed."""
+        connection = self._connect()
+        with connection:
+            return connection.execute("DELETE FROM tokens").rowcount
+
+# Stores opened by this process, reused across requests: {(kind, path): store}
+_token_stores: dict[tuple[str, Path], "TextTokenStore | SqliteTokenStore"] = {}
+
+# Open the token store selected in the config
+def openTokenStore(context: ConfigContext) -> TextTokenStore | SqliteTokenStore:
+    """Return the store of `auth.token_store`: the text token file or the sqlite database."""
+    if context.token_store == "sqlite":
+        key = ("sqlite", context.token_db)
+    else:
+        key = ("text", context.token_file)
+
+    store = _token_stores.get(key)
+    if store is None:
+        store = SqliteTokenStore(key[1]) if key[0] == "sqlite" else TextTokenStore(key[1])
+        _token_stores[key] = store
+    return store
+
+# Format an epoch timestamp for display
+def formatTimestamp(timestamp: float | None) -> str:
+    return datetime.fromtimestamp(timestamp).isoformat(sep=" ", timespec="seconds") if timestamp else "-"
+
+# Read 'alias:token' lines for import; later duplicates replace earlier ones
+def readTokenText(file_path: Path) -> tuple[dict[str, str], int]:
+    """Return ({alias: token}, number of duplicate aliases) from a text token file."""
+    if not file_path.exists():
+        raise InvalidConfig(f"Token file not found at {file_path}")
+
+    tokens: dict[str, str] = {}
+    duplicates = 0
+    with open(file_path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if ":" not in line:
+                raise InvalidConfig(f"Invalid token format at line {lineno}: {line}")
+
+            alias, token = (part.strip() for part in line.split(":", 1))
+            if not alias or not token:
+                raise InvalidConfig(f"Empty alias or token at line {lineno}")
+
+            duplicates += alias in tokens
+            tokens[alias] = token
+    return tokens, duplicates
+
+# Copy a text token file into a store
+def importTokens(store: TextTokenStore | SqliteTokenStore, file_path: Path) -> tuple[int, int]:
+    """Import every alias of `file_path` into `store`; returns (imported, duplicates)."""
+    tokens, duplicates = readTokenText(file_path)
+    store.setMany(TokenRecord(alias, token) for alias, token in tokens.items())
+    return len(tokens), duplicates
+
+# Write a store out in the text token format
+def exportTokens(store: TextTokenStore | SqliteTokenStore, file_path: str) -> int:
+    """Write every token of `store` as 'alias:token' lines to `file_path` ('-' for stdout); returns the count."""
+    count = 0
+    if file_path == "-":
+        for record in store.records():
+            sys.stdout.write(f"{record.alias}:{record.token}\n")
+            count += 1
+        return count
+
+    # Tokens are secrets: only the owner may read the export
+    lines = ["# alias:token\n"]
+    for record in store.records():
+        lines.append(f"{record.alias}:{record.token}\n")
+    atomicWrite(Path(file_path), "".join(lines))
+    return len(lines) - 1
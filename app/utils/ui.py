@@ -1,18 +1,31 @@
-from rich.console import Console, Group
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
-from rich.prompt import Prompt, Confirm
-from rich.json import JSON
-from rich.markdown import Markdown
-
 from pathlib import Path
 
 from typing import Callable, List
 import re
 
-# Central Console instance
-console = Console()
+# Central Console instance, created on first use (rich is imported lazily, renderers only when needed)
+_console = None
+
+def getConsole():
+    """Return the shared rich Console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+# Send every message to stderr, leaving stdout to the response body
+def useStderr():
+    """Replace the shared Console with one writing to stderr."""
+    global _console
+    from rich.console import Console
+    _console = Console(stderr=True)
+
+# Keep `ui.console` available without creating it at import time
+def __getattr__(name: str):
+    if name == "console":
+        return getConsole()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Display logic for plain and styled text
 class TextDisplay:
@@ -23,7 +36,7 @@ class TextDisplay:
 
     @staticmethod
     def style_text(text: str, style: str):
-        console.print(text, style=style)
+        getConsole().print(text, style=style)
     
     @staticmethod
     def success_text( text: str, style: str = ""):
@@ -46,14 +59,16 @@ class TextDisplay:
         TextDisplay.style_text(text, style_n) 
     
     @staticmethod
-    def print_json( json:dict, style: str = "White"):
-        json_obj = JSON.from_data(json, indent=4)
-        console.print(json_obj, style=style)
+    def print_json( json:dict, style: str = "White", limits=None, size_hint: int | None = None):
+        # Highlighting is skipped for large documents and piped output
+        from .jsonRender import renderJson
+        renderJson(json, limits, size_hint, style=style)
 
     @staticmethod
     def print_panel( title: str, content: str, border_style: str = "blue", subtitle: str = None, subtitle_align: str = "right"):
+        from rich.panel import Panel
         panel = Panel(content, title=title, title_align="left", border_style=border_style, style="white", subtitle=subtitle, subtitle_align=subtitle_align)
-        console.print(panel)
+        getConsole().print(panel)
 
 # Panel display utilities
 class PanelDisplay:
@@ -64,8 +79,9 @@ class PanelDisplay:
 
     @staticmethod
     def print_panel( title: str, content: str, border_style: str = "blue", subtitle: str = None, subtitle_align: str = "right"):
+        from rich.panel import Panel
         panel = Panel(content, title=title, title_align="left", border_style=border_style, style="white", subtitle=subtitle, subtitle_align=subtitle_align)
-        console.print(panel)
+        getConsole().print(panel)
 
     @staticmethod
     def print_error( title: str, content: str):
@@ -85,6 +101,10 @@ class PanelDisplay:
 
     @staticmethod
     def print_json( title: str, json: dict, content: str = "", title_align: str = "left", border_style:str = "gray50"):
+        from rich.console import Group
+        from rich.json import JSON
+        from rich.panel import Panel
+
         body = Group(
             content,
             JSON.from_data(json, indent=4)
@@ -95,7 +115,7 @@ class PanelDisplay:
             title_align=title_align,
             border_style=border_style,
         )
-        console.print(panel)
+        getConsole().print(panel)
 
     @staticmethod
     def print_multi_style_panel(
@@ -104,6 +124,9 @@ class PanelDisplay:
             border_style: str = "blue bold",
             title_align: str = "left",
         ):
+        from rich.text import Text
+        from rich.panel import Panel
+
         combined_content = Text()
         for part, style in content_parts:
             combined_content.append(str(part), style=style)
@@ -114,11 +137,12 @@ class PanelDisplay:
             title_align=title_align,
             border_style=border_style,
         )
-        console.print(panel)
+        getConsole().print(panel)
 
 # Table display utility
 class TableDisplay:
     def __init__(self, title: str, columns: list, style: str = "cyan"):
+        from rich.table import Table
         self.table = Table(title=title)
         for col in columns:
             self.table.add_column(col, style=style, no_wrap=True)
@@ -127,7 +151,7 @@ class TableDisplay:
         self.table.add_row(*row, style=style)
 
     def show(self):
-        console.print(self.table)
+        getConsole().print(self.table)
 
 # Logic for user input and prompts
 class PromptTaker:
@@ -141,6 +165,7 @@ class PromptTaker:
         max_retries:int = 3
     ) -> str:  
         for _ in range(max_retries):
+            from rich.prompt import Prompt
             ans = Prompt.ask(prompt, default=default)
 
             if validator and not validator(ans):
@@ -157,6 +182,7 @@ class PromptTaker:
         choices: List[str],
         default: str | None = None,
     ) -> str:
+        from rich.prompt import Prompt
         ans = Prompt.ask(
             prompt=prompt,
             default=default,
@@ -170,6 +196,7 @@ class PromptTaker:
         prompt:str,
         default:bool = False
     ) -> bool:
+        from rich.prompt import Confirm
         ans = Confirm.ask(
                 prompt=prompt,
                 default=default
@@ -186,6 +213,7 @@ class PromptTaker:
         max_retries: int = 3
     ):
         for _ in range(max_retries):
+            from rich.prompt import Prompt
             passwd = Prompt.ask(
                 prompt=prompt,
                 password=True
@@ -219,6 +247,9 @@ def print_markdown(path: str, pager: bool = False):
     with open(path, "r", encoding="utf-8") as f:
         md_content = f.read()
     
+    from rich.markdown import Markdown
+
+    console = getConsole()
     if pager:
         with console.pager(styles=True):
             console.print(Markdown(md_content), width=console.size.width)
@@ -1,16 +1,27 @@
 # -*- mode: python ; coding: utf-8 -*-
 
 
+from pathlib import Path
+
 from PyInstaller.utils.hooks import collect_submodules
 
 hidden_rich = collect_submodules('rich')
 
+# Commands and utils are imported lazily by name, so the analysis cannot see them.
+# They are listed from the source tree: collect_submodules skips the command groups
+# without an __init__.py and needs 'app' on sys.path, which the pyinstaller script does not set.
+def module_name(path):
+    parts = path.relative_to(SPECPATH).with_suffix('').parts
+    return '.'.join(parts[:-1] if parts[-1] == '__init__' else parts)
+
+hidden_app = sorted(module_name(path) for path in Path(SPECPATH, 'app').rglob('*.py'))
+
 a = Analysis(
     ['app/main.py'],
-    pathex=[],
+    pathex=[SPECPATH],
     binaries=[],
     datas=[('app/commands/docs', 'app/commands/docs')],
-    hiddenimports=['_ctypes'] + hidden_rich,
+    hiddenimports=['_ctypes'] + hidden_rich + hidden_app,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],